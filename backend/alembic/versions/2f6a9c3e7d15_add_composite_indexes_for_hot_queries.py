@@ -0,0 +1,58 @@
+"""Add composite indexes for hot queries
+
+Revision ID: 2f6a9c3e7d15
+Revises: 5b9e27d4c1a3
+Create Date: 2026-10-18 14:02:37.118204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6a9c3e7d15'
+down_revision: Union[str, None] = '5b9e27d4c1a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def delete_duplicates(table: str, columns: Sequence[str]) -> int:
+    """
+    Keeps only the latest row (highest id) of each key so the unique index can be created.
+    Consolidations are derived data: the job recalculates any month from the transactions.
+    Rows with a NULL in the key do not collide in a unique index and are left alone.
+    """
+    key = ", ".join(columns)
+    not_null = " AND ".join(f"{column} IS NOT NULL" for column in columns)
+    result = op.get_bind().execute(sa.text(
+        f"DELETE FROM {table} WHERE {not_null} AND id NOT IN "
+        f"(SELECT max(id) FROM {table} WHERE {not_null} GROUP BY {key})"
+    ))
+    if result.rowcount:
+        print(f"{table}: removed {result.rowcount} duplicate rows of ({key}), kept the latest of each")
+    return result.rowcount
+
+
+def upgrade():
+    op.create_index('ix_finances_transactions_account_code_date_id', 'finances_transactions',
+                    ['account_code', 'date', 'id'])
+    delete_duplicates('finances_account_consolidations', ['account_code', 'month'])
+    delete_duplicates('investments_consolidated_balance_portfolios', ['portfolio_code', 'date'])
+    op.create_index('ux_finances_account_consolidations_account_code_month', 'finances_account_consolidations',
+                    ['account_code', 'month'], unique=True)
+    op.create_index('ux_investments_consolidated_balance_portfolios_portfolio_code_date',
+                    'investments_consolidated_balance_portfolios', ['portfolio_code', 'date'], unique=True)
+    op.create_index('ix_investments_transactions_investment_code_date_id', 'investments_transactions',
+                    ['investment_code', 'date', 'id'])
+    op.create_index(op.f('ix_investments_portfolios_user_code'), 'investments_portfolios', ['user_code'])
+
+
+def downgrade():
+    op.drop_index(op.f('ix_investments_portfolios_user_code'), table_name='investments_portfolios')
+    op.drop_index('ix_investments_transactions_investment_code_date_id', table_name='investments_transactions')
+    op.drop_index('ux_investments_consolidated_balance_portfolios_portfolio_code_date',
+                  table_name='investments_consolidated_balance_portfolios')
+    op.drop_index('ux_finances_account_consolidations_account_code_month',
+                  table_name='finances_account_consolidations')
+    op.drop_index('ix_finances_transactions_account_code_date_id', table_name='finances_transactions')
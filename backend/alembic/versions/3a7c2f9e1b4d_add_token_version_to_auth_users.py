@@ -0,0 +1,28 @@
+"""Add token_version to auth_users
+
+Revision ID: 3a7c2f9e1b4d
+Revises: 6d8e168be246
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7c2f9e1b4d'
+down_revision: Union[str, None] = '6d8e168be246'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column(
+        'auth_users',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade():
+    op.drop_column('auth_users', 'token_version')
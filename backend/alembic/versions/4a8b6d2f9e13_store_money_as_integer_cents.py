@@ -0,0 +1,62 @@
+"""Store money as integer cents (optional)
+
+Revision ID: 4a8b6d2f9e13
+Revises: e7a3f1c98b20
+Create Date: 2026-10-18 17:55:03.274915
+
+Só converte as colunas com MONEY_STORAGE=cents ou ``alembic -x money=cents``; sem
+isso é um no-op. O app precisa rodar com o mesmo MONEY_STORAGE (ver money.py).
+Totais ficam em centavos; preços unitários e médios em PRICE_DIGITS (6) casas.
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = '4a8b6d2f9e13'
+down_revision: Union[str, None] = 'e7a3f1c98b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_DIGITS = 6  # money.PRICE_DIGITS
+
+# tabela -> [(coluna, casas decimais guardadas no inteiro)]
+MONEY_COLUMNS = {
+    'finances_accounts': [('balance', 2)],
+    'finances_transactions': [('value', 2)],
+    'finances_account_consolidations': [('balance', 2)],
+    'investments': [('purchase_price', PRICE_DIGITS), ('current_average_price', PRICE_DIGITS)],
+    'investments_consolidated_balance_portfolios': [('balance', 2), ('amount_invested', 2)],
+    'investments_transactions': [('price', PRICE_DIGITS)],
+}
+
+
+def cents_enabled() -> bool:
+    option = context.get_x_argument(as_dictionary=True).get('money', os.getenv('MONEY_STORAGE', 'float'))
+    return option.lower() == 'cents'
+
+
+def column_type(table: str, column: str) -> str:
+    return op.get_bind().exec_driver_sql(
+        "SELECT data_type FROM information_schema.columns WHERE table_name = %s AND column_name = %s",
+        (table, column)
+    ).scalar()
+
+
+def upgrade():
+    if not cents_enabled():
+        return
+    for table, columns in MONEY_COLUMNS.items():
+        for column, digits in columns:
+            if column_type(table, column) != 'bigint':
+                op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT "
+                           f"USING round({column}::numeric * {10 ** digits})::bigint")
+
+
+def downgrade():
+    for table, columns in MONEY_COLUMNS.items():
+        for column, digits in columns:
+            if column_type(table, column) == 'bigint':
+                op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE DOUBLE PRECISION "
+                           f"USING {column} / {10 ** digits}.0")
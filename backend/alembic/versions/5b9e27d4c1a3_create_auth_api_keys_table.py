@@ -0,0 +1,42 @@
+"""Create auth_api_keys table
+
+Revision ID: 5b9e27d4c1a3
+Revises: 8e41d0c6a2f7
+Create Date: 2026-10-18 11:21:09.402731
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e27d4c1a3'
+down_revision: Union[str, None] = '8e41d0c6a2f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        'auth_api_keys',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('code', sa.String(), nullable=True),
+        sa.Column('user_code', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('key_prefix', sa.String(), nullable=False),
+        sa.Column('key_digest', sa.String(length=64), nullable=False),
+        sa.Column('scopes', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auth_api_keys_id'), 'auth_api_keys', ['id'])
+    op.create_index(op.f('ix_auth_api_keys_code'), 'auth_api_keys', ['code'], unique=True)
+    op.create_index(op.f('ix_auth_api_keys_user_code'), 'auth_api_keys', ['user_code'])
+    op.create_index(op.f('ix_auth_api_keys_key_digest'), 'auth_api_keys', ['key_digest'], unique=True)
+
+
+def downgrade():
+    op.drop_table('auth_api_keys')
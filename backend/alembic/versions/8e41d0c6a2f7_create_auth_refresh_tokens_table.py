@@ -0,0 +1,41 @@
+"""Create auth_refresh_tokens table
+
+Revision ID: 8e41d0c6a2f7
+Revises: 3a7c2f9e1b4d
+Create Date: 2026-10-18 10:03:47.118204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41d0c6a2f7'
+down_revision: Union[str, None] = '3a7c2f9e1b4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        'auth_refresh_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('token_digest', sa.String(length=64), nullable=False),
+        sa.Column('family', sa.String(), nullable=False),
+        sa.Column('user_code', sa.String(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('used_at', sa.DateTime(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auth_refresh_tokens_id'), 'auth_refresh_tokens', ['id'])
+    op.create_index(op.f('ix_auth_refresh_tokens_token_digest'), 'auth_refresh_tokens', ['token_digest'],
+                    unique=True)
+    op.create_index(op.f('ix_auth_refresh_tokens_family'), 'auth_refresh_tokens', ['family'])
+    op.create_index(op.f('ix_auth_refresh_tokens_user_code'), 'auth_refresh_tokens', ['user_code'])
+
+
+def downgrade():
+    op.drop_table('auth_refresh_tokens')
@@ -0,0 +1,78 @@
+"""Partition finances_transactions by month (optional, Postgres)
+
+Revision ID: 9c4d2b7e5a61
+Revises: 2f6a9c3e7d15
+Create Date: 2026-10-18 15:26:51.604317
+
+Só converte a tabela com FINANCES_TRANSACTIONS_PARTITIONING=monthly ou
+``alembic -x partitioning=monthly upgrade head``; sem isso (ou fora do Postgres)
+é um no-op. Ver finance/repository/db/partitions.py.
+"""
+import os
+from datetime import date
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from finance.repository.db import partitions
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2b7e5a61'
+down_revision: Union[str, None] = '2f6a9c3e7d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SOURCE_TABLE = 'finances_transactions_unpartitioned'
+
+
+def partitioning_enabled(conn) -> bool:
+    option = context.get_x_argument(as_dictionary=True).get(
+        'partitioning', os.getenv('FINANCES_TRANSACTIONS_PARTITIONING', ''))
+    return option == 'monthly' and conn.dialect.name == 'postgresql'
+
+
+def move_id_sequence(conn, from_table: str, to_table: str):
+    sequence = conn.execute(sa.text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": from_table}).scalar()
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {to_table}.id")
+
+
+def upgrade():
+    conn = op.get_bind()
+    if not partitioning_enabled(conn) or partitions.is_partitioned(conn):
+        return
+
+    undated = conn.execute(sa.text(f"SELECT count(*) FROM {partitions.TABLE} WHERE date IS NULL")).scalar()
+    if undated:
+        raise RuntimeError(f"{undated} rows of {partitions.TABLE} have no date; fix them before partitioning")
+
+    op.rename_table(partitions.TABLE, SOURCE_TABLE)
+    for statement in partitions.create_partitioned_table_sql(SOURCE_TABLE):
+        op.execute(statement)
+
+    first_date = conn.execute(sa.text(f"SELECT min(date) FROM {SOURCE_TABLE}")).scalar() or date.today()
+    last_month = partitions.add_months(date.today(), partitions.months_ahead())
+    partitions.ensure_partitions(conn, first_date, last_month)
+
+    op.execute(f"INSERT INTO {partitions.TABLE} SELECT * FROM {SOURCE_TABLE}")
+    move_id_sequence(conn, SOURCE_TABLE, partitions.TABLE)
+    op.drop_table(SOURCE_TABLE)
+    for statement in partitions.create_indexes_sql():
+        op.execute(statement)
+
+
+def downgrade():
+    conn = op.get_bind()
+    if not partitions.is_partitioned(conn):
+        return
+
+    op.rename_table(partitions.TABLE, SOURCE_TABLE)
+    op.execute(f"CREATE TABLE {partitions.TABLE} (LIKE {SOURCE_TABLE} INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {partitions.TABLE} SELECT * FROM {SOURCE_TABLE}")
+    move_id_sequence(conn, SOURCE_TABLE, partitions.TABLE)
+    op.drop_table(SOURCE_TABLE)
+    op.create_primary_key('finances_transactions_pkey', partitions.TABLE, ['id'])
+    op.create_index('ix_finances_transactions_code', partitions.TABLE, ['code'], unique=True)
+    for name, columns in partitions.INDEXES:
+        op.create_index(name, partitions.TABLE, [column.strip() for column in columns.split(',')])
@@ -0,0 +1,45 @@
+"""Widen code columns for ULID codes
+
+Revision ID: e7a3f1c98b20
+Revises: 9c4d2b7e5a61
+Create Date: 2026-10-18 16:40:12.509833
+
+Os códigos novos são ULIDs (26 caracteres, ordenados pelo momento da criação).
+Os códigos existentes (10 caracteres aleatórios) continuam válidos e não são
+reescritos, pois aparecem em URLs e em referências entre tabelas; as colunas só
+são alargadas. Em Postgres alargar um varchar não reescreve a tabela.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3f1c98b20'
+down_revision: Union[str, None] = '9c4d2b7e5a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CODE_COLUMNS = {
+    'auth_users': ['code'],
+    'finances_accounts': ['code', 'user_code'],
+    'finances_categories': ['code', 'user_code', 'parent_category_code'],
+    'finances_transactions': ['code', 'account_code', 'category_code'],
+    'investments_portfolios': ['code', 'user_code'],
+    'investments': ['code', 'portfolio_code'],
+    'investments_transactions': ['code', 'investment_code'],
+    'investments_consolidated_balance_portfolios': ['portfolio_code'],
+}
+
+
+def upgrade():
+    for table, columns in CODE_COLUMNS.items():
+        for column in columns:
+            op.alter_column(table, column, type_=sa.String(length=26), existing_type=sa.String(length=10))
+
+
+def downgrade():
+    # Só é possível enquanto nenhum código novo (ULID) tiver sido gravado.
+    for table, columns in CODE_COLUMNS.items():
+        for column in columns:
+            op.alter_column(table, column, type_=sa.String(length=10), existing_type=sa.String(length=26))
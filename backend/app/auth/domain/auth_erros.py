@@ -9,6 +9,14 @@ Classes:
                     ou autorização é inválido.
     SecretKeyNotSet: Uma exceção para indicar que a chave secreta necessária
                      para a operação de token não foi configurada.
+    PasswordHashingBusy: Uma exceção para indicar que a fila de hashing de
+                         senhas (bcrypt) está cheia.
+    InvalidRefreshToken: Uma exceção para indicar que um refresh token é
+                         desconhecido, expirou, foi revogado ou reutilizado.
+    InvalidApiKey: Uma exceção para indicar que uma API key é desconhecida ou
+                   foi revogada.
+    ApiKeyNotFound: Uma exceção para indicar que a API key não existe para o
+                    usuário.
 
 Estas exceções são úteis para fornecer mensagens de erro mais claras e
 específicas quando ocorrem problemas com a manipulação de tokens em aplicações
@@ -43,5 +51,39 @@ class InvalidToken(Exception):
 class SecretKeyNotSet(Exception):
     """Raised for database-related errors in consolidated portfolios."""
 
+    def __init__(self, name: str = "SECRET_KEY"):
+        super().__init__(name)
+        self.name = name
+
+    def __str__(self):
+        if self.name == "SECRET_KEY":
+            return "SECRET_KEY env variable not set"
+        return f"{self.name} (or SECRET_KEY) env variable not set"
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when too many password hashing calls are already queued."""
+
+    def __str__(self):
+        return "Password hashing pool is busy"
+
+
+class InvalidRefreshToken(Exception):
+    """Raised when a refresh token is unknown, expired, revoked or reused."""
+
+    def __str__(self):
+        return "Invalid refresh token"
+
+
+class InvalidApiKey(Exception):
+    """Raised when an API key is unknown or revoked."""
+
+    def __str__(self):
+        return "Invalid API key"
+
+
+class ApiKeyNotFound(Exception):
+    """Raised when an API key is not found for the user."""
+
     def __str__(self):
-        return "SECRET_KEY env variable not set"
+        return "API key not found"
@@ -1,5 +1,5 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -10,3 +10,27 @@ class UserModel(BaseModel):
     user_name: str
     password: str
     created_at: Optional[date]
+    token_version: int = 0
+
+
+class RefreshTokenModel(BaseModel):
+    id: Optional[int]
+    token_digest: str
+    family: str
+    user_code: str
+    expires_at: datetime
+    created_at: datetime
+    used_at: Optional[datetime]
+    revoked_at: Optional[datetime]
+
+
+class ApiKeyModel(BaseModel):
+    code: Optional[str]
+    user_code: str
+    name: str
+    key_prefix: str
+    key_digest: str
+    scopes: List[str]
+    created_at: Optional[datetime]
+    last_used_at: Optional[datetime]
+    revoked_at: Optional[datetime]
@@ -1,14 +1,20 @@
-from _datetime import timedelta
 import logging
+import os
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import HTTPException, status, APIRouter, Depends
+from fastapi import HTTPException, status, APIRouter, Depends, Request
 from pydantic import BaseModel
 
+from auth.domain.auth_erros import PasswordHashingBusy, InvalidRefreshToken, ApiKeyNotFound
 from auth.domain.models import UserModel
 from auth.domain.user_erros import UsernameAlreadyRegistered, UserNotFound
 from auth.repository.db_connection import get_db_session
-from auth.service.services import UserServiceFactory
-from auth.user import User, get_current_user
+from auth.service.login_throttle import login_throttle
+from auth.service.services import UserServiceFactory, ACCESS_TOKEN_LIFETIME
+from auth.service.token_keys import HMAC_ALGORITHM, get_token_key_ring
+from auth.user import User, get_current_user, get_password_session_user
+from database import run_in_session, run_sync
 
 router = APIRouter()
 
@@ -24,8 +30,13 @@ class LoginInput(BaseModel):
     password: str
 
 
+class RefreshTokenInput(BaseModel):
+    refresh_token: str
+
+
 class AccessTokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
 
 
 class UserResponse(BaseModel):
@@ -34,6 +45,24 @@ class UserResponse(BaseModel):
     user_name: str
 
 
+class NewApiKeyInput(BaseModel):
+    name: str
+    scopes: List[str] = ["read"]
+
+
+class ApiKeyResponse(BaseModel):
+    code: str
+    name: str
+    key_prefix: str
+    scopes: List[str]
+    created_at: datetime
+    last_used_at: Optional[datetime] = None
+
+
+class NewApiKeyResponse(ApiKeyResponse):
+    api_key: str
+
+
 @router.post("/users/signup", response_model=UserResponse)
 async def signup(
         new_user_form_data: NewUserInput,
@@ -42,12 +71,15 @@ async def signup(
     try:
         user_service = UserServiceFactory.create_user_service(db_session)
         user_model = UserModel(code=None, created_at=None, **new_user_form_data.model_dump())
-        created_user = user_service.create(user_model)
+        created_user = await user_service.create_async(user_model)
         return UserResponse(**created_user.model_dump())
 
     except UsernameAlreadyRegistered as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                             detail=str(e))
+    except PasswordHashingBusy as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=str(e))
     except Exception as e:
         logging.error(f"UsernameAlreadyRegistered: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -57,25 +89,127 @@ async def signup(
 @router.post("/users/signin", response_model=AccessTokenResponse)
 async def signin(
         login_data: LoginInput,
+        request: Request,
         db_session=Depends(get_db_session)
 ):
+    if not login_throttle.allow(login_data.user_name, login_throttle.client_ip(request)):
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                            detail="Too many login attempts",
+                            headers={"Retry-After": str(int(login_throttle.window_seconds))})
     try:
         authentication_user_service = UserServiceFactory.create_authentication_user_service(db_session)
-        user = authentication_user_service.authenticate_user(login_data.user_name, login_data.password)
-        token = authentication_user_service.create_access_token(user, timedelta(days=1))
-        return AccessTokenResponse(access_token=token)
+        user = await authentication_user_service.authenticate_user_async(login_data.user_name, login_data.password)
+        token = authentication_user_service.create_access_token(user, ACCESS_TOKEN_LIFETIME)
+        refresh_token_service = UserServiceFactory.create_refresh_token_service(db_session)
+        refresh_token = await run_sync(db_session, refresh_token_service.issue, user)
+        return AccessTokenResponse(access_token=token, refresh_token=refresh_token)
 
     except UserNotFound as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="Incorrect username or password")
+    except PasswordHashingBusy as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail="Failed to retrieve user.")
 
 
+@router.post("/users/token/refresh", response_model=AccessTokenResponse)
+@run_in_session
+def refresh_access_token(
+        refresh_data: RefreshTokenInput,
+        db_session=Depends(get_db_session)
+):
+    try:
+        refresh_token_service = UserServiceFactory.create_refresh_token_service(db_session)
+        user, refresh_token = refresh_token_service.rotate(refresh_data.refresh_token)
+        authentication_user_service = UserServiceFactory.create_authentication_user_service(db_session)
+        token = authentication_user_service.create_access_token(user, ACCESS_TOKEN_LIFETIME)
+        return AccessTokenResponse(access_token=token, refresh_token=refresh_token)
+    except InvalidRefreshToken as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
+
+@router.post("/users/token/revoke")
+@run_in_session
+def revoke_refresh_token(
+        refresh_data: RefreshTokenInput,
+        db_session=Depends(get_db_session)
+):
+    try:
+        refresh_token_service = UserServiceFactory.create_refresh_token_service(db_session)
+        refresh_token_service.revoke(refresh_data.refresh_token)
+        return {"message": "Refresh token revoked successfully"}
+    except InvalidRefreshToken as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
 
 @router.get("/users/me", response_model=UserResponse)
 async def get_me(
         current_user: User = Depends(get_current_user)
 ):
-    return UserResponse(**current_user.model_dump())
\ No newline at end of file
+    return UserResponse(**current_user.model_dump())
+
+
+@router.post("/users/me/revoke-tokens")
+@run_in_session
+def revoke_tokens(
+        db_session=Depends(get_db_session),
+        current_user: User = Depends(get_password_session_user)
+):
+    try:
+        user_service = UserServiceFactory.create_user_service(db_session)
+        user_service.revoke_tokens(current_user.code)
+        return {"message": "Tokens revoked successfully"}
+    except UserNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+@router.post("/users/api-keys", response_model=NewApiKeyResponse)
+@run_in_session
+def create_api_key(
+        new_api_key_data: NewApiKeyInput,
+        db_session=Depends(get_db_session),
+        current_user: User = Depends(get_password_session_user)
+):
+    try:
+        api_key_service = UserServiceFactory.create_api_key_service(db_session)
+        api_key_model, api_key = api_key_service.create(
+            current_user.code, new_api_key_data.name, new_api_key_data.scopes
+        )
+        return NewApiKeyResponse(api_key=api_key, **api_key_model.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+
+@router.get("/users/api-keys", response_model=List[ApiKeyResponse])
+@run_in_session
+def list_api_keys(
+        db_session=Depends(get_db_session),
+        current_user: User = Depends(get_password_session_user)
+):
+    api_key_service = UserServiceFactory.create_api_key_service(db_session)
+    return [ApiKeyResponse(**api_key.model_dump()) for api_key in api_key_service.find_all(current_user.code)]
+
+
+@router.delete("/users/api-keys/{api_key_code}")
+@run_in_session
+def revoke_api_key(
+        api_key_code: str,
+        db_session=Depends(get_db_session),
+        current_user: User = Depends(get_password_session_user)
+):
+    try:
+        api_key_service = UserServiceFactory.create_api_key_service(db_session)
+        api_key_service.revoke(current_user.code, api_key_code)
+        return {"message": "API key revoked successfully"}
+    except ApiKeyNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/.well-known/jwks.json")
+async def jwks():
+    # Tokens HS256 não têm chave pública para publicar.
+    if os.getenv("AUTH_TOKEN_ALGORITHM", HMAC_ALGORITHM) == HMAC_ALGORITHM:
+        return {"keys": []}
+    return get_token_key_ring().jwks()
@@ -1,6 +1,7 @@
 from datetime import date
 
 import pytest
+from fastapi.testclient import TestClient
 
 from auth.domain.models import UserModel
 from auth.repository.prepareto_db_test import db_session, client
@@ -25,7 +26,7 @@ def test_signup_user(client):
 
     assert response.status_code == 200
     assert "code" in json_result.keys()
-    assert len(json_result["code"]) == 10
+    assert len(json_result["code"]) == 26
     assert "password" not in json_result.keys()
 
 
@@ -89,4 +90,219 @@ def test_get_me(client, monkeypatch, db_session, user):
 
     assert response.status_code == 200
     assert response_json["user_name"] == user.user_name
-    assert len(response_json["code"]) == 10
+    assert len(response_json["code"]) == 26
+
+
+def test_get_me_uses_principal_cache(client, monkeypatch, db_session, user):
+    from auth.principal_cache import principal_cache
+
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    UserServiceFactory.create_user_service(db_session).create(user)
+    login_data = {
+        "user_name": "user_name",
+        "password": "password"
+    }
+    token = client.post("/users/signin", json=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/users/me", headers=headers).status_code == 200
+    assert client.get("/users/me", headers=headers).status_code == 200
+
+    stats = principal_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_get_me_with_stateless_token_and_revocation(client, monkeypatch, db_session, user):
+    from auth.principal_cache import principal_cache
+    from auth.service.services import token_version_registry
+
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    monkeypatch.setenv("AUTH_STATELESS_TOKENS", "true")
+    token_version_registry.clear()
+    UserServiceFactory.create_user_service(db_session).create(user)
+    login_data = {
+        "user_name": "user_name",
+        "password": "password"
+    }
+    token = client.post("/users/signin", json=login_data).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["user_name"] == user.user_name
+    assert principal_cache.stats()["misses"] == 0
+
+    assert client.post("/users/me/revoke-tokens", headers=headers).status_code == 200
+    assert client.get("/users/me", headers=headers).status_code == 401
+    token_version_registry.clear()
+
+
+def test_signin_throttled(monkeypatch, client, db_session, user, mocker):
+    from auth.service.login_throttle import login_throttle
+
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    UserServiceFactory.create_user_service(db_session).create(user)
+    authenticate = mocker.spy(UserServiceFactory, "create_authentication_user_service")
+    login_data = {
+        "user_name": "user_name",
+        "password": "invalid_password"
+    }
+
+    for _ in range(login_throttle.user_capacity):
+        assert client.post("/users/signin", json=login_data).status_code == 400
+    response = client.post("/users/signin", json=login_data)
+
+    assert response.status_code == 429
+    assert authenticate.call_count == login_throttle.user_capacity
+    assert login_throttle.stats()["rejected"] == 1
+
+
+
+def test_signin_throttle_separates_clients_behind_proxy(monkeypatch, client, db_session, user):
+    from auth.service.login_throttle import login_throttle, parse_trusted_proxies
+    from main_test import app
+
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    monkeypatch.setattr(login_throttle, "ip_capacity", 2)
+    monkeypatch.setattr(login_throttle, "trusted_proxies", parse_trusted_proxies("172.16.0.0/12"))
+
+    async def behind_proxy(scope, receive, send):
+        scope["client"] = ("172.18.0.2", 40000)
+        await app(scope, receive, send)
+
+    proxied_client = TestClient(behind_proxy)
+
+    def signin(client_ip, user_name):
+        return proxied_client.post("/users/signin", headers={"X-Forwarded-For": client_ip},
+                                   json={"user_name": user_name, "password": "invalid_password"}).status_code
+
+    assert [signin("203.0.113.1", f"user{n}") for n in range(3)] == [400, 400, 429]
+    assert signin("203.0.113.2", "user3") == 400
+
+def test_refresh_access_token(client, monkeypatch, db_session, user):
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    UserServiceFactory.create_user_service(db_session).create(user)
+    login_data = {
+        "user_name": "user_name",
+        "password": "password"
+    }
+    refresh_token = client.post("/users/signin", json=login_data).json()["refresh_token"]
+
+    response = client.post("/users/token/refresh", json={"refresh_token": refresh_token})
+    json_result = response.json()
+
+    assert response.status_code == 200
+    assert json_result["refresh_token"] != refresh_token
+    me = client.get("/users/me", headers={"Authorization": f"Bearer {json_result['access_token']}"})
+    assert me.json()["user_name"] == user.user_name
+
+    reused = client.post("/users/token/refresh", json={"refresh_token": refresh_token})
+    assert reused.status_code == 401
+
+
+def test_revoke_refresh_token(client, monkeypatch, db_session, user):
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    UserServiceFactory.create_user_service(db_session).create(user)
+    login_data = {
+        "user_name": "user_name",
+        "password": "password"
+    }
+    refresh_token = client.post("/users/signin", json=login_data).json()["refresh_token"]
+
+    assert client.post("/users/token/revoke", json={"refresh_token": refresh_token}).status_code == 200
+    assert client.post("/users/token/refresh", json={"refresh_token": refresh_token}).status_code == 401
+
+
+
+def test_revoke_tokens_revokes_refresh_tokens(client, monkeypatch, db_session, user):
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    UserServiceFactory.create_user_service(db_session).create(user)
+    login_data = {
+        "user_name": "user_name",
+        "password": "password"
+    }
+    signin = client.post("/users/signin", json=login_data).json()
+    headers = {"Authorization": f"Bearer {signin['access_token']}"}
+
+    assert client.post("/users/me/revoke-tokens", headers=headers).status_code == 200
+
+    response = client.post("/users/token/refresh", json={"refresh_token": signin["refresh_token"]})
+    assert response.status_code == 401
+
+def test_api_key_lifecycle(client, monkeypatch, db_session, user):
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    UserServiceFactory.create_user_service(db_session).create(user)
+    signin = client.post("/users/signin", json={"user_name": "user_name", "password": "password"}).json()
+    headers = {"Authorization": f"Bearer {signin['access_token']}"}
+
+    response = client.post("/users/api-keys", json={"name": "script", "scopes": ["read"]}, headers=headers)
+    assert response.status_code == 200
+    created = response.json()
+    api_key_headers = {"X-API-Key": created["api_key"]}
+
+    me = client.get("/users/me", headers=api_key_headers)
+    assert me.status_code == 200
+    assert me.json()["user_name"] == "user_name"
+
+    # Escopo somente leitura não permite escrita nem gerenciar credenciais
+    assert client.post("/users/me/revoke-tokens", headers=api_key_headers).status_code == 403
+    assert client.get("/users/api-keys", headers=api_key_headers).status_code == 403
+
+    listed = client.get("/users/api-keys", headers=headers).json()
+    assert [api_key["code"] for api_key in listed] == [created["code"]]
+    assert "api_key" not in listed[0]
+
+    assert client.delete(f"/users/api-keys/{created['code']}", headers=headers).status_code == 200
+    assert client.get("/users/me", headers=api_key_headers).status_code == 401
+
+
+def test_get_me_without_credentials(client):
+    assert client.get("/users/me").status_code == 401
+
+
+def test_signin_with_es256_tokens_and_jwks(client, monkeypatch, db_session, user, tmp_path):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from auth.service.token_keys import load_token_key_ring
+
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    key_file = tmp_path / "signing.pem"
+    key_file.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    monkeypatch.setenv("AUTH_TOKEN_ALGORITHM", "ES256")
+    monkeypatch.setenv("AUTH_SIGNING_KEY_ID", "k1")
+    monkeypatch.setenv("AUTH_SIGNING_KEY_FILE", str(key_file))
+    load_token_key_ring.cache_clear()
+    UserServiceFactory.create_user_service(db_session).create(user)
+
+    token = client.post("/users/signin", json={"user_name": "user_name", "password": "password"}).json()[
+        "access_token"]
+
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    keys = client.get("/.well-known/jwks.json").json()["keys"]
+    assert [(key["kid"], key["alg"], key["kty"]) for key in keys] == [("k1", "ES256", "EC")]
+    assert "d" not in keys[0]
+
+
+def test_authenticated_request_uses_one_session(client, monkeypatch, db_session, user):
+    from main_test import app
+    from auth.repository.db_connection import get_db_session
+
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    UserServiceFactory.create_user_service(db_session).create(user)
+    token = client.post("/users/signin", json={"user_name": "user_name", "password": "password"}).json()[
+        "access_token"]
+    opened_sessions = []
+
+    def counting_get_db():
+        opened_sessions.append(db_session)
+        yield db_session
+
+    app.dependency_overrides[get_db_session] = counting_get_db
+    response = client.post("/users/me/revoke-tokens", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert len(opened_sessions) == 1
@@ -0,0 +1,21 @@
+"""
+Cache em memória dos usuários autenticados (principals), indexado pelo user_name.
+
+Evita um SELECT em auth_users a cada requisição autenticada. As entradas expiram
+após AUTH_PRINCIPAL_CACHE_TTL segundos e são invalidadas pelo UserRepository
+quando o usuário é alterado ou removido. Com vários workers a invalidação é
+local, então o TTL limita o tempo em que um worker pode servir dados antigos.
+AUTH_PRINCIPAL_CACHE_SIZE=0 desabilita o cache.
+"""
+import os
+
+from cache import LRUTTLCache
+
+principal_cache = LRUTTLCache(
+    maxsize=int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("AUTH_PRINCIPAL_CACHE_TTL", "60")),
+)
+
+
+def invalidate_principal(user_name: str):
+    principal_cache.pop(user_name)
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, String, or_
+from sqlalchemy.orm import Session
+from sqlalchemy_mixins import AllFeaturesMixin
+
+from auth.domain.auth_erros import ApiKeyNotFound
+from auth.domain.models import ApiKeyModel, UserModel
+from auth.repository.user_db_repository import Base, User
+from auth.repository.user_db_repository import to_model as user_to_model
+from helpers import generate_code
+
+
+class ApiKey(Base, AllFeaturesMixin):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    __tablename__ = 'auth_api_keys'
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String, index=True, unique=True)
+    user_code = Column(String, index=True, nullable=False)
+    name = Column(String, nullable=False)
+    key_prefix = Column(String, nullable=False)
+    key_digest = Column(String(64), index=True, unique=True, nullable=False)
+    scopes = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    last_used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+
+
+def to_database(api_key_model: ApiKeyModel) -> ApiKey:
+    data = api_key_model.model_dump()
+    data["scopes"] = " ".join(api_key_model.scopes)
+    return ApiKey(**data)
+
+
+def to_model(api_key: ApiKey) -> ApiKeyModel:
+    data = api_key.to_dict(exclude=["id"])
+    data["scopes"] = api_key.scopes.split()
+    return ApiKeyModel(**data)
+
+
+class ApiKeyRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def create(self, api_key: ApiKeyModel) -> ApiKeyModel:
+        api_key.code = generate_code()
+        api_key.created_at = datetime.utcnow()
+        db_api_key = to_database(api_key)
+        self.session.add(db_api_key)
+        self.session.commit()
+        return to_model(db_api_key)
+
+    def find_all_by_user(self, user_code: str) -> List[ApiKeyModel]:
+        api_keys = self.session.query(ApiKey).filter(
+            ApiKey.user_code == user_code,
+            ApiKey.revoked_at.is_(None)
+        ).all()
+        return [to_model(api_key) for api_key in api_keys]
+
+    def find_active_by_digest(self, key_digest: str) -> Optional[Tuple[ApiKeyModel, UserModel]]:
+        """Loads the key and its owner in a single indexed lookup."""
+        row = self.session.query(ApiKey, User).join(User, User.code == ApiKey.user_code).filter(
+            ApiKey.key_digest == key_digest,
+            ApiKey.revoked_at.is_(None)
+        ).one_or_none()
+        if row is None:
+            return None
+        api_key, user = row
+        return to_model(api_key), user_to_model(user)
+
+    def touch(self, code: str, used_at: datetime, min_interval_seconds: int = 60):
+        # Só grava last_used_at quando o valor anterior é mais antigo que o intervalo,
+        # evitando um UPDATE a cada requisição do mesmo script.
+        self.session.query(ApiKey).filter(
+            ApiKey.code == code,
+            or_(ApiKey.last_used_at.is_(None),
+                ApiKey.last_used_at < used_at - timedelta(seconds=min_interval_seconds))
+        ).update({ApiKey.last_used_at: used_at})
+        self.session.commit()
+
+    def revoke(self, user_code: str, code: str):
+        updated_rows = self.session.query(ApiKey).filter(
+            ApiKey.code == code,
+            ApiKey.user_code == user_code,
+            ApiKey.revoked_at.is_(None)
+        ).update({ApiKey.revoked_at: datetime.utcnow()})
+        self.session.commit()
+        if updated_rows == 0:
+            raise ApiKeyNotFound()
@@ -7,7 +7,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from auth.principal_cache import principal_cache
 from auth.repository.db_connection import get_db_session
+from auth.service.login_throttle import login_throttle
 from auth.repository.user_db_repository import Base
 
 
@@ -37,6 +39,9 @@ def client(db_session):
     mock_get_price = Mock()
     mock_get_price.return_value.get_price.return_value = 99.99
 
+    principal_cache.clear()
+    login_throttle.reset()
+
     from main_test import app
     app.dependency_overrides[get_db_session] = override_get_db
     yield TestClient(app)
@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.orm import Session
+from sqlalchemy_mixins import AllFeaturesMixin
+
+from auth.domain.models import RefreshTokenModel
+from auth.repository.user_db_repository import Base
+
+
+class RefreshToken(Base, AllFeaturesMixin):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    __tablename__ = 'auth_refresh_tokens'
+    id = Column(Integer, primary_key=True, index=True)
+    token_digest = Column(String(64), index=True, unique=True, nullable=False)
+    family = Column(String, index=True, nullable=False)
+    user_code = Column(String, index=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+
+
+def to_database(refresh_token_model: RefreshTokenModel) -> RefreshToken:
+    return RefreshToken(**refresh_token_model.model_dump())
+
+
+def to_model(refresh_token: RefreshToken) -> RefreshTokenModel:
+    return RefreshTokenModel(**refresh_token.to_dict())
+
+
+class RefreshTokenRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def create(self, refresh_token: RefreshTokenModel) -> RefreshTokenModel:
+        db_refresh_token = to_database(refresh_token)
+        self.session.add(db_refresh_token)
+        self.session.commit()
+        return to_model(db_refresh_token)
+
+    def find_by_digest(self, token_digest: str) -> Optional[RefreshTokenModel]:
+        refresh_token = self.session.query(RefreshToken).filter(
+            RefreshToken.token_digest == token_digest
+        ).one_or_none()
+        return to_model(refresh_token) if refresh_token else None
+
+    def mark_used(self, refresh_token_id: int, used_at: datetime) -> bool:
+        """
+        Marks the token as rotated. Returns False when another request already used it,
+        so two concurrent refreshes cannot both succeed.
+        """
+        updated_rows = self.session.query(RefreshToken).filter(
+            RefreshToken.id == refresh_token_id,
+            RefreshToken.used_at.is_(None)
+        ).update({RefreshToken.used_at: used_at})
+        self.session.commit()
+        return updated_rows == 1
+
+    def revoke_family(self, family: str, revoked_at: datetime):
+        self.session.query(RefreshToken).filter(
+            RefreshToken.family == family,
+            RefreshToken.revoked_at.is_(None)
+        ).update({RefreshToken.revoked_at: revoked_at})
+        self.session.commit()
+
+    def revoke_all_by_user(self, user_code: str, revoked_at: datetime, commit: bool = True):
+        """With ``commit=False`` the update joins the caller's transaction."""
+        self.session.query(RefreshToken).filter(
+            RefreshToken.user_code == user_code,
+            RefreshToken.revoked_at.is_(None)
+        ).update({RefreshToken.revoked_at: revoked_at})
+        if commit:
+            self.session.commit()
@@ -1,6 +1,7 @@
 from datetime import date
+from typing import Iterable, List
 
-from sqlalchemy import Column, Date, Integer, String
+from sqlalchemy import Column, Date, Integer, String, insert
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session
@@ -8,6 +9,7 @@ from sqlalchemy_mixins import AllFeaturesMixin
 
 from auth.domain.models import UserModel
 from auth.domain.user_erros import UserNotFound
+from auth.principal_cache import invalidate_principal
 from helpers import generate_code
 
 Base = declarative_base()
@@ -24,6 +26,7 @@ class User(Base, AllFeaturesMixin):
     user_name = Column(String, index=True, unique=True)
     password = Column(String)
     created_at = Column(Date)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
 
 def to_database(user_model: UserModel) -> User:
@@ -46,6 +49,24 @@ class UserRepository:
         self.session.commit()
         return to_model(db_user)
 
+    def create_many(self, users: List[UserModel]) -> List[UserModel]:
+        """Inserts all users with a single multi-row INSERT and one commit."""
+        if not users:
+            return []
+        today = date.today()
+        for user in users:
+            user.code = generate_code()
+            user.created_at = today
+        rows = [user.model_dump() for user in users]
+        self.session.execute(insert(User.__table__).values(rows))
+        self.session.commit()
+        return users
+
+    def find_existing_user_names(self, user_names: Iterable[str]) -> set:
+        user_names = list(user_names)
+        rows = self.session.query(User.user_name).filter(User.user_name.in_(user_names)).all() if user_names else []
+        return {user_name for user_name, in rows}
+
     def get_user_by_code(self, user_code: str):
         try:
             user = self.session.query(User).filter(User.code == user_code).one()
@@ -63,17 +84,42 @@ class UserRepository:
     def update(self, user_code: int, updated_user: UserModel):
         try:
             user = self.session.query(User).filter(User.code == user_code).one()
+            invalidate_principal(user.user_name)
             for key, value in updated_user.model_dump().items():
                 setattr(user, key, value)
             self.session.commit()
+            invalidate_principal(user.user_name)
             return to_model(user)
         except NoResultFound:
             raise UserNotFound(f"User with code {user_code} not found")
 
+    def update_password(self, user_code: str, protected_password: str):
+        updated_rows = self.session.query(User).filter(User.code == user_code).update(
+            {User.password: protected_password}
+        )
+        self.session.commit()
+        if updated_rows == 0:
+            raise UserNotFound(f"User with code {user_code} not found")
+
+    def increment_token_version(self, user_code: str) -> int:
+        try:
+            user = self.session.query(User).filter(User.code == user_code).one()
+            user.token_version = (user.token_version or 0) + 1
+            self.session.commit()
+            invalidate_principal(user.user_name)
+            return user.token_version
+        except NoResultFound:
+            raise UserNotFound(f"User with code {user_code} not found")
+
+    def get_token_versions(self) -> dict:
+        rows = self.session.query(User.code, User.token_version).filter(User.token_version > 0).all()
+        return {code: token_version for code, token_version in rows}
+
     def delete(self, user_code: str):
         try:
             user = self.session.query(User).filter(User.code == user_code).one()
             self.session.delete(user)
             self.session.commit()
+            invalidate_principal(user.user_name)
         except NoResultFound:
             raise UserNotFound(f"User with code {user_code} not found")
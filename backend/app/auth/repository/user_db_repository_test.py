@@ -95,3 +95,33 @@ def test_delete_user(db_session, user_repository):
 
     with pytest.raises(UserNotFound):
         user_repository.delete("non-existent")
+
+
+def test_update_and_delete_invalidate_principal_cache(db_session, user_repository):
+    from auth.principal_cache import principal_cache
+
+    user = User(name="Test User", code="789", user_name="cached_user_name", password="password")
+    db_session.add(user)
+    db_session.commit()
+
+    principal_cache.set("cached_user_name", "cached principal")
+    retrieved_user = user_repository.get_user_by_code("789")
+    retrieved_user.user_name = "renamed_user_name"
+    user_repository.update("789", retrieved_user)
+    assert principal_cache.get("cached_user_name") is None
+
+    principal_cache.set("renamed_user_name", "cached principal")
+    user_repository.delete("789")
+    assert principal_cache.get("renamed_user_name") is None
+
+
+def test_update_password(db_session, user_repository):
+    user = User(name="Test User", code="654", user_name="test_user_name", password="old_hash")
+    db_session.add(user)
+    db_session.commit()
+
+    user_repository.update_password("654", "new_hash")
+
+    assert user_repository.get_user_by_code("654").password == "new_hash"
+    with pytest.raises(UserNotFound):
+        user_repository.update_password("non-existent", "new_hash")
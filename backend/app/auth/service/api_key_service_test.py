@@ -0,0 +1,98 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from auth.domain.auth_erros import InvalidApiKey, ApiKeyNotFound
+from auth.domain.models import UserModel
+from auth.repository.api_key_db_repository import ApiKeyRepository, ApiKey
+from auth.repository.user_db_repository import Base, UserRepository
+from auth.service.services import ApiKeyService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def user(db_session):
+    return UserRepository(db_session).create(
+        UserModel(code=None, name="User Test", user_name="test_login", password="hashed_password",
+                  created_at=date.today())
+    )
+
+
+@pytest.fixture
+def api_key_service(db_session):
+    return ApiKeyService(ApiKeyRepository(db_session), "secret_key")
+
+
+def test_create_stores_only_digest(api_key_service, db_session, user):
+    api_key_model, api_key = api_key_service.create(user.code, "script", ["read"])
+
+    assert api_key.startswith("mm_")
+    stored = db_session.query(ApiKey).one()
+    assert stored.key_digest != api_key
+    assert len(stored.key_digest) == 64
+    assert api_key.startswith(stored.key_prefix)
+    assert api_key_model.scopes == ["read"]
+
+
+def test_create_rejects_unknown_scope(api_key_service, user):
+    with pytest.raises(ValueError):
+        api_key_service.create(user.code, "script", ["admin"])
+
+
+def test_authenticate(api_key_service, user):
+    _, api_key = api_key_service.create(user.code, "script", ["write", "read"])
+
+    authenticated_user, scopes = api_key_service.authenticate(api_key)
+
+    assert authenticated_user.code == user.code
+    assert scopes == ["read", "write"]
+
+
+def test_authenticate_invalid_key(api_key_service, user):
+    api_key_service.create(user.code, "script", ["read"])
+
+    with pytest.raises(InvalidApiKey):
+        api_key_service.authenticate("mm_invalid")
+
+
+def test_authenticate_revoked_key(api_key_service, user):
+    api_key_model, api_key = api_key_service.create(user.code, "script", ["read"])
+    api_key_service.revoke(user.code, api_key_model.code)
+
+    with pytest.raises(InvalidApiKey):
+        api_key_service.authenticate(api_key)
+    assert api_key_service.find_all(user.code) == []
+
+
+def test_revoke_other_users_key(api_key_service, user):
+    api_key_model, _ = api_key_service.create(user.code, "script", ["read"])
+
+    with pytest.raises(ApiKeyNotFound):
+        api_key_service.revoke("other_user", api_key_model.code)
+
+
+def test_touch_is_throttled(api_key_service, db_session, user):
+    api_key_model, _ = api_key_service.create(user.code, "script", ["read"])
+    repository = ApiKeyRepository(db_session)
+    first_use = datetime(2024, 1, 1, 12, 0, 0)
+
+    repository.touch(api_key_model.code, first_use)
+    repository.touch(api_key_model.code, first_use + timedelta(seconds=10))
+    assert db_session.query(ApiKey).one().last_used_at == first_use
+
+    repository.touch(api_key_model.code, first_use + timedelta(minutes=5))
+    assert db_session.query(ApiKey).one().last_used_at == first_use + timedelta(minutes=5)
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import date, timedelta
 
 import pytest
@@ -7,6 +8,7 @@ from auth.domain.models import UserModel
 from auth.domain.user_erros import UserNotFound
 from auth.repository.user_db_repository import UserRepository
 from auth.service.services import PasswordService, AuthenticationUserService
+from auth.service.token_version_registry import TokenVersionRegistry
 
 
 @pytest.fixture
@@ -20,6 +22,7 @@ def mock_user_repository(mocker):
 def mock_password_service(mocker):
     mock = mocker.Mock(PasswordService)
     mock.protect_password.return_value = "hashed_password"
+    mock.needs_rehash.return_value = False
     return mock
 
 
@@ -105,3 +108,105 @@ def test_get_username_from_access_token_expired_token(authentication_user_servic
 
     with pytest.raises(ExpiredToken):
         authentication_user_service.get_username_from_access_token(token)
+
+
+@pytest.fixture
+def stateless_authentication_service(mock_user_repository, mock_password_service):
+    return AuthenticationUserService(mock_user_repository, mock_password_service, "secret_key",
+                                     stateless_tokens=True, token_versions=TokenVersionRegistry())
+
+
+def test_create_stateless_access_token_carries_principal(stateless_authentication_service, user):
+    token = stateless_authentication_service.create_access_token(user, timedelta(days=1))
+
+    claims = stateless_authentication_service.decode_access_token(token)
+    assert claims["user_name"] == user.user_name
+    assert claims["code"] == user.code
+    assert claims["name"] == user.name
+    assert claims["ver"] == user.token_version
+
+
+def test_get_principal_from_claims_does_not_query_user(stateless_authentication_service, mock_user_repository,
+                                                       user):
+    mock_user_repository.get_token_versions.return_value = {}
+    token = stateless_authentication_service.create_access_token(user, timedelta(days=1))
+    claims = stateless_authentication_service.decode_access_token(token)
+
+    principal = stateless_authentication_service.get_principal_from_claims(claims)
+
+    assert principal.code == user.code
+    assert principal.user_name == user.user_name
+    mock_user_repository.get_by_user_name.assert_not_called()
+
+
+def test_get_principal_from_claims_revoked_version(stateless_authentication_service, mock_user_repository, user):
+    mock_user_repository.get_token_versions.return_value = {user.code: 1}
+    token = stateless_authentication_service.create_access_token(user, timedelta(days=1))
+    claims = stateless_authentication_service.decode_access_token(token)
+
+    with pytest.raises(InvalidToken):
+        stateless_authentication_service.get_principal_from_claims(claims)
+
+
+def test_get_principal_from_claims_without_stateless_claims(authentication_user_service, user):
+    token = authentication_user_service.create_access_token(user, timedelta(days=1))
+    claims = authentication_user_service.decode_access_token(token)
+
+    assert authentication_user_service.get_principal_from_claims(claims) is None
+
+
+def test_authenticate_user_async(authentication_user_service, mock_user_repository, mock_password_service, user):
+    mock_user_repository.get_by_user_name.return_value = user
+    mock_password_service.verify_password.return_value = True
+
+    logged_user = asyncio.run(authentication_user_service.authenticate_user_async("test_login", "password"))
+
+    mock_password_service.verify_password.assert_called_once_with("password", user.password)
+    assert logged_user.user_name == "test_login"
+
+
+def test_authenticate_user_async_wrong_password(authentication_user_service, mock_user_repository,
+                                                mock_password_service, user):
+    mock_user_repository.get_by_user_name.return_value = user
+    mock_password_service.verify_password.return_value = False
+
+    with pytest.raises(UserNotFound):
+        asyncio.run(authentication_user_service.authenticate_user_async("test_login", "password"))
+
+
+def test_authenticate_user_rehashes_outdated_hash(authentication_user_service, mock_user_repository,
+                                                  mock_password_service, user):
+    mock_user_repository.get_by_user_name.return_value = user
+    mock_password_service.verify_password.return_value = True
+    mock_password_service.needs_rehash.return_value = True
+    mock_password_service.protect_password.return_value = "new_hashed_password"
+
+    logged_user = authentication_user_service.authenticate_user("test_login", "password")
+
+    mock_password_service.protect_password.assert_called_once_with("password")
+    mock_user_repository.update_password.assert_called_once_with(user.code, "new_hashed_password")
+    assert logged_user.password == "new_hashed_password"
+
+
+def test_authenticate_user_async_rehashes_outdated_hash(authentication_user_service, mock_user_repository,
+                                                        mock_password_service, user):
+    mock_user_repository.get_by_user_name.return_value = user
+    mock_password_service.verify_password.return_value = True
+    mock_password_service.needs_rehash.return_value = True
+    mock_password_service.protect_password.return_value = "new_hashed_password"
+
+    asyncio.run(authentication_user_service.authenticate_user_async("test_login", "password"))
+
+    mock_user_repository.update_password.assert_called_once_with(user.code, "new_hashed_password")
+
+
+def test_authenticate_user_ignores_rehash_failure(authentication_user_service, mock_user_repository,
+                                                  mock_password_service, user):
+    mock_user_repository.get_by_user_name.return_value = user
+    mock_password_service.verify_password.return_value = True
+    mock_password_service.needs_rehash.return_value = True
+    mock_user_repository.update_password.side_effect = UserNotFound()
+
+    logged_user = authentication_user_service.authenticate_user("test_login", "password")
+
+    assert logged_user.password == "hashed_password"
@@ -0,0 +1,153 @@
+"""
+Limitador de tentativas de login (token bucket) por user_name e por IP.
+
+Cada tentativa em /users/signin custa um bcrypt.checkpw completo; o limitador
+rejeita a tentativa antes de chegar ao AuthenticationUserService quando um dos
+baldes está vazio. Por padrão os baldes ficam em memória (por worker); com
+LOGIN_THROTTLE_REDIS_URL definido eles são compartilhados entre workers via
+Redis (requer o pacote opcional ``redis``).
+
+Atrás de um proxy reverso (o nginx do docker-compose) o IP da conexão é o do
+proxy, e todos os usuários cairiam no mesmo balde de IP. Quando a conexão vem de
+um endereço em LOGIN_THROTTLE_TRUSTED_PROXIES (IPs ou redes separados por
+vírgula), o IP do cliente sai de X-Forwarded-For (o último salto que não é um
+proxy confiável) ou de X-Real-IP; de outros endereços esses cabeçalhos são ignorados.
+"""
+import ipaddress
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class InMemoryTokenBucketBackend:
+    def __init__(self, max_keys: int = 100_000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> bool:
+        with self._lock:
+            now = self._clock()
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            # Descarta os baldes mais antigos; um balde descartado volta cheio.
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisTokenBucketBackend:
+    TAKE_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+    return allowed
+    """
+
+    def __init__(self, url: str, prefix: str = "login-throttle:", client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(self.TAKE_SCRIPT)
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> bool:
+        return bool(self._take(keys=[self.prefix + key], args=[capacity, refill_per_second, time.time()]))
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class LoginThrottle:
+    """Um balde por user_name e outro por IP; os baldes enchem por completo em ``window_seconds``."""
+
+    def __init__(self, backend, user_capacity: int = 5, ip_capacity: int = 20, window_seconds: float = 60.0,
+                 trusted_proxies=()):
+        self.backend = backend
+        self.user_capacity = user_capacity
+        self.ip_capacity = ip_capacity
+        self.window_seconds = window_seconds
+        self.trusted_proxies = list(trusted_proxies)
+        self.allowed = 0
+        self.rejected = 0
+
+    def is_trusted_proxy(self, host: str) -> bool:
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    def client_ip(self, request) -> str:
+        peer = request.client.host if request.client else "unknown"
+        if not self.is_trusted_proxy(peer):
+            return peer
+        forwarded = [host.strip() for host in request.headers.get("x-forwarded-for", "").split(",") if host.strip()]
+        for host in reversed(forwarded):
+            if not self.is_trusted_proxy(host):
+                return host
+        if forwarded:
+            return forwarded[0]
+        return request.headers.get("x-real-ip", peer).strip()
+
+    def allow(self, user_name: str, client_ip: str) -> bool:
+        allowed = (
+                self.backend.take(f"ip:{client_ip}", self.ip_capacity, self.ip_capacity / self.window_seconds)
+                and self.backend.take(f"user:{user_name}", self.user_capacity,
+                                      self.user_capacity / self.window_seconds)
+        )
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        return allowed
+
+    def reset(self):
+        self.backend.clear()
+        self.allowed = 0
+        self.rejected = 0
+
+    def stats(self) -> dict:
+        return {"allowed": self.allowed, "rejected": self.rejected}
+
+
+def parse_trusted_proxies(value: str) -> list:
+    return [ipaddress.ip_network(entry.strip(), strict=False) for entry in value.split(",") if entry.strip()]
+
+
+def create_login_throttle() -> LoginThrottle:
+    redis_url = os.getenv("LOGIN_THROTTLE_REDIS_URL")
+    backend = RedisTokenBucketBackend(redis_url) if redis_url else InMemoryTokenBucketBackend()
+    return LoginThrottle(
+        backend,
+        user_capacity=int(os.getenv("LOGIN_THROTTLE_USER_CAPACITY", "5")),
+        ip_capacity=int(os.getenv("LOGIN_THROTTLE_IP_CAPACITY", "20")),
+        window_seconds=float(os.getenv("LOGIN_THROTTLE_WINDOW_SECONDS", "60")),
+        trusted_proxies=parse_trusted_proxies(os.getenv("LOGIN_THROTTLE_TRUSTED_PROXIES", "")),
+    )
+
+
+login_throttle = create_login_throttle()
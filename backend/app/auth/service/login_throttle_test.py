@@ -0,0 +1,89 @@
+from starlette.requests import Request
+
+from auth.service.login_throttle import InMemoryTokenBucketBackend, LoginThrottle, parse_trusted_proxies
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_up_to_capacity():
+    backend = InMemoryTokenBucketBackend(clock=FakeClock())
+
+    assert [backend.take("key", 3, 1) for _ in range(4)] == [True, True, True, False]
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    backend = InMemoryTokenBucketBackend(clock=clock)
+    backend.take("key", 1, 0.5)
+    assert backend.take("key", 1, 0.5) is False
+
+    clock.now = 2
+    assert backend.take("key", 1, 0.5) is True
+
+
+def test_evicted_bucket_starts_full():
+    backend = InMemoryTokenBucketBackend(max_keys=1, clock=FakeClock())
+    backend.take("first", 1, 1)
+    backend.take("second", 1, 1)
+
+    assert backend.take("first", 1, 1) is True
+
+
+def test_throttle_by_user_name():
+    throttle = LoginThrottle(InMemoryTokenBucketBackend(clock=FakeClock()), user_capacity=2, ip_capacity=10)
+
+    assert throttle.allow("user", "10.0.0.1") is True
+    assert throttle.allow("user", "10.0.0.2") is True
+    assert throttle.allow("user", "10.0.0.3") is False
+    assert throttle.allow("other_user", "10.0.0.3") is True
+    assert throttle.stats() == {"allowed": 3, "rejected": 1}
+
+
+def test_throttle_by_client_ip():
+    throttle = LoginThrottle(InMemoryTokenBucketBackend(clock=FakeClock()), user_capacity=10, ip_capacity=2)
+
+    assert throttle.allow("user1", "10.0.0.1") is True
+    assert throttle.allow("user2", "10.0.0.1") is True
+    assert throttle.allow("user3", "10.0.0.1") is False
+    assert throttle.allow("user3", "10.0.0.2") is True
+
+
+def test_reset():
+    throttle = LoginThrottle(InMemoryTokenBucketBackend(clock=FakeClock()), user_capacity=1, ip_capacity=1)
+    throttle.allow("user", "10.0.0.1")
+    throttle.allow("user", "10.0.0.1")
+
+    throttle.reset()
+
+    assert throttle.allow("user", "10.0.0.1") is True
+    assert throttle.stats() == {"allowed": 1, "rejected": 0}
+
+
+def make_request(peer: str, headers: dict = None) -> Request:
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "client": (peer, 40000), "headers": raw_headers})
+
+
+def test_client_ip_from_trusted_proxy():
+    throttle = LoginThrottle(InMemoryTokenBucketBackend(), trusted_proxies=parse_trusted_proxies("172.16.0.0/12"))
+
+    assert throttle.client_ip(make_request("172.18.0.2", {"X-Forwarded-For": "203.0.113.7"})) == "203.0.113.7"
+    # Só o salto acrescentado pelo proxy confiável vale; o resto do cabeçalho veio do cliente.
+    assert throttle.client_ip(
+        make_request("172.18.0.2", {"X-Forwarded-For": "1.2.3.4, 203.0.113.7, 172.18.0.5"})) == "203.0.113.7"
+    assert throttle.client_ip(make_request("172.18.0.2", {"X-Real-IP": "203.0.113.8"})) == "203.0.113.8"
+    assert throttle.client_ip(make_request("172.18.0.2")) == "172.18.0.2"
+
+
+def test_client_ip_ignores_headers_from_untrusted_peer():
+    throttle = LoginThrottle(InMemoryTokenBucketBackend(), trusted_proxies=parse_trusted_proxies("172.16.0.0/12"))
+
+    assert throttle.client_ip(make_request("198.51.100.1", {"X-Forwarded-For": "203.0.113.7"})) == "198.51.100.1"
+    assert LoginThrottle(InMemoryTokenBucketBackend()).client_ip(
+        make_request("172.18.0.2", {"X-Forwarded-For": "203.0.113.7"})) == "172.18.0.2"
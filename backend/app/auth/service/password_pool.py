@@ -0,0 +1,62 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from auth.domain.auth_erros import PasswordHashingBusy
+
+
+class PasswordHashingPool:
+    """Runs bcrypt calls on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL while hashing, so moving it off the event loop lets
+    the worker keep serving other requests during a signin/signup burst.
+    ``max_workers=0`` runs the calls inline (the previous behaviour). Once
+    ``max_queue`` calls are waiting or running, new ones fail fast with
+    PasswordHashingBusy instead of piling up.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 64):
+        self._lock = threading.Lock()
+        self._executor = None
+        self.queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.configure(max_workers, max_queue)
+
+    def configure(self, max_workers: int, max_queue: int = 64):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="bcrypt") if max_workers > 0 else None
+
+    async def run(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)
+        with self._lock:
+            if self.queue_depth >= self.max_queue:
+                self.rejected += 1
+                raise PasswordHashingBusy()
+            self.queue_depth += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_pool = PasswordHashingPool(
+    max_workers=int(os.getenv("AUTH_BCRYPT_WORKERS", "2")),
+    max_queue=int(os.getenv("AUTH_BCRYPT_MAX_QUEUE", "64")),
+)
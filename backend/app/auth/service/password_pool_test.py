@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+
+from auth.domain.auth_erros import PasswordHashingBusy
+from auth.service.password_pool import PasswordHashingPool
+
+
+def current_thread_name():
+    return threading.current_thread().name
+
+
+def test_run_inline_without_workers():
+    pool = PasswordHashingPool(max_workers=0)
+
+    result = asyncio.run(pool.run(current_thread_name))
+
+    assert result == threading.current_thread().name
+
+
+def test_run_on_worker_thread():
+    pool = PasswordHashingPool(max_workers=1)
+
+    result = asyncio.run(pool.run(current_thread_name))
+
+    assert result.startswith("bcrypt")
+    assert pool.stats()["completed"] == 1
+    assert pool.stats()["queue_depth"] == 0
+
+
+def test_rejects_when_queue_is_full():
+    pool = PasswordHashingPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+        assert pool.queue_depth == 1
+        with pytest.raises(PasswordHashingBusy):
+            await pool.run(current_thread_name)
+        release.set()
+        await blocked
+
+    asyncio.run(scenario())
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["queue_depth"] == 0
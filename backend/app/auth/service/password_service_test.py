@@ -1,3 +1,5 @@
+import pytest
+
 from auth.service.services import PasswordService
 
 
@@ -23,3 +25,48 @@ def test_verify_password_with_incorrect_password():
     password_hash = PasswordService.protect_password(password)
 
     assert PasswordService.verify_password(wrong_password, password_hash) is False
+
+
+@pytest.fixture
+def work_factor():
+    yield
+    PasswordService.work_factor = None
+
+
+def test_protect_password_uses_work_factor(work_factor):
+    PasswordService.work_factor = 5
+    password_hash = PasswordService.protect_password("my_secure_password")
+
+    assert PasswordService.get_work_factor(password_hash) == 5
+    assert PasswordService.verify_password("my_secure_password", password_hash) is True
+
+
+def test_needs_rehash(work_factor):
+    password_hash = PasswordService.protect_password("my_secure_password")
+    assert PasswordService.needs_rehash(password_hash) is False
+
+    PasswordService.work_factor = 4
+    assert PasswordService.needs_rehash(password_hash) is True
+    assert PasswordService.needs_rehash(PasswordService.protect_password("my_secure_password")) is False
+
+
+def test_calibrate_respects_bounds(work_factor):
+    assert PasswordService.calibrate(0.001, min_rounds=4, max_rounds=6, sample_rounds=4) == 4
+    assert PasswordService.calibrate(10_000, min_rounds=4, max_rounds=6, sample_rounds=4) == 6
+    assert PasswordService.work_factor == 6
+
+
+def test_configure_from_env(work_factor, monkeypatch):
+    monkeypatch.delenv("AUTH_BCRYPT_ROUNDS", raising=False)
+    monkeypatch.delenv("AUTH_BCRYPT_TARGET_MS", raising=False)
+    assert PasswordService.configure_from_env() is None
+    assert PasswordService.work_factor is None
+
+    monkeypatch.setenv("AUTH_BCRYPT_TARGET_MS", "0.001")
+    monkeypatch.setenv("AUTH_BCRYPT_MIN_ROUNDS", "5")
+    assert PasswordService.configure_from_env() == 5
+
+    # Custo fixo tem prioridade sobre a calibragem
+    monkeypatch.setenv("AUTH_BCRYPT_ROUNDS", "7")
+    assert PasswordService.configure_from_env() == 7
+    assert PasswordService.work_factor == 7
@@ -0,0 +1,113 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from auth.domain.auth_erros import InvalidRefreshToken, SecretKeyNotSet
+from auth.domain.models import UserModel
+from auth.repository.refresh_token_db_repository import RefreshTokenRepository, RefreshToken
+from auth.repository.user_db_repository import Base, UserRepository
+from auth.service.services import RefreshTokenService, UserServiceFactory
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def user(db_session):
+    return UserRepository(db_session).create(
+        UserModel(code=None, name="User Test", user_name="test_login", password="hashed_password",
+                  created_at=date.today())
+    )
+
+
+@pytest.fixture
+def refresh_token_service(db_session):
+    return RefreshTokenService(RefreshTokenRepository(db_session), UserRepository(db_session), "secret_key")
+
+
+def test_issue_stores_only_digest(refresh_token_service, db_session, user):
+    refresh_token = refresh_token_service.issue(user)
+
+    stored_token = db_session.query(RefreshToken).one()
+    assert stored_token.token_digest != refresh_token
+    assert len(stored_token.token_digest) == 64
+    assert stored_token.user_code == user.code
+
+
+def test_rotate_returns_user_and_new_token(refresh_token_service, user):
+    refresh_token = refresh_token_service.issue(user)
+
+    rotated_user, new_refresh_token = refresh_token_service.rotate(refresh_token)
+
+    assert rotated_user.code == user.code
+    assert new_refresh_token != refresh_token
+
+
+def test_rotate_unknown_token(refresh_token_service):
+    with pytest.raises(InvalidRefreshToken):
+        refresh_token_service.rotate("unknown")
+
+
+def test_reused_token_revokes_family(refresh_token_service, user):
+    refresh_token = refresh_token_service.issue(user)
+    _, new_refresh_token = refresh_token_service.rotate(refresh_token)
+
+    with pytest.raises(InvalidRefreshToken):
+        refresh_token_service.rotate(refresh_token)
+    with pytest.raises(InvalidRefreshToken):
+        refresh_token_service.rotate(new_refresh_token)
+
+
+def test_expired_token(db_session, user):
+    service = RefreshTokenService(RefreshTokenRepository(db_session), UserRepository(db_session), "secret_key",
+                                  lifetime=timedelta(seconds=-1))
+    refresh_token = service.issue(user)
+
+    with pytest.raises(InvalidRefreshToken):
+        service.rotate(refresh_token)
+
+
+def test_revoke(refresh_token_service, db_session, user):
+    refresh_token = refresh_token_service.issue(user)
+
+    refresh_token_service.revoke(refresh_token)
+
+    assert db_session.query(RefreshToken).one().revoked_at <= datetime.utcnow()
+    with pytest.raises(InvalidRefreshToken):
+        refresh_token_service.rotate(refresh_token)
+
+
+def test_refresh_token_secret_falls_back_to_secret_key(monkeypatch, db_session):
+    monkeypatch.delenv("REFRESH_TOKEN_SECRET", raising=False)
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    assert UserServiceFactory.create_refresh_token_service(db_session).secret_key == b"secret_key"
+
+    monkeypatch.setenv("REFRESH_TOKEN_SECRET", "refresh_secret")
+    assert UserServiceFactory.create_refresh_token_service(db_session).secret_key == b"refresh_secret"
+
+
+def test_missing_secret_raises_instead_of_exiting(monkeypatch, db_session):
+    monkeypatch.delenv("SECRET_KEY", raising=False)
+    monkeypatch.delenv("REFRESH_TOKEN_SECRET", raising=False)
+    monkeypatch.setenv("AUTH_TOKEN_ALGORITHM", "ES256")
+
+    with pytest.raises(SecretKeyNotSet):
+        UserServiceFactory.create_refresh_token_service(db_session)
+    with pytest.raises(SecretKeyNotSet):
+        UserServiceFactory.check_secrets()
+
+    monkeypatch.setenv("REFRESH_TOKEN_SECRET", "refresh_secret")
+    monkeypatch.setenv("API_KEY_SECRET", "api_key_secret")
+    UserServiceFactory.check_secrets()
@@ -1,60 +1,198 @@
+import functools
+import hashlib
+import hmac
+import logging
+import math
+import os
+import secrets
+import time
 from datetime import timedelta, datetime
-from typing import Optional
+from typing import List, Optional
 
 import bcrypt
 import jwt
 
-from auth.domain.auth_erros import ExpiredToken, InvalidToken
-from auth.domain.models import UserModel
+from auth.domain.auth_erros import ExpiredToken, InvalidToken, InvalidRefreshToken, InvalidApiKey, SecretKeyNotSet
+from auth.domain.models import UserModel, RefreshTokenModel, ApiKeyModel
 from auth.domain.user_erros import UserNotFound
+from auth.repository.api_key_db_repository import ApiKeyRepository
+from auth.repository.refresh_token_db_repository import RefreshTokenRepository
 from auth.repository.user_db_repository import UserRepository
+from auth.service.password_pool import password_pool
+from auth.service.token_keys import HMAC_ALGORITHM, TokenKeyRing, get_token_key_ring
+from auth.service.token_version_registry import TokenVersionRegistry
+from database import run_sync, sync_session
 
 
 class PasswordService:
+    # Custo do bcrypt usado nos novos hashes; None mantém o padrão do bcrypt.gensalt().
+    work_factor: Optional[int] = None
+
     @staticmethod
     def protect_password(plain_password: str) -> str:
-        return bcrypt.hashpw(plain_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        rounds = PasswordService.work_factor
+        salt = bcrypt.gensalt(rounds) if rounds else bcrypt.gensalt()
+        return bcrypt.hashpw(plain_password.encode('utf-8'), salt).decode('utf-8')
 
     @staticmethod
     def verify_password(plain_password, protected_password):
         return bcrypt.checkpw(plain_password.encode('utf-8'), protected_password.encode('utf-8'))
 
+    @staticmethod
+    def get_work_factor(protected_password: str) -> int:
+        # Formato do hash: $2b$<custo>$<salt+hash>
+        return int(protected_password.split('$')[2])
+
+    @staticmethod
+    def needs_rehash(protected_password: str) -> bool:
+        rounds = PasswordService.work_factor
+        return rounds is not None and PasswordService.get_work_factor(protected_password) != rounds
+
+    @staticmethod
+    def calibrate(target_ms: float, min_rounds: int = 10, max_rounds: int = 16, sample_rounds: int = 8) -> int:
+        """
+        Picks the highest bcrypt cost whose hash time stays within ``target_ms`` on this machine.
+        Each extra round doubles the time, so one cheap sample is enough to extrapolate.
+        """
+        start = time.perf_counter()
+        bcrypt.hashpw(b'calibration', bcrypt.gensalt(sample_rounds))
+        sample_ms = max((time.perf_counter() - start) * 1000, 0.001)
+        rounds = sample_rounds + math.floor(math.log2(target_ms / sample_ms))
+        PasswordService.work_factor = max(min_rounds, min(max_rounds, rounds))
+        logging.info(f"bcrypt work factor calibrated to {PasswordService.work_factor} "
+                     f"(target {target_ms}ms, {sample_rounds} rounds took {sample_ms:.1f}ms)")
+        return PasswordService.work_factor
+
+    @staticmethod
+    def configure_from_env() -> Optional[int]:
+        """
+        Same cost on the server and in the CLI tools: AUTH_BCRYPT_ROUNDS fixes it;
+        otherwise AUTH_BCRYPT_TARGET_MS calibrates it on this machine. None keeps bcrypt's default.
+        """
+        rounds = os.getenv("AUTH_BCRYPT_ROUNDS")
+        if rounds:
+            PasswordService.work_factor = int(rounds)
+            return PasswordService.work_factor
+        target_ms = os.getenv("AUTH_BCRYPT_TARGET_MS")
+        if target_ms:
+            return PasswordService.calibrate(
+                float(target_ms),
+                min_rounds=int(os.getenv("AUTH_BCRYPT_MIN_ROUNDS", "10")),
+                max_rounds=int(os.getenv("AUTH_BCRYPT_MAX_ROUNDS", "16")),
+            )
+        return None
+
+
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=int(os.getenv("AUTH_ACCESS_TOKEN_MINUTES", "1440")))
+REFRESH_TOKEN_LIFETIME = timedelta(days=int(os.getenv("AUTH_REFRESH_TOKEN_DAYS", "30")))
+
+API_KEY_SCOPES = ("read", "write")
+
+
+def hmac_digest(secret_key: bytes, value: str) -> str:
+    return hmac.new(secret_key, value.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+async def run_inline(fn, /, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+token_version_registry = TokenVersionRegistry(
+    refresh_interval=float(os.getenv("AUTH_TOKEN_VERSION_REFRESH_SECONDS", "30"))
+)
+
 
 class AuthenticationUserService:
-    def __init__(self, user_repository: UserRepository, password_service: PasswordService, secret_key: str):
+    STATELESS_CLAIMS = ("code", "name", "ver")
+
+    def __init__(
+            self,
+            user_repository: UserRepository,
+            password_service: PasswordService,
+            secret_key: Optional[str],
+            stateless_tokens: bool = False,
+            token_versions: TokenVersionRegistry = token_version_registry,
+            key_ring: Optional[TokenKeyRing] = None,
+            run_db=run_inline
+    ):
         self.user_repository = user_repository
         self.password_service = password_service
-        self.SECRET_KEY = secret_key
-        self.ALGORITHM = "HS256"
+        self.key_ring = key_ring or TokenKeyRing.hmac(secret_key)
+        self.stateless_tokens = stateless_tokens
+        self.token_versions = token_versions
+        self.run_db = run_db
 
     def authenticate_user(self, user_name: str, password: str) -> UserModel:
         user = self.user_repository.get_by_user_name(user_name)
         is_password_valid = self.password_service.verify_password(password, user.password)
+        user = self._check_password(user, is_password_valid)
+        if self.password_service.needs_rehash(user.password):
+            self._rehash_password(user, self.password_service.protect_password(password))
+        return user
+
+    async def authenticate_user_async(self, user_name: str, password: str) -> UserModel:
+        """
+        Same as authenticate_user, but bcrypt runs on the password pool and the
+        queries through ``run_db``, so neither blocks the event loop.
+        """
+        user = await self.run_db(self.user_repository.get_by_user_name, user_name)
+        is_password_valid = await password_pool.run(self.password_service.verify_password, password, user.password)
+        user = self._check_password(user, is_password_valid)
+        if self.password_service.needs_rehash(user.password):
+            protected_password = await password_pool.run(self.password_service.protect_password, password)
+            await self.run_db(self._rehash_password, user, protected_password)
+        return user
+
+    def _rehash_password(self, user: UserModel, protected_password: str):
+        # O login já foi validado; uma falha ao regravar o hash não deve impedir o acesso.
+        try:
+            self.user_repository.update_password(user.code, protected_password)
+            user.password = protected_password
+        except Exception as e:
+            logging.error(f"Failed to rehash password of user {user.code}: {str(e)}")
+
+    @staticmethod
+    def _check_password(user: UserModel, is_password_valid: bool) -> UserModel:
         match is_password_valid:
             case True:
                 return user
             case False:
-                raise UserNotFound(f"User with login {user_name} not found")
+                raise UserNotFound(f"User with login {user.user_name} not found")
 
     def get_user_from_token(self, token: str) -> UserModel:
         user_name = self.get_username_from_access_token(token)
         return self.user_repository.get_by_user_name(user_name)
 
+    def get_principal_from_claims(self, claims: dict) -> Optional[UserModel]:
+        """
+        Builds the user from a stateless token without querying auth_users.
+        Returns None when the token does not carry the stateless claims.
+        """
+        if not self.stateless_tokens or not all(claim in claims for claim in self.STATELESS_CLAIMS):
+            return None
+        if self.token_versions.is_revoked(claims["code"], claims["ver"], self.user_repository.get_token_versions):
+            raise InvalidToken()
+        return UserModel(code=claims["code"], name=claims["name"], user_name=claims["user_name"],
+                         password="", created_at=None, token_version=claims["ver"])
+
     def create_access_token(self, user: UserModel, expires_delta: Optional[timedelta] = None):
         data = {"user_name": user.user_name}
+        if self.stateless_tokens:
+            data.update({"code": user.code, "name": user.name, "ver": user.token_version})
         to_encode = data.copy()
         if expires_delta:
             expire = datetime.utcnow() + expires_delta
         else:
             expire = datetime.utcnow() + timedelta(days=1)
         to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
-        return encoded_jwt
+        return self.key_ring.sign(to_encode)
 
     def get_username_from_access_token(self, token):
+        return self.decode_access_token(token)["user_name"]
+
+    def decode_access_token(self, token) -> dict:
         try:
-            decoded_token = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            return decoded_token["user_name"]
+            return self.key_ring.decode(token)
         except jwt.ExpiredSignatureError:
             raise ExpiredToken()
         except jwt.InvalidTokenError:
@@ -62,14 +200,26 @@ class AuthenticationUserService:
 
 
 class UserService:
-    def __init__(self, user_repository: UserRepository, password_service: PasswordService):
+    def __init__(
+            self,
+            user_repository: UserRepository,
+            password_service: PasswordService,
+            run_db=run_inline,
+            refresh_token_repository: Optional[RefreshTokenRepository] = None
+    ):
         self.user_repository = user_repository
         self.password_service = password_service
+        self.run_db = run_db
+        self.refresh_token_repository = refresh_token_repository
 
     def create(self, user: UserModel) -> UserModel:
         user.password = self.password_service.protect_password(user.password)
         return self.user_repository.create(user)
 
+    async def create_async(self, user: UserModel) -> UserModel:
+        user.password = await password_pool.run(self.password_service.protect_password, user.password)
+        return await self.run_db(self.user_repository.create, user)
+
     def get_user_by_code(self, user_code: str) -> UserModel:
         user = self.user_repository.get_user_by_code(user_code)
         return user
@@ -80,18 +230,172 @@ class UserService:
     def delete(self, user_code: str) -> None:
         self.user_repository.delete(user_code)
 
+    def revoke_tokens(self, user_code: str) -> int:
+        # Refresh tokens too: rotate() would otherwise keep issuing access tokens with the new version.
+        # Same session, so the commit of increment_token_version covers both updates.
+        if self.refresh_token_repository is not None:
+            self.refresh_token_repository.revoke_all_by_user(user_code, datetime.utcnow(), commit=False)
+        token_version = self.user_repository.increment_token_version(user_code)
+        token_version_registry.record(user_code, token_version)
+        return token_version
+
+
+class RefreshTokenService:
+    """
+    Opaque refresh tokens with rotation. Only an HMAC-SHA256 digest of each token is
+    stored, so a refresh is one indexed lookup instead of a bcrypt verification.
+    Every refresh consumes the token and issues the next one of the same family;
+    presenting an already used token revokes the whole family.
+    """
+
+    def __init__(
+            self,
+            refresh_token_repository: RefreshTokenRepository,
+            user_repository: UserRepository,
+            secret_key: str,
+            lifetime: timedelta = REFRESH_TOKEN_LIFETIME
+    ):
+        self.refresh_token_repository = refresh_token_repository
+        self.user_repository = user_repository
+        self.secret_key = secret_key.encode('utf-8')
+        self.lifetime = lifetime
+
+    def _digest(self, refresh_token: str) -> str:
+        return hmac_digest(self.secret_key, refresh_token)
+
+    def issue(self, user: UserModel, family: Optional[str] = None) -> str:
+        refresh_token = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        self.refresh_token_repository.create(RefreshTokenModel(
+            id=None,
+            token_digest=self._digest(refresh_token),
+            family=family or secrets.token_hex(8),
+            user_code=user.code,
+            expires_at=now + self.lifetime,
+            created_at=now,
+            used_at=None,
+            revoked_at=None
+        ))
+        return refresh_token
+
+    def _find_valid(self, refresh_token: str) -> RefreshTokenModel:
+        token_digest = self._digest(refresh_token)
+        stored_token = self.refresh_token_repository.find_by_digest(token_digest)
+        if stored_token is None or not hmac.compare_digest(stored_token.token_digest, token_digest):
+            raise InvalidRefreshToken()
+        if stored_token.revoked_at is not None or stored_token.expires_at <= datetime.utcnow():
+            raise InvalidRefreshToken()
+        return stored_token
+
+    def rotate(self, refresh_token: str) -> tuple[UserModel, str]:
+        stored_token = self._find_valid(refresh_token)
+        now = datetime.utcnow()
+        if stored_token.used_at is not None or not self.refresh_token_repository.mark_used(stored_token.id, now):
+            # Reuso de um token já rotacionado: possível vazamento, revoga a família inteira.
+            self.refresh_token_repository.revoke_family(stored_token.family, now)
+            raise InvalidRefreshToken()
+        try:
+            user = self.user_repository.get_user_by_code(stored_token.user_code)
+        except UserNotFound:
+            raise InvalidRefreshToken()
+        return user, self.issue(user, stored_token.family)
+
+    def revoke(self, refresh_token: str):
+        stored_token = self._find_valid(refresh_token)
+        self.refresh_token_repository.revoke_family(stored_token.family, datetime.utcnow())
+
+
+class ApiKeyService:
+    """
+    Per-user API keys for scripted clients. Keys are stored as keyed HMAC-SHA256
+    digests, so authenticating a key is one indexed lookup and never touches bcrypt.
+    """
+    KEY_PREFIX = "mm_"
+
+    def __init__(self, api_key_repository: ApiKeyRepository, secret_key: str):
+        self.api_key_repository = api_key_repository
+        self.secret_key = secret_key.encode('utf-8')
+
+    def create(self, user_code: str, name: str, scopes: List[str]) -> tuple[ApiKeyModel, str]:
+        invalid_scopes = set(scopes) - set(API_KEY_SCOPES)
+        if not scopes or invalid_scopes:
+            raise ValueError(f"Invalid scopes: {sorted(invalid_scopes) or scopes}")
+        api_key = self.KEY_PREFIX + secrets.token_urlsafe(32)
+        api_key_model = self.api_key_repository.create(ApiKeyModel(
+            code=None,
+            user_code=user_code,
+            name=name,
+            key_prefix=api_key[:len(self.KEY_PREFIX) + 6],
+            key_digest=hmac_digest(self.secret_key, api_key),
+            scopes=sorted(set(scopes)),
+            created_at=None,
+            last_used_at=None,
+            revoked_at=None
+        ))
+        return api_key_model, api_key
+
+    def find_all(self, user_code: str) -> List[ApiKeyModel]:
+        return self.api_key_repository.find_all_by_user(user_code)
+
+    def revoke(self, user_code: str, code: str):
+        self.api_key_repository.revoke(user_code, code)
+
+    def authenticate(self, api_key: str) -> tuple[UserModel, List[str]]:
+        key_digest = hmac_digest(self.secret_key, api_key)
+        result = self.api_key_repository.find_active_by_digest(key_digest)
+        if result is None:
+            raise InvalidApiKey()
+        api_key_model, user = result
+        if not hmac.compare_digest(api_key_model.key_digest, key_digest):
+            raise InvalidApiKey()
+        self.api_key_repository.touch(api_key_model.code, datetime.utcnow())
+        return user, api_key_model.scopes
+
 
 class UserServiceFactory:
     @staticmethod
     def create_user_service(db_session) -> UserService:
-        return UserService(UserRepository(db_session), PasswordService())
+        db_session_sync = sync_session(db_session)
+        return UserService(UserRepository(db_session_sync), PasswordService(),
+                           functools.partial(run_sync, db_session), RefreshTokenRepository(db_session_sync))
+
+    @staticmethod
+    def _get_secret_key(name: str = "SECRET_KEY") -> str:
+        """``name`` (REFRESH_TOKEN_SECRET, API_KEY_SECRET) falls back to SECRET_KEY."""
+        secret_key = os.getenv(name) or os.getenv("SECRET_KEY")
+        if not secret_key:
+            raise SecretKeyNotSet(name)
+        return secret_key
+
+    @staticmethod
+    def check_secrets():
+        """
+        Called at startup: a missing secret stops the process there. Refresh tokens and
+        API keys are HMAC digests and need a secret even when access tokens are ES256/EdDSA.
+        """
+        if os.getenv("AUTH_TOKEN_ALGORITHM", HMAC_ALGORITHM) == HMAC_ALGORITHM:
+            UserServiceFactory._get_secret_key()
+        UserServiceFactory._get_secret_key("REFRESH_TOKEN_SECRET")
+        UserServiceFactory._get_secret_key("API_KEY_SECRET")
+
+    @staticmethod
+    def create_api_key_service(db_session) -> ApiKeyService:
+        secret_key = UserServiceFactory._get_secret_key("API_KEY_SECRET")
+        return ApiKeyService(ApiKeyRepository(sync_session(db_session)), secret_key)
+
+    @staticmethod
+    def create_refresh_token_service(db_session) -> RefreshTokenService:
+        secret_key = UserServiceFactory._get_secret_key("REFRESH_TOKEN_SECRET")
+        db_session = sync_session(db_session)
+        return RefreshTokenService(RefreshTokenRepository(db_session), UserRepository(db_session), secret_key)
 
     @staticmethod
     def create_authentication_user_service(db_session) -> AuthenticationUserService:
-        import os
-        secret_key = os.getenv("SECRET_KEY", None)
-        if secret_key is None:
-            import sys
-            sys.exit("Encerrando pois SECRET_KEY não está definido.")
+        secret_key = os.getenv("SECRET_KEY")
+        if os.getenv("AUTH_TOKEN_ALGORITHM", HMAC_ALGORITHM) == HMAC_ALGORITHM:
+            secret_key = UserServiceFactory._get_secret_key()
 
-        return AuthenticationUserService(UserRepository(db_session), PasswordService(), secret_key)
+        stateless_tokens = os.getenv("AUTH_STATELESS_TOKENS", "false").lower() in ("1", "true")
+        return AuthenticationUserService(UserRepository(sync_session(db_session)), PasswordService(), secret_key,
+                                         stateless_tokens, key_ring=get_token_key_ring(),
+                                         run_db=functools.partial(run_sync, db_session))
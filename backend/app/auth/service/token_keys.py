@@ -0,0 +1,147 @@
+"""
+Chaves de assinatura dos access tokens.
+
+Por padrão os tokens continuam HS256 com SECRET_KEY. Com AUTH_TOKEN_ALGORITHM=ES256
+ou EdDSA os tokens são assinados com a chave privada de AUTH_SIGNING_KEY_FILE e
+levam o ``kid`` (AUTH_SIGNING_KEY_ID) no cabeçalho; qualquer nó que tenha só as
+chaves públicas (AUTH_VERIFICATION_KEYS="kid=arquivo.pem,...") consegue validá-los.
+Para rotacionar, publique a nova chave pública, troque a chave de assinatura e
+mantenha a anterior em AUTH_VERIFICATION_KEYS até os tokens antigos expirarem.
+
+As chaves são carregadas uma única vez por configuração (``get_token_key_ring``),
+então cada verificação usa objetos de chave já prontos, sem reler nem parsear PEM.
+"""
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+from auth.domain.auth_erros import InvalidToken
+
+HMAC_ALGORITHM = "HS256"
+ASYMMETRIC_ALGORITHMS = ("ES256", "EdDSA")
+
+
+def algorithm_for_key(key) -> str:
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if key.curve.name != "secp256r1":
+            raise ValueError(f"ES256 requires a P-256 key, got {key.curve.name}")
+        return "ES256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise ValueError(f"Unsupported token signing key type: {type(key).__name__}")
+
+
+class TokenKeyRing:
+    """
+    Uma chave de assinatura (opcional, nós só de verificação não têm) e as chaves
+    de verificação indexadas por ``kid``. Tokens HS256 não levam ``kid``.
+    """
+
+    def __init__(
+            self,
+            signing_key=None,
+            signing_algorithm: Optional[str] = None,
+            signing_kid: Optional[str] = None,
+            verification_keys: Optional[Dict[Optional[str], Tuple[object, str]]] = None
+    ):
+        self.signing_key = signing_key
+        self.signing_algorithm = signing_algorithm
+        self.signing_kid = signing_kid
+        self.verification_keys = dict(verification_keys or {})
+
+    @classmethod
+    def hmac(cls, secret_key: str) -> "TokenKeyRing":
+        return cls(secret_key, HMAC_ALGORITHM, None, {None: (secret_key, HMAC_ALGORITHM)})
+
+    def sign(self, payload: dict) -> str:
+        if self.signing_key is None:
+            raise RuntimeError("This node has no token signing key configured")
+        headers = {"kid": self.signing_kid} if self.signing_kid else None
+        return jwt.encode(payload, self.signing_key, algorithm=self.signing_algorithm, headers=headers)
+
+    def decode(self, token: str) -> dict:
+        """Raises jwt.InvalidTokenError (ou InvalidToken para ``kid`` desconhecido)."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid not in self.verification_keys:
+            raise InvalidToken()
+        key, algorithm = self.verification_keys[kid]
+        return jwt.decode(token, key, algorithms=[algorithm])
+
+    def jwks(self) -> dict:
+        """Chaves públicas no formato JWKS; chaves HMAC nunca são publicadas."""
+        keys = []
+        for kid, (key, algorithm) in self.verification_keys.items():
+            if algorithm == "ES256":
+                jwk = ECAlgorithm.to_jwk(key, as_dict=True)
+            elif algorithm == "EdDSA":
+                jwk = OKPAlgorithm.to_jwk(key, as_dict=True)
+            else:
+                continue
+            jwk.update({"kid": kid, "alg": algorithm, "use": "sig"})
+            keys.append(jwk)
+        return {"keys": keys}
+
+
+def _read_pem(path: str) -> bytes:
+    with open(path, "rb") as pem_file:
+        return pem_file.read()
+
+
+def parse_verification_keys(value: str) -> Tuple[Tuple[str, str], ...]:
+    """"kid1=/keys/a.pem,kid2=/keys/b.pem" -> (("kid1", "/keys/a.pem"), ("kid2", "/keys/b.pem"))"""
+    entries = []
+    for entry in filter(None, (item.strip() for item in value.split(","))):
+        kid, separator, path = entry.partition("=")
+        if not separator or not kid.strip() or not path.strip():
+            raise ValueError(f"Invalid AUTH_VERIFICATION_KEYS entry: {entry!r}")
+        entries.append((kid.strip(), path.strip()))
+    return tuple(entries)
+
+
+@lru_cache(maxsize=8)
+def load_token_key_ring(
+        algorithm: str,
+        secret_key: Optional[str],
+        signing_kid: Optional[str],
+        signing_key_file: Optional[str],
+        verification_key_files: Tuple[Tuple[str, str], ...] = ()
+) -> TokenKeyRing:
+    if algorithm == HMAC_ALGORITHM:
+        if secret_key is None:
+            raise ValueError("HS256 tokens require SECRET_KEY")
+        return TokenKeyRing.hmac(secret_key)
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise ValueError(f"Unsupported AUTH_TOKEN_ALGORITHM: {algorithm}")
+
+    verification_keys = {}
+    for kid, path in verification_key_files:
+        public_key = load_pem_public_key(_read_pem(path))
+        verification_keys[kid] = (public_key, algorithm_for_key(public_key))
+
+    signing_key = None
+    if signing_key_file:
+        if not signing_kid:
+            raise ValueError("AUTH_SIGNING_KEY_ID is required with AUTH_SIGNING_KEY_FILE")
+        signing_key = load_pem_private_key(_read_pem(signing_key_file), password=None)
+        if algorithm_for_key(signing_key) != algorithm:
+            raise ValueError(f"AUTH_SIGNING_KEY_FILE does not hold an {algorithm} key")
+        verification_keys[signing_kid] = (signing_key.public_key(), algorithm)
+
+    if not verification_keys:
+        raise ValueError(f"{algorithm} tokens require AUTH_SIGNING_KEY_FILE or AUTH_VERIFICATION_KEYS")
+    return TokenKeyRing(signing_key, algorithm if signing_key else None, signing_kid, verification_keys)
+
+
+def get_token_key_ring() -> TokenKeyRing:
+    return load_token_key_ring(
+        os.getenv("AUTH_TOKEN_ALGORITHM", HMAC_ALGORITHM),
+        os.getenv("SECRET_KEY"),
+        os.getenv("AUTH_SIGNING_KEY_ID"),
+        os.getenv("AUTH_SIGNING_KEY_FILE"),
+        parse_verification_keys(os.getenv("AUTH_VERIFICATION_KEYS", "")),
+    )
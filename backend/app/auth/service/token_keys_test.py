@@ -0,0 +1,96 @@
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from auth.domain.auth_erros import InvalidToken
+from auth.service.token_keys import TokenKeyRing, load_token_key_ring, parse_verification_keys, get_token_key_ring
+
+
+def write_keys(tmp_path, name, private_key):
+    private_file = tmp_path / f"{name}.pem"
+    public_file = tmp_path / f"{name}.pub.pem"
+    private_file.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    public_file.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ))
+    return str(private_file), str(public_file)
+
+
+@pytest.fixture(autouse=True)
+def clear_key_ring_cache():
+    load_token_key_ring.cache_clear()
+    yield
+    load_token_key_ring.cache_clear()
+
+
+@pytest.mark.parametrize("algorithm, private_key", [
+    ("ES256", ec.generate_private_key(ec.SECP256R1())),
+    ("EdDSA", ed25519.Ed25519PrivateKey.generate()),
+])
+def test_sign_with_kid_and_verify_with_public_key_only(tmp_path, algorithm, private_key):
+    private_file, public_file = write_keys(tmp_path, "current", private_key)
+    signer = load_token_key_ring(algorithm, None, "k1", private_file)
+    verifier = load_token_key_ring(algorithm, None, None, None, (("k1", public_file),))
+
+    token = signer.sign({"user_name": "test_login"})
+
+    assert jwt.get_unverified_header(token)["kid"] == "k1"
+    assert verifier.decode(token)["user_name"] == "test_login"
+    with pytest.raises(RuntimeError):
+        verifier.sign({"user_name": "test_login"})
+
+
+def test_rotation_keeps_previous_key_valid(tmp_path):
+    old_private, old_public = write_keys(tmp_path, "old", ec.generate_private_key(ec.SECP256R1()))
+    new_private, _ = write_keys(tmp_path, "new", ec.generate_private_key(ec.SECP256R1()))
+    old_token = load_token_key_ring("ES256", None, "old", old_private).sign({"user_name": "a"})
+
+    rotated = load_token_key_ring("ES256", None, "new", new_private, (("old", old_public),))
+
+    assert rotated.decode(old_token)["user_name"] == "a"
+    assert jwt.get_unverified_header(rotated.sign({"user_name": "a"}))["kid"] == "new"
+    assert {key["kid"] for key in rotated.jwks()["keys"]} == {"old", "new"}
+
+
+def test_unknown_kid_and_hmac_token_rejected(tmp_path):
+    private_file, _ = write_keys(tmp_path, "current", ec.generate_private_key(ec.SECP256R1()))
+    key_ring = load_token_key_ring("ES256", None, "k1", private_file)
+
+    with pytest.raises(InvalidToken):
+        key_ring.decode(jwt.encode({"user_name": "a"}, "secret", algorithm="HS256"))
+    with pytest.raises(InvalidToken):
+        key_ring.decode(jwt.encode({"user_name": "a"}, "secret", algorithm="HS256", headers={"kid": "other"}))
+
+
+def test_signing_key_must_match_algorithm(tmp_path):
+    private_file, _ = write_keys(tmp_path, "current", ed25519.Ed25519PrivateKey.generate())
+
+    with pytest.raises(ValueError):
+        load_token_key_ring("ES256", None, "k1", private_file)
+
+
+def test_hmac_key_ring_is_not_published():
+    key_ring = TokenKeyRing.hmac("secret_key")
+
+    assert key_ring.decode(key_ring.sign({"user_name": "a"}))["user_name"] == "a"
+    assert key_ring.jwks() == {"keys": []}
+
+
+def test_get_token_key_ring_is_cached(monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    monkeypatch.delenv("AUTH_TOKEN_ALGORITHM", raising=False)
+
+    assert get_token_key_ring() is get_token_key_ring()
+
+    monkeypatch.setenv("SECRET_KEY", "other_secret_key")
+    assert get_token_key_ring().decode(TokenKeyRing.hmac("other_secret_key").sign({"user_name": "a"}))
+
+
+def test_parse_verification_keys():
+    assert parse_verification_keys("a=/keys/a.pem, b=/keys/b.pem") == (("a", "/keys/a.pem"), ("b", "/keys/b.pem"))
+    assert parse_verification_keys("") == ()
+    with pytest.raises(ValueError):
+        parse_verification_keys("/keys/a.pem")
@@ -0,0 +1,43 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenVersionRegistry:
+    """In-memory view of the users whose tokens were revoked.
+
+    Only users with ``token_version > 0`` are kept, so the set stays small. It is
+    reloaded through ``loader`` at most once every ``refresh_interval`` seconds;
+    a token whose ``ver`` claim is lower than the user's current version is revoked.
+    """
+
+    def __init__(self, refresh_interval: float = 30.0, clock=time.monotonic):
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._versions: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refresh_if_stale(self, loader: Callable[[], Dict[str, int]]):
+        with self._lock:
+            now = self._clock()
+            if self._loaded_at is not None and now - self._loaded_at < self.refresh_interval:
+                return
+            self._versions = dict(loader())
+            self._loaded_at = now
+
+    def current_version(self, user_code: str, loader: Callable[[], Dict[str, int]]) -> int:
+        self._refresh_if_stale(loader)
+        return self._versions.get(user_code, 0)
+
+    def is_revoked(self, user_code: str, version: int, loader: Callable[[], Dict[str, int]]) -> bool:
+        return version < self.current_version(user_code, loader)
+
+    def record(self, user_code: str, version: int):
+        with self._lock:
+            self._versions[user_code] = version
+
+    def clear(self):
+        with self._lock:
+            self._versions = {}
+            self._loaded_at = None
@@ -0,0 +1,49 @@
+from auth.service.token_version_registry import TokenVersionRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_unknown_user_is_on_version_zero():
+    registry = TokenVersionRegistry()
+    assert registry.current_version("USER001", lambda: {}) == 0
+    assert registry.is_revoked("USER001", 0, lambda: {}) is False
+
+
+def test_older_token_version_is_revoked():
+    registry = TokenVersionRegistry()
+    loader = lambda: {"USER001": 2}
+
+    assert registry.is_revoked("USER001", 1, loader) is True
+    assert registry.is_revoked("USER001", 2, loader) is False
+
+
+def test_loader_is_called_once_per_refresh_interval():
+    clock = FakeClock()
+    registry = TokenVersionRegistry(refresh_interval=30, clock=clock)
+    calls = []
+
+    def loader():
+        calls.append(clock.now)
+        return {"USER001": len(calls)}
+
+    assert registry.current_version("USER001", loader) == 1
+    clock.now = 29
+    assert registry.current_version("USER001", loader) == 1
+    clock.now = 30
+    assert registry.current_version("USER001", loader) == 2
+    assert calls == [0, 30]
+
+
+def test_record_updates_version_without_reload():
+    registry = TokenVersionRegistry()
+    registry.current_version("USER001", lambda: {})
+
+    registry.record("USER001", 3)
+
+    assert registry.current_version("USER001", lambda: {}) == 3
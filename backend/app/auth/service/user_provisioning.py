@@ -0,0 +1,93 @@
+"""
+Cadastro em lote de usuários (onboarding de uma organização).
+
+O custo está no bcrypt, então os hashes são calculados em um pool de processos
+(um por núcleo por padrão) e os usuários são gravados com um INSERT de várias
+linhas por lote, em vez de uma requisição /users/signup por usuário.
+"""
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from auth.domain.models import UserModel
+from auth.repository.user_db_repository import UserRepository
+from auth.service.services import PasswordService
+
+
+class ProvisioningReport(BaseModel):
+    created: int = 0
+    skipped: List[str] = []
+    hashing_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def users_per_second(self) -> float:
+        return self.created / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def read_users_file(path: str) -> List[UserModel]:
+    """CSV com cabeçalho ``name,user_name,password``."""
+    with open(path, newline="", encoding="utf-8") as users_file:
+        return [
+            UserModel(code=None, created_at=None, name=row["name"], user_name=row["user_name"],
+                      password=row["password"])
+            for row in csv.DictReader(users_file)
+        ]
+
+
+def _init_worker(work_factor: Optional[int]):
+    # Processos novos não herdam a calibragem feita em runtime no processo pai.
+    PasswordService.work_factor = work_factor
+
+
+def hash_passwords(passwords: List[str], workers: int) -> List[str]:
+    if workers <= 0:
+        return [PasswordService.protect_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(PasswordService.work_factor,)) as executor:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(executor.map(PasswordService.protect_password, passwords, chunksize=chunksize))
+
+
+def provision_users(
+        user_repository: UserRepository,
+        users: List[UserModel],
+        workers: Optional[int] = None,
+        batch_size: int = 500
+) -> ProvisioningReport:
+    """
+    Creates the users that do not exist yet. User names repeated in the input or
+    already registered are skipped before hashing, so no bcrypt time is wasted on them.
+    """
+    start = time.perf_counter()
+    report = ProvisioningReport()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    existing = set()
+    for offset in range(0, len(users), batch_size):
+        batch_names = [user.user_name for user in users[offset:offset + batch_size]]
+        existing |= user_repository.find_existing_user_names(batch_names)
+    pending = []
+    for user in users:
+        if user.user_name in existing:
+            report.skipped.append(user.user_name)
+        else:
+            existing.add(user.user_name)
+            pending.append(user)
+
+    hashing_start = time.perf_counter()
+    protected_passwords = hash_passwords([user.password for user in pending], workers)
+    report.hashing_seconds = time.perf_counter() - hashing_start
+    for user, protected_password in zip(pending, protected_passwords):
+        user.password = protected_password
+
+    for offset in range(0, len(pending), batch_size):
+        report.created += len(user_repository.create_many(pending[offset:offset + batch_size]))
+
+    report.elapsed_seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from auth.domain.models import UserModel
+from auth.repository.user_db_repository import Base, UserRepository, User
+from auth.service import user_provisioning
+from auth.service.services import PasswordService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def fast_bcrypt(monkeypatch):
+    monkeypatch.setattr(PasswordService, "work_factor", 4)
+
+
+@pytest.fixture
+def users_file(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("name,user_name,password\n"
+                    "Ana,ana,senha1\n"
+                    "Bia,bia,senha2\n"
+                    "Ana de novo,ana,senha3\n"
+                    "Caio,caio,senha4\n", encoding="utf-8")
+    return str(path)
+
+
+def test_read_users_file(users_file):
+    users = user_provisioning.read_users_file(users_file)
+
+    assert [user.user_name for user in users] == ["ana", "bia", "ana", "caio"]
+    assert users[1].password == "senha2"
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_provision_users(db_session, users_file, workers):
+    repository = UserRepository(db_session)
+    repository.create(UserModel(code=None, name="Caio", user_name="caio", password="x", created_at=None))
+
+    report = user_provisioning.provision_users(
+        repository, user_provisioning.read_users_file(users_file), workers=workers, batch_size=1
+    )
+
+    assert report.created == 2
+    assert report.skipped == ["ana", "caio"]
+    assert report.users_per_second > 0
+    bia = repository.get_by_user_name("bia")
+    assert len(bia.code) == 26
+    assert PasswordService.get_work_factor(bia.password) == 4
+    assert PasswordService.verify_password("senha2", bia.password)
+    assert db_session.query(User).count() == 3
+
+
+def test_create_many_uses_one_insert(db_session, mocker):
+    repository = UserRepository(db_session)
+    execute = mocker.spy(db_session, "execute")
+    users = [UserModel(code=None, name=f"User {i}", user_name=f"user{i}", password="hash", created_at=None)
+             for i in range(5)]
+
+    created = repository.create_many(users)
+
+    assert execute.call_count == 1
+    assert len({user.code for user in created}) == 5
+    assert repository.find_existing_user_names(["user1", "user9"]) == {"user1"}
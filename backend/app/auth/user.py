@@ -1,32 +1,84 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
+from typing import List, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from pydantic import BaseModel
 
-from auth.domain.auth_erros import ExpiredToken
+from auth.domain.auth_erros import ExpiredToken, InvalidToken, InvalidApiKey
+from auth.principal_cache import principal_cache
 from auth.repository.db_connection import get_db_session
 from auth.service.services import UserServiceFactory
+from database import run_sync, sync_session
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
 
 
 class User(BaseModel):  # Modelo do usuário
     name: str
     user_name: str
     code: str
+    # None para sessões com senha; a lista de escopos quando autenticado por API key.
+    scopes: Optional[List[str]] = None
+
+
+def required_scope(method: str) -> str:
+    return "read" if method.upper() in READ_ONLY_METHODS else "write"
+
+
+def get_api_key_user(api_key: str, method: str, db_session) -> User:
+    try:
+        user, scopes = UserServiceFactory.create_api_key_service(db_session).authenticate(api_key)
+    except InvalidApiKey as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "ApiKey"},
+        )
+    if required_scope(method) not in scopes:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient API key scope")
+    return User(name=user.name, user_name=user.user_name, code=user.code, scopes=scopes)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db_session=Depends(get_db_session)) -> User:
+async def get_current_user(
+        request: Request,
+        token: Optional[str] = Depends(oauth2_scheme),
+        api_key: Optional[str] = Depends(api_key_scheme),
+        db_session=Depends(get_db_session)
+) -> User:
+    return await run_sync(db_session, authenticate_request, request.method, token, api_key, sync_session(db_session))
+
+
+def authenticate_request(method: str, token: Optional[str], api_key: Optional[str], db_session) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if token is None and api_key is not None:
+        return get_api_key_user(api_key, method, db_session)
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     try:
         authentication_service = UserServiceFactory.create_authentication_user_service(db_session)
-        user = authentication_service.get_user_from_token(token)
-        token_data = User(**user.model_dump())
-    except JWTError:
+        claims = authentication_service.decode_access_token(token)
+        stateless_user = authentication_service.get_principal_from_claims(claims)
+        if stateless_user is not None:
+            return User(**stateless_user.model_dump())
+
+        user_name = claims["user_name"]
+        token_data = principal_cache.get(user_name)
+        if token_data is None:
+            user = authentication_service.user_repository.get_by_user_name(user_name)
+            token_data = User(**user.model_dump())
+            principal_cache.set(user_name, token_data)
+    except InvalidToken:
         raise credentials_exception
     except ExpiredToken:
         raise HTTPException(
@@ -35,3 +87,11 @@ def get_current_user(token: str = Depends(oauth2_scheme), db_session=Depends(get
             headers={"WWW-Authenticate": "Bearer"},
         )
     return token_data
+
+
+def get_password_session_user(current_user: User = Depends(get_current_user)) -> User:
+    """Operações de gerenciamento de credenciais não podem ser feitas com uma API key."""
+    if current_user.scopes is not None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="This operation requires a password session")
+    return current_user
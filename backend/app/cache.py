@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    """Bounded, thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    A ``maxsize`` of zero (or less) disables the cache: ``set`` becomes a no-op and
+    every ``get`` is counted as a miss.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,78 @@
+from cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_and_set():
+    cache = LRUTTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("b", "default") == "default"
+
+
+def test_evicts_least_recently_used():
+    cache = LRUTTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUTTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_pop_and_clear():
+    cache = LRUTTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_zero_maxsize_disables_cache():
+    cache = LRUTTLCache(maxsize=0, ttl=10)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_stats():
+    cache = LRUTTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+    assert stats["hit_ratio"] == 2 / 3
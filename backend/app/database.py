@@ -0,0 +1,275 @@
+"""
+Conexão com o banco compartilhada por auth, finance e investment.
+
+Um único engine (e pool) por processo. ``get_db_session`` é a mesma função para
+os três módulos, então o FastAPI resolve a dependência uma vez por requisição:
+``get_current_user`` e o handler usam a mesma sessão e o mesmo checkout do pool.
+
+Importar este módulo não abre conexões nem executa DDL: o schema vem do alembic
+ou de ``create_schema`` (``python cmd_tools.py create-schema``, ou na subida do app
+com DB_CREATE_SCHEMA=true, o padrão quando ENV=development).
+
+O pool é configurável por variáveis de ambiente:
+DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE e DB_POOL_PRE_PING.
+
+Com DB_ASYNC=true a sessão da requisição é uma AsyncSession sobre um engine
+assíncrono (asyncpg no Postgres, aiosqlite no SQLite). Os repositórios e serviços
+continuam escritos com a API síncrona da Session; ``run_sync`` os executa via
+``AsyncSession.run_sync``, em que o I/O do driver assíncrono não bloqueia o event
+loop. Mas o resto desse código roda na thread do event loop (num greenlet): uma
+chamada bloqueante que não é do banco (HTTP externo, arquivo, CPU pesada) trava
+todas as requisições e precisa passar por ``run_blocking``. No modo síncrono o
+mesmo código roda no threadpool, fora do loop, e ``run_blocking`` só chama a função.
+
+Com DATABASE_REPLICA_URL as requisições GET/HEAD/OPTIONS usam uma
+``RoutingSession``: as leituras vão para a réplica e qualquer escrita (flush ou
+INSERT/UPDATE/DELETE), assim como as leituras seguintes da mesma sessão, vão para o
+primário. As demais requisições usam só o primário. Para ler o que acabou de
+escrever, as leituras da mesma credencial (Authorization/X-API-Key) nos
+DB_REPLICA_READ_AFTER_WRITE_SECONDS seguintes a uma escrita vão para o primário
+(controle local ao worker), e o cabeçalho ``X-Consistent-Read: true`` força o primário.
+"""
+import asyncio
+import functools
+import hashlib
+import os
+import time
+from typing import Optional
+
+from sqlalchemy import Delete, Insert, Update, create_engine, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.util import await_only
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+import profiler
+from cache import LRUTTLCache
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+db_url = os.getenv("DATABASE_URL")
+replica_url = os.getenv("DATABASE_REPLICA_URL")
+env = os.getenv("ENV", "development")
+
+
+def pool_settings() -> dict:
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "3600")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true"),
+    }
+
+
+def create_database_engine(url: str):
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite (testes, benchmarks) usa o pool padrão do dialeto.
+        return create_engine(url, connect_args={"check_same_thread": False})
+    return create_engine(url, **pool_settings())
+
+
+def to_async_url(url: str) -> str:
+    """postgresql://... -> postgresql+asyncpg://..., sqlite://... -> sqlite+aiosqlite://..."""
+    parsed_url = make_url(url)
+    backend_name = parsed_url.get_backend_name()
+    if backend_name not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend_name}")
+    return parsed_url.set(drivername=f"{backend_name}+{ASYNC_DRIVERS[backend_name]}") \
+        .render_as_string(hide_password=False)
+
+
+def create_async_database_engine(url: str):
+    async_url = to_async_url(url)
+    if make_url(async_url).get_backend_name() == "sqlite":
+        return create_async_engine(async_url)
+    return create_async_engine(async_url, **pool_settings())
+
+
+class RoutingSession(Session):
+    """Reads from ``replica_bind`` until the session writes; writes and later reads use the primary bind."""
+
+    def __init__(self, *args, replica_bind=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+        self.wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.wrote = True
+        if self.replica_bind is None or self.wrote:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        return self.replica_bind
+
+
+class SessionRouter:
+    def __init__(self, primary_factory, replica_factory=None, read_after_write_seconds: float = 5.0):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.recent_writers = LRUTTLCache(maxsize=10000, ttl=read_after_write_seconds)
+
+    @staticmethod
+    def credential_key(request: Request) -> Optional[str]:
+        credential = request.headers.get("authorization") or request.headers.get("x-api-key")
+        return hashlib.sha256(credential.encode()).hexdigest() if credential else None
+
+    def use_replica(self, request: Optional[Request]) -> bool:
+        if self.replica_factory is None or request is None or request.method not in SAFE_METHODS:
+            return False
+        if request.headers.get("x-consistent-read", "").lower() in ("1", "true"):
+            return False
+        credential_key = self.credential_key(request)
+        return credential_key is None or self.recent_writers.get(credential_key) is None
+
+    def factory_for(self, request: Optional[Request]):
+        return self.replica_factory if self.use_replica(request) else self.primary_factory
+
+    def record_write(self, request: Optional[Request]):
+        if request is None or request.method in SAFE_METHODS:
+            return
+        credential_key = self.credential_key(request)
+        if credential_key is not None:
+            self.recent_writers.set(credential_key, time.monotonic())
+
+
+def create_session_router(primary_engine, replica_engine=None, async_mode: bool = False) -> SessionRouter:
+    read_after_write_seconds = float(os.getenv("DB_REPLICA_READ_AFTER_WRITE_SECONDS", "5"))
+    if async_mode:
+        primary_factory = async_sessionmaker(primary_engine, autocommit=False, autoflush=False)
+        replica_factory = None if replica_engine is None else async_sessionmaker(
+            primary_engine, autocommit=False, autoflush=False,
+            sync_session_class=RoutingSession, replica_bind=replica_engine.sync_engine,
+        )
+    else:
+        primary_factory = sessionmaker(autocommit=False, autoflush=False, bind=primary_engine)
+        replica_factory = None if replica_engine is None else sessionmaker(
+            autocommit=False, autoflush=False, bind=primary_engine,
+            class_=RoutingSession, replica_bind=replica_engine,
+        )
+    return SessionRouter(primary_factory, replica_factory, read_after_write_seconds)
+
+
+engine = None
+session = None
+replica_engine = None
+session_router = None
+async_engine = None
+async_session = None
+async_replica_engine = None
+async_session_router = None
+if db_url:
+    # O engine síncrono só abre conexões quando usado (cmd_tools, create_schema, modo síncrono).
+    engine = create_database_engine(db_url)
+    if replica_url:
+        replica_engine = create_database_engine(replica_url)
+    session_router = create_session_router(engine, replica_engine)
+    session = session_router.primary_factory
+    if os.getenv("DB_ASYNC", "false").lower() in ("1", "true"):
+        async_engine = create_async_database_engine(db_url)
+        if replica_url:
+            async_replica_engine = create_async_database_engine(replica_url)
+        async_session_router = create_session_router(async_engine, async_replica_engine, async_mode=True)
+        async_session = async_session_router.primary_factory
+
+
+def create_schema_on_startup() -> bool:
+    default = "true" if env == "development" else "false"
+    return engine is not None and os.getenv("DB_CREATE_SCHEMA", default).lower() in ("1", "true")
+
+
+def create_schema(bind=None):
+    """Creates the missing tables of auth, finance and investment (no migrations; alembic owns those)."""
+    from auth.repository.api_key_db_repository import ApiKey  # noqa: F401
+    from auth.repository.refresh_token_db_repository import RefreshToken  # noqa: F401
+    from auth.repository.user_db_repository import Base as AuthBase
+    from finance.repository.db.db_entities import Base as FinanceBase
+    from investment.repository.db.db_entities import Base as InvestmentBase
+
+    for base in (AuthBase, FinanceBase, InvestmentBase):
+        base.metadata.create_all(bind=bind or engine)
+
+
+def get_sync_db_session(request: Request = None):
+    db = session_router.factory_for(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+        session_router.record_write(request)
+
+
+async def get_async_db_session(request: Request = None):
+    try:
+        async with async_session_router.factory_for(request)() as db:
+            yield db
+    finally:
+        async_session_router.record_write(request)
+
+
+get_db_session = get_async_db_session if async_session is not None else get_sync_db_session
+
+
+def sync_session(db_session) -> Session:
+    """The Session the sync repositories should use; inside ``run_sync`` it is backed by the async engine."""
+    return db_session.sync_session if isinstance(db_session, AsyncSession) else db_session
+
+
+def upsert(session: Session, entity, values: dict, key_columns, update_columns):
+    """
+    INSERT ... ON CONFLICT (key_columns) DO UPDATE in one statement, for rows with a
+    unique index: two requests writing the same key no longer race between the SELECT
+    and the INSERT. PostgreSQL and SQLite only.
+    """
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[
+        session.get_bind(clause=insert(entity)).dialect.name]
+    stmt = dialect_insert(entity).values(**values)
+    return session.execute(stmt.on_conflict_do_update(
+        index_elements=key_columns, set_={column: stmt.excluded[column] for column in update_columns}
+    ))
+
+
+async def run_sync(db_session, fn, /, *args, **kwargs):
+    """
+    Runs sync repository/service code. In sync mode it goes to the threadpool; in
+    async mode it runs on the event loop thread and only the DB I/O yields, so any
+    other blocking call inside ``fn`` must go through ``run_blocking``.
+    """
+    fn = profiler.track(fn)
+    if isinstance(db_session, AsyncSession):
+        return await db_session.run_sync(lambda _: fn(*args, **kwargs))
+    return await run_in_threadpool(fn, *args, **kwargs)
+
+
+def run_blocking(fn, /, *args, **kwargs):
+    """
+    For blocking calls that are not DB access (external HTTP, files) in code run by
+    ``run_sync``. On the event loop thread (async mode) the call goes to the threadpool
+    and the greenlet waits for it while the loop keeps serving other requests; in a
+    worker thread (sync mode, scripts) it is just called.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return fn(*args, **kwargs)
+    return await_only(run_in_threadpool(fn, *args, **kwargs))
+
+
+def run_in_session(handler):
+    """
+    Turns a plain ``def`` handler that receives ``db_session`` into an async endpoint
+    whose body runs through ``run_sync``. The handler always sees a sync Session; in
+    async mode its non-DB blocking calls must use ``run_blocking``.
+    """
+
+    @functools.wraps(handler)
+    async def endpoint(*args, **kwargs):
+        db_session = kwargs["db_session"]
+        kwargs["db_session"] = sync_session(db_session)
+        return await run_sync(db_session, handler, *args, **kwargs)
+
+    return endpoint
@@ -0,0 +1,236 @@
+import asyncio
+import uuid
+
+from sqlalchemy.pool import QueuePool
+
+import database
+from auth.repository.db_connection import get_db_session as auth_get_db_session
+from finance.repository.db.db_connection import get_db_session as finance_get_db_session
+from investment.repository.db.db_connection import get_db_session as investment_get_db_session
+
+
+def test_modules_share_the_same_session_dependency():
+    assert auth_get_db_session is database.get_db_session
+    assert finance_get_db_session is database.get_db_session
+    assert investment_get_db_session is database.get_db_session
+
+
+def test_pool_settings_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "5")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "true")
+
+    settings = database.pool_settings()
+
+    assert settings["pool_size"] == 5
+    assert settings["max_overflow"] == 2
+    assert settings["pool_pre_ping"] is True
+    assert settings["pool_recycle"] == 3600
+
+
+def test_create_database_engine_sqlite(tmp_path):
+    engine = database.create_database_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+
+    assert isinstance(engine.pool, QueuePool)
+    engine.dispose()
+
+
+def test_create_schema(tmp_path):
+    from sqlalchemy import inspect
+
+    engine = database.create_database_engine(f"sqlite:///{tmp_path / 'schema.sqlite'}")
+
+    database.create_schema(bind=engine)
+
+    tables = set(inspect(engine).get_table_names())
+    assert {"auth_users", "auth_api_keys", "finances_transactions", "investments_portfolios"} <= tables
+    engine.dispose()
+
+
+def test_create_schema_on_startup(monkeypatch):
+    monkeypatch.setattr(database, "engine", object())
+    monkeypatch.setattr(database, "env", "development")
+    assert database.create_schema_on_startup() is True
+
+    monkeypatch.setenv("DB_CREATE_SCHEMA", "false")
+    assert database.create_schema_on_startup() is False
+
+    monkeypatch.delenv("DB_CREATE_SCHEMA")
+    monkeypatch.setattr(database, "env", "production")
+    assert database.create_schema_on_startup() is False
+
+
+def create_replicated_app(tmp_path, monkeypatch, async_mode=False):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import select
+
+    from auth.repository.user_db_repository import User
+
+    primary_url = f"sqlite:///{tmp_path / 'primary.sqlite'}"
+    replica_url = f"sqlite:///{tmp_path / 'replica.sqlite'}"
+    for url, name in ((primary_url, "primary"), (replica_url, "replica")):
+        sync_engine = database.create_database_engine(url)
+        database.create_schema(bind=sync_engine)
+        with sync_engine.begin() as conn:
+            conn.execute(User.__table__.insert().values(code=name, name=name, user_name="source", password=""))
+        sync_engine.dispose()
+
+    if async_mode:
+        router = database.create_session_router(database.create_async_database_engine(primary_url),
+                                                database.create_async_database_engine(replica_url), async_mode=True)
+        monkeypatch.setattr(database, "async_session_router", router)
+        get_db_session = database.get_async_db_session
+    else:
+        router = database.create_session_router(database.create_database_engine(primary_url),
+                                                database.create_database_engine(replica_url))
+        monkeypatch.setattr(database, "session_router", router)
+        get_db_session = database.get_sync_db_session
+
+    app = FastAPI()
+
+    def read_source(db_session):
+        return db_session.scalar(select(User.code).where(User.user_name == "source"))
+
+    def write_and_read(db_session):
+        code = uuid.uuid4().hex
+        db_session.add(User(code=code, name=code, user_name=code, password=""))
+        db_session.flush()
+        source = read_source(db_session)
+        db_session.commit()
+        return source
+
+    @app.get("/source")
+    @database.run_in_session
+    def get_source(db_session=Depends(get_db_session)):
+        return {"source": read_source(db_session)}
+
+    @app.get("/write-on-read")
+    @database.run_in_session
+    def get_write_on_read(db_session=Depends(get_db_session)):
+        return {"source": write_and_read(db_session)}
+
+    @app.post("/write")
+    @database.run_in_session
+    def post_write(db_session=Depends(get_db_session)):
+        return {"source": write_and_read(db_session)}
+
+    return app
+
+
+def assert_replica_routing(client):
+    assert client.get("/source").json() == {"source": "replica"}
+    assert client.get("/source", headers={"X-Consistent-Read": "true"}).json() == {"source": "primary"}
+    # Escrita em GET vai para o primário, e a sessão passa a ler dele.
+    assert client.get("/write-on-read").json() == {"source": "primary"}
+
+    auth_headers = {"Authorization": "Bearer writer"}
+    assert client.post("/write", headers=auth_headers).json() == {"source": "primary"}
+    assert client.get("/source", headers=auth_headers).json() == {"source": "primary"}
+    assert client.get("/source", headers={"Authorization": "Bearer other"}).json() == {"source": "replica"}
+
+
+def test_reads_go_to_replica_and_writes_to_primary(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    assert_replica_routing(TestClient(create_replicated_app(tmp_path, monkeypatch)))
+
+
+def test_replica_routing_with_async_sessions(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    assert_replica_routing(TestClient(create_replicated_app(tmp_path, monkeypatch, async_mode=True)))
+
+
+def test_without_replica_everything_uses_primary(tmp_path):
+    from starlette.requests import Request
+
+    router = database.create_session_router(database.create_database_engine(f"sqlite:///{tmp_path / 'db.sqlite'}"))
+    request = Request({"type": "http", "method": "GET", "headers": []})
+
+    assert router.factory_for(request) is router.primary_factory
+
+
+def test_to_async_url():
+    assert database.to_async_url("postgresql://user:pw@db:5432/app") == "postgresql+asyncpg://user:pw@db:5432/app"
+    assert database.to_async_url("sqlite:////tmp/app.sqlite") == "sqlite+aiosqlite:////tmp/app.sqlite"
+
+
+def test_requests_with_async_session(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from auth.repository.user_db_repository import Base as AuthBase
+    from auth.principal_cache import principal_cache
+    from auth.service.login_throttle import login_throttle
+    from finance.repository.db.db_entities import Base as FinanceBase
+    from main_test import app
+
+    db_url = f"sqlite:///{tmp_path / 'async.sqlite'}"
+    sync_engine = database.create_database_engine(db_url)
+    AuthBase.metadata.create_all(bind=sync_engine)
+    FinanceBase.metadata.create_all(bind=sync_engine)
+    async_engine = database.create_async_database_engine(db_url)
+    session_factory = async_sessionmaker(async_engine, autocommit=False, autoflush=False)
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    principal_cache.clear()
+    login_throttle.reset()
+    app.dependency_overrides.clear()
+    app.dependency_overrides[database.get_db_session] = override_get_db
+    try:
+        client = TestClient(app)
+        user_data = {"name": "Async", "user_name": "async", "password": "password"}
+        assert client.post("/users/signup", json=user_data).status_code == 200
+        token = client.post("/users/signin", json={"user_name": "async", "password": "password"}).json()[
+            "access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        account = client.post("/finances/accounts", json={"name": "Conta", "description": "Conta"}, headers=headers)
+        assert account.status_code == 200
+        accounts = client.get("/finances/accounts", headers=headers)
+        assert [item["code"] for item in accounts.json()] == [account.json()["code"]]
+    finally:
+        app.dependency_overrides.clear()
+        sync_engine.dispose()
+        asyncio.run(async_engine.dispose())
+
+
+def test_run_blocking_leaves_the_event_loop_free_in_async_mode():
+    import threading
+    import time
+
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    def handler(_):
+        # Em modo assíncrono o handler roda na thread do loop; a chamada bloqueante não.
+        return threading.get_ident(), database.run_blocking(lambda: (time.sleep(0.2), threading.get_ident())[1])
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        async with AsyncSession(engine) as session:
+            handler_thread, blocking_thread = await database.run_sync(session, handler, None)
+        ticker_task.cancel()
+        await engine.dispose()
+        return handler_thread, blocking_thread, ticks
+
+    handler_thread, blocking_thread, ticks = asyncio.run(main())
+
+    assert handler_thread == threading.get_ident()
+    assert blocking_thread != handler_thread
+    assert len(ticks) > 5
+
+
+def test_run_blocking_calls_directly_outside_the_event_loop():
+    assert database.run_blocking(lambda value: value * 2, 21) == 42
@@ -7,6 +7,7 @@ from fastapi.params import Query
 from pydantic import BaseModel
 
 from auth.user import User, get_current_user
+from database import run_in_session
 from finance.domain.models import AccountConsolidationModel
 from finance.repository.db.db_connection import get_db_session
 from finance.services.factory import ServiceFactory
@@ -21,7 +22,8 @@ class CategoryValueResponse(BaseModel):
 
 
 @account_consolidation_router.get("/consolidations", response_model=List[AccountConsolidationModel])
-async def get_all_consolidations(
+@run_in_session
+def get_all_consolidations(
         db_session=Depends(get_db_session),
         account_codes: Annotated[Optional[list[str]], Query()] = None,
         month: Optional[str] = Query(
@@ -52,7 +54,8 @@ async def get_all_consolidations(
 
 
 @account_consolidation_router.get("/consolidations/last-month", response_model=List[AccountConsolidationModel])
-async def get_last_month_consolidations(
+@run_in_session
+def get_last_month_consolidations(
         db_session=Depends(get_db_session),
         account_codes: Annotated[Optional[list[str]], Query()] = None,
         current_user: User = Depends(get_current_user)
@@ -64,7 +67,8 @@ async def get_last_month_consolidations(
 
 
 @account_consolidation_router.get("/consolidations/current-month", response_model=List[AccountConsolidationModel])
-async def get_current_month_consolidations(
+@run_in_session
+def get_current_month_consolidations(
         db_session=Depends(get_db_session),
         account_codes: Annotated[Optional[list[str]], Query()] = None,
         current_user: User = Depends(get_current_user)
@@ -76,7 +80,8 @@ async def get_current_month_consolidations(
 
 
 @account_consolidation_router.get("/consolidations/grouped-by-category")
-async def get_sum_consolidations_grouped_by_category(
+@run_in_session
+def get_sum_consolidations_grouped_by_category(
         db_session=Depends(get_db_session),
         account_codes: Annotated[Optional[list[str]], Query()] = None,
         month: Optional[str] = Query(
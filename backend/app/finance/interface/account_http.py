@@ -6,6 +6,7 @@ from fastapi import HTTPException, status, APIRouter
 from pydantic import BaseModel
 
 from auth.user import User, get_current_user
+from database import run_in_session
 from finance.domain.account_erros import AccountConsolidationNotFound
 from finance.domain.models import AccountModel
 from finance.repository.db.db_connection import get_db_session
@@ -35,7 +36,8 @@ class AccountResponse(BaseModel):
 
 
 @account_router.get("/accounts", response_model=List[AccountResponse])
-async def get_all_accounts(
+@run_in_session
+def get_all_accounts(
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
 ):
@@ -44,7 +46,8 @@ async def get_all_accounts(
 
 
 @account_router.get("/accounts/{account_code}", response_model=AccountModel)
-async def get_account(
+@run_in_session
+def get_account(
         account_code: str,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
@@ -58,7 +61,8 @@ async def get_account(
 
 
 @account_router.post("/accounts", response_model=AccountModel)
-async def create_account(
+@run_in_session
+def create_account(
         input: NewAccountInput,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
@@ -72,7 +76,8 @@ async def create_account(
 
 
 @account_router.put("/accounts/{account_code}", response_model=AccountModel)
-async def update_account(
+@run_in_session
+def update_account(
         account_code: str,
         account_input: AccountModel,
         db_session=Depends(get_db_session),
@@ -86,7 +91,8 @@ async def update_account(
 
 
 @account_router.delete("/accounts/{account_code}")
-async def delete_account(
+@run_in_session
+def delete_account(
         account_code: str,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
@@ -41,7 +41,7 @@ def test_post_account(client, db_session):
     json_result = response.json()
 
     assert response.status_code == 200
-    assert len(json_result["code"]) == 10
+    assert len(json_result["code"]) == 26
     assert json_result["name"] == "Existing Account"
     assert json_result["user_code"] == "USER001"
 
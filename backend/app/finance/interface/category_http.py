@@ -6,6 +6,7 @@ from fastapi import HTTPException, status, APIRouter
 from pydantic import BaseModel
 
 from auth.user import User, get_current_user
+from database import run_in_session
 from finance.domain.category_erros import CategoryNotFound
 from finance.domain.models import CategoryModel
 from finance.repository.db.db_connection import get_db_session
@@ -55,7 +56,8 @@ CategoryTree.model_rebuild()
 
 
 @category_router.get("/categories", response_model=List[CategoryTree])
-async def get_all_categories(
+@run_in_session
+def get_all_categories(
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
 ):
@@ -66,7 +68,8 @@ async def get_all_categories(
 
 
 @category_router.get("/categories/list", response_model=List[CategoryTree])
-async def get_all_categories_list(
+@run_in_session
+def get_all_categories_list(
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
 ):
@@ -77,7 +80,8 @@ async def get_all_categories_list(
 
 
 @category_router.get("/categories/{category_code}", response_model=CategoryResponse)
-async def get_category(
+@run_in_session
+def get_category(
         category_code: str,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
@@ -94,7 +98,8 @@ async def get_category(
 
 
 @category_router.post("/categories", response_model=CategoryResponse)
-async def create_category(
+@run_in_session
+def create_category(
         input: CategoryInput,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
@@ -108,7 +113,8 @@ async def create_category(
 
 
 @category_router.put("/categories/{category_code}", response_model=CategoryResponse)
-async def update_category(
+@run_in_session
+def update_category(
         category_code: str,
         category_input: CategoryInput,
         db_session=Depends(get_db_session),
@@ -132,7 +138,8 @@ async def update_category(
 
 #
 @category_router.delete("/categories/{category_code}")
-async def delete_category(
+@run_in_session
+def delete_category(
         category_code: str,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
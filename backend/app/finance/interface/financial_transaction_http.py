@@ -6,20 +6,23 @@ from datetime import date, datetime
 from tempfile import NamedTemporaryFile
 from typing import List, Optional, Annotated
 
-from fastapi import APIRouter, Query, HTTPException, status, UploadFile
+from fastapi import APIRouter, Query, HTTPException, Response, status, UploadFile
 from fastapi import Depends
 from fastapi.params import File
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from auth.user import User, get_current_user
+from database import run_blocking, run_in_session
 from finance.domain.account_erros import AccountConsolidationNotFound
 from finance.domain.category_erros import CategoryNotFound
 from finance.domain.financial_transaction_erros import FinancialTransactionNotFound
 from finance.domain.models import TransactionType, FinancialTransactionModel
+from finance.interface.dependencies import get_ownership
 from finance.repository.db.db_connection import get_db_session
 from finance.services.factory import ServiceFactory
 from finance.services.financial_transaction_service import FinancialTransactionService
 from helpers import get_last_day_of_the_month
+from ownership import OwnershipContext
 
 finance_transaction_router = APIRouter()
 router = finance_transaction_router
@@ -48,8 +51,14 @@ class TransactionResponse(BaseModel):
     value: float
 
 
+# A listagem devolve o JSON pronto: os modelos vêm do repositório sem validação
+# (to_model) e o FastAPI não revalida um Response contra o response_model.
+transactions_json = TypeAdapter(List[FinancialTransactionModel])
+
+
 @router.get("/transactions", response_model=List[TransactionResponse])
-async def get_all_transactions(
+@run_in_session
+def get_all_transactions(
         account_codes: Annotated[Optional[list[str]], Query()] = None,
         category_codes: Annotated[Optional[list[str]], Query()] = None,
         month: Optional[str] = Query(
@@ -62,28 +71,21 @@ async def get_all_transactions(
             None, description="End date in YYYY-MM-DD format"
         ),
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        transaction_serv = ServiceFactory.create_financial_transaction_service(db_session)
-        account_serv = ServiceFactory.create_account_service(db_session)
-        category_service = ServiceFactory.create_category_service(db_session)
+        transaction_serv = ServiceFactory.create_financial_transaction_service(db_session, ownership)
 
         if not account_codes:
-            account_codes = [account_code.code for account_code in account_serv.get_all_by_user_code(current_user.code)]
+            account_codes = list(ownership.account_codes)
 
-        # TODO Move to Service
         # Validates whether categories belongs to the logged-in user
         category_codes_filter = []
         if category_codes:
             for category_code in category_codes:
-                category = category_service.get_by_code(category_code)
-                if category.user_code != current_user.code:
-                    raise CategoryNotFound()
-                else:
-                    children = category_service.list_all_children(category.code, category.user_code)
-                    category_codes_filter.append(category.code)
-                    category_codes_filter.extend([cat.code for cat in children])
+                category_codes_filter.append(category_code)
+                category_codes_filter.extend(ownership.category_descendants(category_code))
 
         if month:
             month_date = datetime.strptime(month, "%Y-%m").date()
@@ -97,7 +99,7 @@ async def get_all_transactions(
             start_date,
             end_date
         )
-        return transactions
+        return Response(transactions_json.dump_json(transactions), media_type="application/json")
     except AccountConsolidationNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except CategoryNotFound as e:
@@ -107,18 +109,18 @@ async def get_all_transactions(
 
 
 @router.get("/transactions/{transaction_code}", response_model=TransactionResponse)
-async def get_transaction(
+@run_in_session
+def get_transaction(
         transaction_code: str,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
         transaction_serv = ServiceFactory.create_financial_transaction_service(db_session)
-        account_serv = ServiceFactory.create_account_service(db_session)
         transaction = transaction_serv.get_by_code(transaction_code)
 
         # Validates whether transaction belongs to the logged-in user
-        account_serv.get_by_code(current_user.code, transaction.account_code)
+        ownership.check_account(transaction.account_code)
         return transaction
     except FinancialTransactionNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -127,21 +129,22 @@ async def get_transaction(
 
 
 @router.post("/transactions", response_model=TransactionResponse)
-async def create_transaction(
+@run_in_session
+def create_transaction(
         new_transaction_data: TransactionInput,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        transaction_serv = ServiceFactory.create_financial_transaction_service(db_session)
+        # Validates whether transaction belongs to the logged-in user
+        ownership.check_account(new_transaction_data.account_code)
+
+        transaction_serv = ServiceFactory.create_financial_transaction_service(db_session, ownership)
         new_transaction = transaction_serv.create(
             current_user.code,
             FinancialTransactionModel(**new_transaction_data.model_dump())
         )
-        account_serv = ServiceFactory.create_account_service(db_session)
-
-        # Validates whether transaction belongs to the logged-in user
-        account_serv.get_by_code(current_user.code, new_transaction.account_code)
         return new_transaction
     except FinancialTransactionNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -152,19 +155,21 @@ async def create_transaction(
 
 
 @router.put("/transactions/{transaction_code}", response_model=TransactionResponse)
-async def update_transaction(
+@run_in_session
+def update_transaction(
         transaction_code: str,
         new_transaction_data: TransactionInput,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        transaction_serv = ServiceFactory.create_financial_transaction_service(db_session)
+        transaction_serv = ServiceFactory.create_financial_transaction_service(db_session, ownership)
 
         # Validates whether transaction belongs to the logged-in user
         db_transaction = transaction_serv.get_by_code(transaction_code)
-        account_serv = ServiceFactory.create_account_service(db_session)
-        account_serv.get_by_code(current_user.code, db_transaction.account_code)
+        ownership.check_account(db_transaction.account_code)
+        ownership.check_account(new_transaction_data.account_code)
 
         updated_transaction = transaction_serv.update(
             current_user.code,
@@ -178,18 +183,19 @@ async def update_transaction(
 
 
 @router.delete("/transactions/{transaction_code}")
-async def update_transaction(
+@run_in_session
+def update_transaction(
         transaction_code: str,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        transaction_serv = ServiceFactory.create_financial_transaction_service(db_session)
+        transaction_serv = ServiceFactory.create_financial_transaction_service(db_session, ownership)
         transaction = transaction_serv.get_by_code(transaction_code)
 
         # Validates whether transaction belongs to the logged-in user
-        account_serv = ServiceFactory.create_account_service(db_session)
-        account_serv.get_by_code(current_user.code, transaction.account_code)
+        ownership.check_account(transaction.account_code)
 
         transaction_serv.delete(current_user.code, transaction_code)
         return {"message": "Transaction deleted successfully"}
@@ -202,17 +208,24 @@ async def update_transaction(
 class UploadFileSchema(BaseModel):
     file: str  # Conteúdo do arquivo em base64
     filename: str
+
+
+def decode_upload(file: str) -> str:
+    return base64.b64decode(file.split(",")[1]).decode('utf-8')
+
+
 @router.post("/transactions/upload")
-async def upload_transactions_file(
+@run_in_session
+def upload_transactions_file(
         account_code: str,
         upload_schema: UploadFileSchema,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
 ):
-    file_content = base64.b64decode(upload_schema.file.split(",")[1])
+    # Decodificar um arquivo grande é CPU pura: no modo assíncrono sairia da thread do event loop.
+    file_content_str = run_blocking(decode_upload, upload_schema.file)
 
-    line_count = file_content.decode('utf-8').count('\n') + 1
-    file_content_str = file_content.decode('utf-8')
+    line_count = file_content_str.count('\n') + 1
     print(f"O arquivo tem {line_count} linhas.")
 
     # Verifica se o serviço pode processar o arquivo
@@ -137,7 +137,7 @@ def test_create_transaction(client, db_session):
     json_result = response.json()
 
     assert response.status_code == 200
-    assert len(json_result["code"]) == 10
+    assert len(json_result["code"]) == 26
     assert json_result["account_code"] == "ACC123"
     assert json_result["category_code"] == "CAT001"
 
@@ -172,6 +172,7 @@ def test_create_transaction_other_user(client, db_session):
     response = client.post("/finances/transactions", json=new_transaction)
 
     assert response.status_code == 403
+    assert db_session.query(FinancialTransaction).filter(FinancialTransaction.account_code == "ACC124").count() == 0
 
 
 def test_update_transaction(client, db_session):
@@ -1,10 +1,12 @@
 from datetime import date
 from typing import List
 
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.exc import NoResultFound
 
 from finance.domain.account_erros import AccountConsolidationNotFound, AccountConsolidationAlreadyExists
 from finance.domain.models import AccountConsolidationModel
+from database import upsert
 from finance.repository.db.db_entities import AccountConsolidation
 from helpers import get_last_day_of_the_month
 
@@ -32,15 +34,27 @@ class AccountConsolidationRepo:
         except NoResultFound:
             raise AccountConsolidationAlreadyExists()
         except Exception as e:
+            # Sem o rollback a sessão fica inutilizável pelo resto da requisição.
+            session.rollback()
             raise AccountConsolidationAlreadyExists()
 
+    def upsert(self, consolidation: AccountConsolidationModel) -> AccountConsolidationModel:
+        """Creates the (account_code, month) consolidation or overwrites its balance."""
+        upsert(self.session, AccountConsolidation, consolidation.model_dump(),
+               key_columns=["account_code", "month"], update_columns=["balance"])
+        self.session.commit()
+        return consolidation
+
     def find_by_account_month(self, account_codes: List[str], month: date):
         session = self.session
         try:
-            consolidations = session.query(AccountConsolidation).filter(
-                AccountConsolidation.account_code.in_(account_codes),
-                AccountConsolidation.month == date(month.year, month.month, 1)
-            ).all()
+            first_day = date(month.year, month.month, 1)
+            consolidations = session.execute(lambda_stmt(
+                lambda: select(AccountConsolidation).where(
+                    AccountConsolidation.account_code.in_(account_codes),
+                    AccountConsolidation.month == first_day
+                )
+            )).scalars().all()
             return [to_model(consolidation) for consolidation in consolidations]
         except NoResultFound:
             raise AccountConsolidationNotFound()
@@ -50,14 +64,17 @@ class AccountConsolidationRepo:
         if account_codes is None:
             account_codes = []
 
-        query = session.query(AccountConsolidation).filter(
+        stmt = lambda_stmt(lambda: select(AccountConsolidation).where(
             AccountConsolidation.account_code.in_(account_codes)
-        )
+        ))
+        # Valores calculados fora das lambdas: o corpo delas só roda na primeira vez.
         if start_month:
-            query = query.filter(AccountConsolidation.month >= date(start_month.year, start_month.month, 1))
+            first_day = date(start_month.year, start_month.month, 1)
+            stmt += lambda s: s.where(AccountConsolidation.month >= first_day)
         if end_month:
-            query = query.filter(AccountConsolidation.month <= get_last_day_of_the_month(end_month))
-        consolidations = query.all()
+            last_day = get_last_day_of_the_month(end_month)
+            stmt += lambda s: s.where(AccountConsolidation.month <= last_day)
+        consolidations = session.execute(stmt).scalars().all()
         if consolidations is None:
             consolidations = []
         return [to_model(consolidation) for consolidation in consolidations]
@@ -68,10 +85,13 @@ class AccountConsolidationRepo:
     ):
         session = self.session
         try:
-            account = session.query(AccountConsolidation).filter(
-                AccountConsolidation.account_code == updated_consolidation_data.account_code,
-                AccountConsolidation.month == updated_consolidation_data.month
-            ).one()
+            account_code, month = updated_consolidation_data.account_code, updated_consolidation_data.month
+            account = session.execute(lambda_stmt(
+                lambda: select(AccountConsolidation).where(
+                    AccountConsolidation.account_code == account_code,
+                    AccountConsolidation.month == month
+                )
+            )).scalar_one()
             account.balance = updated_consolidation_data.balance
             session.commit()
             session.refresh(account)
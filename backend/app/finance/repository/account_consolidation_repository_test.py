@@ -35,6 +35,26 @@ def test_create_exists_consolidation(memory_db_session):
         consolidation_repo.create(new_consolidated_data)
 
 
+
+def test_create_same_key_twice_keeps_session_usable(memory_db_session):
+    consolidation_repo = AccountConsolidationRepo(memory_db_session)
+    new_consolidated_data = AccountConsolidationModel(account_code="ACC001", month=date(2023, 12, 1), balance=150)
+    consolidation_repo.create(new_consolidated_data)
+
+    with pytest.raises(AccountConsolidationAlreadyExists):
+        consolidation_repo.create(new_consolidated_data)
+
+    assert len(consolidation_repo.find_by_account_month(["ACC001"], date(2023, 12, 1))) == 1
+
+
+def test_upsert_same_key_twice(memory_db_session):
+    consolidation_repo = AccountConsolidationRepo(memory_db_session)
+    consolidation_repo.upsert(AccountConsolidationModel(account_code="ACC001", month=date(2023, 12, 1), balance=150))
+    consolidation_repo.upsert(AccountConsolidationModel(account_code="ACC001", month=date(2023, 12, 1), balance=999))
+
+    consolidations = consolidation_repo.find_by_account_month(["ACC001"], date(2023, 12, 1))
+    assert [consolidation.balance for consolidation in consolidations] == [999]
+
 def test_update(memory_db_session):
     consolidation_repo = AccountConsolidationRepo(memory_db_session)
     new_consolidated_data = AccountConsolidationModel(
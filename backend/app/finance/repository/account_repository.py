@@ -1,12 +1,13 @@
 from datetime import date
 
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.exc import NoResultFound
 
 from finance.domain.account_erros import AccountConsolidationNotFound, AccountUnexpectedConsolidationError
 from finance.domain.models import AccountModel
 from finance.repository.db.db_entities import Account, FinancialTransaction
 from helpers import generate_code
+from repository_cache import cached_by_user, repository_cache
 
 
 def to_database(account_model: AccountModel) -> Account:
@@ -17,6 +18,10 @@ def to_model(account: Account) -> AccountModel:
     return AccountModel(**account.to_dict())
 
 
+def select_by_code(user_code: str, account_code: str):
+    return lambda_stmt(lambda: select(Account).where(Account.code == account_code, Account.user_code == user_code))
+
+
 class AccountRepo:
     def __init__(self, session):
         self.session = session
@@ -30,6 +35,7 @@ class AccountRepo:
             new_account.created_at = date.today()
             session.add(new_account)
             session.commit()
+            repository_cache.bump(new_account.user_code)
             session.refresh(new_account)
             return to_model(new_account)
         except Exception as e:
@@ -38,25 +44,34 @@ class AccountRepo:
             else:
                 raise AccountUnexpectedConsolidationError()
 
+    @cached_by_user("accounts:find_by_code")
     def find_by_code(self, user_code: str, account_code: str):
         session = self.session
         try:
-            account = session.query(Account).filter(
-                Account.code == account_code,
-                Account.user_code == user_code
-            ).one()
+            account = session.execute(select_by_code(user_code, account_code)).scalar_one()
             return to_model(account)
         except NoResultFound:
             raise AccountConsolidationNotFound()
         except Exception as w:
             raise AccountUnexpectedConsolidationError()
 
+    @cached_by_user("accounts:find_codes_by_user")
+    def find_codes_by_user(self, user_code: str) -> set:
+        try:
+            rows = self.session.execute(lambda_stmt(
+                lambda: select(Account.code).where(Account.user_code == user_code)
+            )).all()
+            return {code for code, in rows}
+        except Exception:
+            raise AccountUnexpectedConsolidationError()
+
+    @cached_by_user("accounts:find_all")
     def find_all(self, user_code: str):
         session = self.session
         try:
-            accounts = session.query(Account).filter(
-                Account.user_code == user_code
-            ).all()
+            accounts = session.execute(lambda_stmt(
+                lambda: select(Account).where(Account.user_code == user_code)
+            )).scalars().all()
             return [to_model(account) for account in accounts]
         except Exception as e:
             raise AccountUnexpectedConsolidationError()
@@ -64,12 +79,10 @@ class AccountRepo:
     def delete(self, user_code: str, account_code: str):
         session = self.session
         try:
-            account = session.query(Account).filter(
-                Account.user_code == user_code,
-                Account.code == account_code
-            ).one()
+            account = session.execute(select_by_code(user_code, account_code)).scalar_one()
             session.delete(account)
             session.commit()
+            repository_cache.bump(user_code)
             return True
         except NoResultFound:
             raise AccountConsolidationNotFound()
@@ -84,13 +97,11 @@ class AccountRepo:
     ):
         session = self.session
         try:
-            account = session.query(Account).filter(
-                Account.user_code == user_code,
-                Account.code == account_code
-            ).one()
+            account = session.execute(select_by_code(user_code, account_code)).scalar_one()
             for key, value in updated_account_data.model_dump().items():
                 setattr(account, key, value)
             session.commit()
+            repository_cache.bump(user_code)
             session.refresh(account)
             return to_model(account)
         except NoResultFound:
@@ -100,8 +111,7 @@ class AccountRepo:
 
     def calculate_balance(self, account_code):
         session = self.session
-        query = session.query(
-            func.sum(FinancialTransaction.value).label('total_value')
-        ).filter(FinancialTransaction.account_code == account_code)
-        result = query.one()
-        return result.total_value
+        return session.execute(lambda_stmt(
+            lambda: select(func.sum(FinancialTransaction.value).label('total_value'))
+            .where(FinancialTransaction.account_code == account_code)
+        )).scalar_one()
@@ -15,7 +15,7 @@ def test_create_account(memory_db_session):
     )
 
     account_model = account_repo.create(new_account_data)
-    assert len(account_model.code) == 10
+    assert len(account_model.code) == 26
     assert account_model.name == "Test Account"
     assert account_model.user_code == "USER123"
     assert account_model.created_at == date.today()
@@ -1,12 +1,14 @@
 from datetime import date
-from typing import List
+from typing import Dict, List, Optional
 
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.exc import NoResultFound
 
 from finance.domain.category_erros import CategoryUnexpectedError, CategoryNotFound
 from finance.domain.models import CategoryModel
 from finance.repository.db.db_entities import Category
 from helpers import generate_code
+from repository_cache import cached_by_user, repository_cache
 
 
 def to_database(category_model: CategoryModel) -> Category:
@@ -17,6 +19,10 @@ def to_model(category: Category) -> CategoryModel:
     return CategoryModel(**category.to_dict())
 
 
+def select_by_code(category_code: str):
+    return lambda_stmt(lambda: select(Category).where(Category.code == category_code))
+
+
 class CategoryRepo:
     def __init__(self, session):
         self.session = session
@@ -35,6 +41,7 @@ class CategoryRepo:
             )
             session.add(new_category)
             session.commit()
+            repository_cache.bump(new_category.user_code)
             session.refresh(new_category)
             return to_model(new_category)
         except CategoryNotFound:
@@ -45,9 +52,7 @@ class CategoryRepo:
     def find_by_code(self, category_code: str) -> CategoryModel:
         session = self.session
         try:
-            category = session.query(Category).filter(
-                Category.code == category_code
-            ).one()
+            category = session.execute(select_by_code(category_code)).scalar_one()
             return to_model(category)
         except NoResultFound:
             raise CategoryNotFound()
@@ -57,14 +62,13 @@ class CategoryRepo:
     def update(self, category_code: str, updated_category_data: CategoryModel) -> CategoryModel:
         session = self.session
         try:
-            category = session.query(Category).filter(
-                Category.code == category_code
-            ).one()
+            category = session.execute(select_by_code(category_code)).scalar_one()
             model_dump = updated_category_data.model_dump(exclude={"created_at", "code", "user_code"})
 
             for key, value in model_dump.items():
                 setattr(category, key, value)
             session.commit()
+            repository_cache.bump(category.user_code)
             session.refresh(category)
             return to_model(category)
         except NoResultFound:
@@ -75,9 +79,7 @@ class CategoryRepo:
     def delete(self, category_code: str):
         session = self.session
         try:
-            main_category: CategoryModel = session.query(Category).filter(
-                Category.code == category_code
-            ).one()
+            main_category: Category = session.execute(select_by_code(category_code)).scalar_one()
 
             children_categories = self.find_categories_by_user_and_parent(
                 main_category.user_code, category_code
@@ -86,32 +88,49 @@ class CategoryRepo:
             for child_category in children_categories:
                 self.delete(child_category.code)
 
+            user_code = main_category.user_code
             session.delete(main_category)
             session.commit()
+            repository_cache.bump(user_code)
         except NoResultFound:
             raise CategoryNotFound()
         except Exception:
             raise CategoryUnexpectedError()
 
+    @cached_by_user("categories:find_categories_by_user_and_parent")
     def find_categories_by_user_and_parent(
             self, user_code: str, parent_category_code: str = None
     ) -> List[CategoryModel]:
         session = self.session
         try:
-            categories = session.query(Category).filter(
-                Category.user_code == user_code,
-                Category.parent_category_code == parent_category_code
-            )
-            return [to_model(cat) for cat in categories.all()]
+            stmt = lambda_stmt(lambda: select(Category).where(Category.user_code == user_code))
+            # "== None" só vira IS NULL na construção; numa lambda em cache viraria "= NULL".
+            if parent_category_code is None:
+                stmt += lambda s: s.where(Category.parent_category_code.is_(None))
+            else:
+                stmt += lambda s: s.where(Category.parent_category_code == parent_category_code)
+            return [to_model(cat) for cat in session.execute(stmt).scalars()]
         except Exception:
             raise CategoryUnexpectedError()
 
+    @cached_by_user("categories:find_parent_codes_by_user")
+    def find_parent_codes_by_user(self, user_code: str) -> Dict[str, Optional[str]]:
+        session = self.session
+        try:
+            rows = session.execute(lambda_stmt(
+                lambda: select(Category.code, Category.parent_category_code).where(Category.user_code == user_code)
+            )).all()
+            return {code: parent_category_code for code, parent_category_code in rows}
+        except Exception:
+            raise CategoryUnexpectedError()
+
+    @cached_by_user("categories:find_all_by_user")
     def find_all_by_user(self, user_code: str) -> List[CategoryModel]:
         session = self.session
         try:
-            categories = session.query(Category).filter(
-                Category.user_code == user_code,
-            )
-            return [to_model(cat) for cat in categories.all()]
+            categories = session.execute(lambda_stmt(
+                lambda: select(Category).where(Category.user_code == user_code)
+            )).scalars()
+            return [to_model(cat) for cat in categories]
         except Exception:
             raise CategoryUnexpectedError()
@@ -17,7 +17,7 @@ def test_create_category(memory_db_session):
     result = category_repo.create(new_category_data)
 
     assert result.name == "Test Category"
-    assert len(result.code) == 10
+    assert len(result.code) == 26
 
     # Test with parent
     another_new_category_data = CategoryModel(
@@ -28,7 +28,7 @@ def test_create_category(memory_db_session):
     result = category_repo.create(new_category_data)
     assert isinstance(result, CategoryModel)
     assert result.name == "Test Category"
-    assert len(result.code) == 10
+    assert len(result.code) == 26
 
 
 def test_create_category_non_existent_parent(memory_db_session):
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Float, Date, Integer, String, UniqueConstraint, ForeignKey
+from sqlalchemy import Column, Date, Index, Integer, String, UniqueConstraint, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy_mixins import AllFeaturesMixin
 
 from finance.domain.models import TransactionType
+from money import money_type
 
 Base = declarative_base()
 
@@ -15,7 +16,7 @@ class Account(Base, AllFeaturesMixin):
     name = Column(String, index=True)
     description = Column(String)
     user_code = Column(String, index=True)
-    balance = Column(Float, default=0)
+    balance = Column(money_type(), default=0)
     created_at = Column(Date)
 
     def __init__(self, **kwargs):
@@ -39,6 +40,10 @@ class Category(Base, AllFeaturesMixin):
 
 class FinancialTransaction(Base, AllFeaturesMixin):
     __tablename__ = 'finances_transactions'
+    __table_args__ = (
+        # filter(): account_code IN (...) + intervalo de datas, ordenado por (date, id).
+        Index('ix_finances_transactions_account_code_date_id', 'account_code', 'date', 'id'),
+    )
     id = Column(Integer, primary_key=True, index=True, unique=True)
     code = Column(String, index=True, unique=True)
     account_code = Column(String, index=True)
@@ -46,7 +51,7 @@ class FinancialTransaction(Base, AllFeaturesMixin):
     category_code = Column(String, index=True, nullable=True)
     type = Column(String)
     date = Column(Date)
-    value = Column(Float)
+    value = Column(money_type())
 
     def __init__(self, **kwargs):
         kwargs.setdefault('id', None)
@@ -57,10 +62,13 @@ class FinancialTransaction(Base, AllFeaturesMixin):
 
 class AccountConsolidation(Base, AllFeaturesMixin):
     __tablename__ = 'finances_account_consolidations'
+    __table_args__ = (
+        Index('ux_finances_account_consolidations_account_code_month', 'account_code', 'month', unique=True),
+    )
     id = Column(Integer, primary_key=True, index=True, unique=True)
     account_code = Column(String, ForeignKey('finances_accounts.code'), index=True)
     month = Column(Date)
-    balance = Column(Float)
+    balance = Column(money_type())
 
     def __init__(self, **kwargs):
         kwargs.setdefault('id', None)
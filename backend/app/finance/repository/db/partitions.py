@@ -0,0 +1,153 @@
+"""
+Particionamento mensal (Postgres) de finances_transactions.
+
+Opcional: a tabela só é convertida pela migration 9c4d2b7e5a61 quando
+FINANCES_TRANSACTIONS_PARTITIONING=monthly (ou ``alembic -x partitioning=monthly``).
+Cada mês vira uma partição ``finances_transactions_pYYYYMM`` com as datas
+[primeiro dia, primeiro dia do mês seguinte); a partição DEFAULT recebe o que
+ficar fora delas, então um insert não falha por falta de partição.
+
+Se a DEFAULT já tiver linhas de um mês (um lançamento datado além das partições
+criadas), o Postgres recusa ``CREATE TABLE ... PARTITION OF`` para esse mês
+("updated partition constraint for default partition would be violated"). Nesse
+caso ``ensure_partitions`` cria a tabela do mês avulsa, move as linhas da DEFAULT
+para ela e só então a anexa (ATTACH PARTITION), tudo na mesma transação. O ATTACH
+trava a DEFAULT em ACCESS EXCLUSIVE enquanto confere que ela não tem mais linhas do
+mês, então o custo cresce com o tamanho da DEFAULT.
+
+As partições futuras são criadas na subida do app e por
+``python cmd_tools.py create-partitions`` (para rodar no cron). Um mês antigo sai
+da tabela com ``detach_partition``, sem DELETE.
+
+Em uma tabela particionada a chave primária e os índices únicos precisam incluir a
+coluna de partição, então passam a ser (id, date) e (code, date).
+"""
+import logging
+import os
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+TABLE = "finances_transactions"
+DEFAULT_PARTITION = f"{TABLE}_default"
+INDEXES = (
+    ("ix_finances_transactions_account_code", "account_code"),
+    ("ix_finances_transactions_category_code", "category_code"),
+    ("ix_finances_transactions_type", "type"),
+    ("ix_finances_transactions_date", "date"),
+    ("ix_finances_transactions_account_code_date_id", "account_code, date, id"),
+)
+
+
+def months_ahead() -> int:
+    return int(os.getenv("FINANCES_TRANSACTIONS_PARTITIONS_AHEAD", "3"))
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(start: date, end: date) -> List[date]:
+    """First day of every month from ``start`` to ``end`` (inclusive)."""
+    month = date(start.year, start.month, 1)
+    months = []
+    while month <= end:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def create_partition_sql(month: date) -> str:
+    month = date(month.year, month.month, 1)
+    return (f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')")
+
+
+def move_from_default_sql(month: date) -> List[str]:
+    """Statements for a month whose rows are already in the DEFAULT partition."""
+    month = date(month.year, month.month, 1)
+    name, start, end = partition_name(month), month.isoformat(), add_months(month, 1).isoformat()
+    return [
+        f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS)",
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= '{start}' AND date < '{end}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')",
+    ]
+
+
+def create_partitioned_table_sql(source_table: str) -> List[str]:
+    return [
+        f"CREATE TABLE {TABLE} (LIKE {source_table} INCLUDING DEFAULTS) PARTITION BY RANGE (date)",
+        f"ALTER TABLE {TABLE} ALTER COLUMN date SET NOT NULL",
+        f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT",
+    ]
+
+
+def create_indexes_sql() -> List[str]:
+    """Run after the source table is dropped: its indexes keep the same names."""
+    return [
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, date)",
+        f"CREATE UNIQUE INDEX ux_{TABLE}_code_date ON {TABLE} (code, date)",
+    ] + [f"CREATE INDEX {name} ON {TABLE} ({columns})" for name, columns in INDEXES]
+
+
+def is_partitioned(conn) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :table)"
+    ), {"table": TABLE}).scalar()
+
+
+def partition_exists(conn, month: date) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": partition_name(month)}).scalar()
+
+
+def default_has_rows(conn, month: date) -> bool:
+    return conn.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end)"
+    ), {"start": month, "end": add_months(month, 1)}).scalar()
+
+
+def ensure_partition(conn, month: date):
+    month = date(month.year, month.month, 1)
+    if partition_exists(conn, month):
+        return
+    if default_has_rows(conn, month):
+        logger.warning(f"Moving {partition_name(month)} rows out of {DEFAULT_PARTITION}")
+        for statement in move_from_default_sql(month):
+            conn.execute(text(statement))
+    else:
+        conn.execute(text(create_partition_sql(month)))
+
+
+def ensure_partitions(conn, start: date, end: date) -> List[str]:
+    """Creates the missing monthly partitions between ``start`` and ``end``; returns the months' partition names."""
+    names = []
+    for month in month_range(start, end):
+        ensure_partition(conn, month)
+        names.append(partition_name(month))
+    return names
+
+
+def ensure_future_partitions(engine, today: date = None) -> List[str]:
+    """Current month plus FINANCES_TRANSACTIONS_PARTITIONS_AHEAD; a no-op when the table is not partitioned."""
+    today = today or date.today()
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return []
+        return ensure_partitions(conn, today, add_months(today, months_ahead()))
+
+
+def detach_partition(conn, month: date):
+    """Removes a month from the table without deleting it (the partition becomes a regular table)."""
+    conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {partition_name(month)}"))
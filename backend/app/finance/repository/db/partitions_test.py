@@ -0,0 +1,98 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from finance.repository.db import partitions
+
+
+def test_add_months_crosses_years():
+    assert partitions.add_months(date(2023, 11, 1), 3) == date(2024, 2, 1)
+    assert partitions.add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+
+def test_month_range():
+    assert partitions.month_range(date(2023, 12, 15), date(2024, 2, 1)) == [
+        date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1)
+    ]
+
+
+def test_create_partition_sql():
+    assert partitions.partition_name(date(2024, 3, 9)) == "finances_transactions_p202403"
+    assert partitions.create_partition_sql(date(2024, 12, 9)) == (
+        "CREATE TABLE IF NOT EXISTS finances_transactions_p202412 PARTITION OF finances_transactions "
+        "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')"
+    )
+
+
+def executed_sql(conn):
+    return [str(call.args[0]) for call in conn.execute.call_args_list]
+
+
+def test_ensure_partitions_creates_each_month(mocker):
+    conn = mocker.Mock()
+    conn.execute.return_value.scalar.return_value = False
+
+    names = partitions.ensure_partitions(conn, date(2024, 1, 20), date(2024, 3, 1))
+
+    assert names == ["finances_transactions_p202401", "finances_transactions_p202402", "finances_transactions_p202403"]
+    assert [sql for sql in executed_sql(conn) if sql.startswith("CREATE TABLE")] == [
+        partitions.create_partition_sql(date(2024, month, 1)) for month in (1, 2, 3)
+    ]
+
+
+def test_ensure_partitions_skips_existing_month(mocker):
+    conn = mocker.Mock()
+    conn.execute.return_value.scalar.return_value = True
+
+    partitions.ensure_partitions(conn, date(2024, 1, 1), date(2024, 1, 1))
+
+    assert conn.execute.call_count == 1
+    assert "to_regclass" in executed_sql(conn)[0]
+
+
+def test_ensure_partitions_moves_rows_out_of_default_partition(mocker):
+    conn = mocker.Mock()
+    # partição ainda não existe; a DEFAULT tem linhas do mês
+    conn.execute.return_value.scalar.side_effect = [False, True]
+
+    partitions.ensure_partitions(conn, date(2024, 5, 1), date(2024, 5, 1))
+
+    assert executed_sql(conn)[2:] == partitions.move_from_default_sql(date(2024, 5, 1))
+    assert executed_sql(conn)[2:] == [
+        "CREATE TABLE finances_transactions_p202405 (LIKE finances_transactions INCLUDING DEFAULTS)",
+        "WITH moved AS (DELETE FROM finances_transactions_default "
+        "WHERE date >= '2024-05-01' AND date < '2024-06-01' RETURNING *) "
+        "INSERT INTO finances_transactions_p202405 SELECT * FROM moved",
+        "ALTER TABLE finances_transactions ATTACH PARTITION finances_transactions_p202405 "
+        "FOR VALUES FROM ('2024-05-01') TO ('2024-06-01')",
+    ]
+
+
+def test_partitioned_table_keeps_partition_key_in_unique_indexes():
+    statements = partitions.create_partitioned_table_sql("source") + partitions.create_indexes_sql()
+
+    assert "PARTITION BY RANGE (date)" in statements[0]
+    assert "PRIMARY KEY (id, date)" in " ".join(statements)
+    assert "CREATE UNIQUE INDEX ux_finances_transactions_code_date ON finances_transactions (code, date)" in statements
+
+
+def test_future_partitions_noop_outside_postgres():
+    engine = create_engine("sqlite://")
+
+    assert partitions.ensure_future_partitions(engine, today=date(2024, 1, 1)) == []
+
+
+def test_startup_survives_partition_failure(mocker, monkeypatch):
+    import main
+
+    monkeypatch.setenv("DB_CREATE_SCHEMA", "false")
+    monkeypatch.setenv("SECRET_KEY", "secret_key")
+    engine = mocker.Mock()
+    engine.dialect.name = "postgresql"
+    monkeypatch.setattr(main.database, "engine", engine)
+    ensure = mocker.patch("main.ensure_future_partitions", side_effect=RuntimeError("default partition"))
+
+    with TestClient(main.app) as client:
+        assert client.get("/health").status_code == 200
+    ensure.assert_called_once_with(engine)
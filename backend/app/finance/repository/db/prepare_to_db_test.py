@@ -12,6 +12,7 @@ from auth.user import User, get_current_user
 from finance.domain.models import TransactionType
 from finance.repository.db.db_connection import get_db_session
 from finance.repository.db.db_entities import Account, Base, Category, FinancialTransaction, AccountConsolidation
+from repository_cache import repository_cache
 
 
 @pytest.fixture(scope="function")
@@ -24,6 +25,7 @@ def db_session():
     Base.metadata.create_all(bind=engine)
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
     db = TestingSessionLocal()
+    repository_cache.clear()
     try:
         yield db
     finally:
@@ -42,6 +44,7 @@ def memory_db_session():
     Base.metadata.create_all(bind=engine)
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
     db = TestingSessionLocal()
+    repository_cache.clear()
     try:
         yield db
     finally:
@@ -1,10 +1,11 @@
 from datetime import date
 from typing import List
 
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.exc import NoResultFound
 
 from finance.domain.financial_transaction_erros import FinancialTransactionUnexpectedError, FinancialTransactionNotFound
-from finance.domain.models import FinancialTransactionModel
+from finance.domain.models import FinancialTransactionModel, TransactionType
 from finance.repository.db.db_entities import FinancialTransaction
 from helpers import generate_code
 
@@ -14,11 +15,39 @@ def to_database(financial_transaction_model: FinancialTransactionModel) -> Finan
 
 
 def to_model(financial_transaction: FinancialTransaction) -> FinancialTransactionModel:
-    return FinancialTransactionModel(
-        **financial_transaction.to_dict(exclude=["id"])
+    """
+    Valores vindos do banco já têm os tipos do modelo: ``model_construct`` pula o
+    ``to_dict()`` e a validação do pydantic. Serve tanto para a entidade quanto para
+    uma linha com as ``COLUMNS``.
+    """
+    return FinancialTransactionModel.model_construct(
+        code=financial_transaction.code,
+        account_code=financial_transaction.account_code,
+        description=financial_transaction.description,
+        category_code=financial_transaction.category_code,
+        type=TransactionType(financial_transaction.type),
+        date=financial_transaction.date,
+        value=financial_transaction.value,
     )
 
 
+# Listagens leem só as colunas do modelo: sem instâncias da entidade nem identity map.
+COLUMNS = (
+    FinancialTransaction.code,
+    FinancialTransaction.account_code,
+    FinancialTransaction.description,
+    FinancialTransaction.category_code,
+    FinancialTransaction.type,
+    FinancialTransaction.date,
+    FinancialTransaction.value,
+)
+
+
+def select_by_code(transaction_code: str):
+    # lambda_stmt: o SQL compilado fica em cache pelo código da lambda; os valores viram parâmetros.
+    return lambda_stmt(lambda: select(FinancialTransaction).where(FinancialTransaction.code == transaction_code))
+
+
 class FinancialTransactionRepo:
     def __init__(self, session):
         self.session = session
@@ -40,9 +69,7 @@ class FinancialTransactionRepo:
     def find_by_code(self, transaction_code: str) -> FinancialTransactionModel:
         session = self.session
         try:
-            transaction = session.query(FinancialTransaction).filter(
-                FinancialTransaction.code == transaction_code
-            ).one()
+            transaction = session.execute(select_by_code(transaction_code)).scalar_one()
             return to_model(transaction)
         except NoResultFound:
             raise FinancialTransactionNotFound()
@@ -58,23 +85,18 @@ class FinancialTransactionRepo:
     ) -> List[FinancialTransactionModel]:
         session = self.session
         try:
-            query = session.query(FinancialTransaction)
+            # Cada combinação de filtros presentes tem a sua entrada no cache de statements.
+            stmt = lambda_stmt(lambda: select(*COLUMNS))
             if account_codes:
-                query = query.filter(
-                    FinancialTransaction.account_code.in_(account_codes)
-                )
-            if category_codes:
-                query = query.filter(FinancialTransaction.category_code.in_(category_codes))
+                stmt += lambda s: s.where(FinancialTransaction.account_code.in_(account_codes))
             if category_codes:
-                query = query.filter(FinancialTransaction.category_code.in_(category_codes))
+                stmt += lambda s: s.where(FinancialTransaction.category_code.in_(category_codes))
             if date_start:
-                query = query.filter(FinancialTransaction.date >= date_start)
+                stmt += lambda s: s.where(FinancialTransaction.date >= date_start)
             if date_end:
-                query = query.filter(FinancialTransaction.date <= date_end)
-
-            query = query.order_by(FinancialTransaction.date, FinancialTransaction.id)
-            transactions = query.all()
-            return [to_model(transaction) for transaction in transactions]
+                stmt += lambda s: s.where(FinancialTransaction.date <= date_end)
+            stmt += lambda s: s.order_by(FinancialTransaction.date, FinancialTransaction.id)
+            return [to_model(row) for row in session.execute(stmt)]
         except Exception as e:
             raise FinancialTransactionUnexpectedError()
 
@@ -82,9 +104,7 @@ class FinancialTransactionRepo:
                updated_transaction_data: FinancialTransactionModel) -> FinancialTransactionModel:
         session = self.session
         try:
-            transaction = session.query(FinancialTransaction).filter(
-                FinancialTransaction.code == transaction_code
-            ).one()
+            transaction = session.execute(select_by_code(transaction_code)).scalar_one()
             for key, value in updated_transaction_data.model_dump(exclude={'code'}).items():
                 setattr(transaction, key, value if key != "type" else value.value)
             session.commit()
@@ -98,9 +118,7 @@ class FinancialTransactionRepo:
     def delete(self, transaction_code: str):
         session = self.session
         try:
-            transaction = session.query(FinancialTransaction).filter(
-                FinancialTransaction.code == transaction_code
-            ).one()
+            transaction = session.execute(select_by_code(transaction_code)).scalar_one()
             session.delete(transaction)
             session.commit()
         except NoResultFound:
@@ -1,5 +1,5 @@
 from datetime import date
-from unittest.mock import Mock, create_autospec
+from unittest.mock import create_autospec
 
 import pytest
 from sqlalchemy.exc import NoResultFound
@@ -9,6 +9,7 @@ from finance.domain.financial_transaction_erros import FinancialTransactionNotFo
 from finance.domain.models import FinancialTransactionModel, TransactionType
 from finance.repository.db.db_entities import FinancialTransaction
 from finance.repository.financial_transaction_repository import FinancialTransactionRepo
+from finance.repository.db.prepare_to_db_test import memory_db_session  # noqa: F401
 
 
 def generate_financial_transaction_model(code=None):
@@ -47,7 +48,7 @@ def test_find_by_code_successful():
     mock_session = create_autospec(Session)
     repo = FinancialTransactionRepo(mock_session)
     transaction_code = "TRANS123"
-    mock_session.query().filter().one.return_value = generate_financial_transaction(transaction_code)
+    mock_session.execute.return_value.scalar_one.return_value = generate_financial_transaction(transaction_code)
 
     result = repo.find_by_code(transaction_code)
 
@@ -57,7 +58,7 @@ def test_find_by_code_successful():
 def test_find_by_code_not_found():
     mock_session = create_autospec(Session)
     repo = FinancialTransactionRepo(mock_session)
-    mock_session.query().filter().one.side_effect = NoResultFound
+    mock_session.execute.return_value.scalar_one.side_effect = NoResultFound
 
     with pytest.raises(FinancialTransactionNotFound):
         repo.find_by_code("TRANS123")
@@ -72,13 +73,12 @@ def test_filter():
         generate_financial_transaction(),
     ]
 
-    mock_session.query.return_value.filter.return_value.order_by.return_value.all.return_value = return_value_filter
+    mock_session.execute.return_value = return_value_filter
 
     result = repo.filter(["TR001"])
-    assert mock_session.query.return_value.filter.return_value.order_by.return_value.all.call_count == 1
-    assert mock_session.query.call_count == 1
-    assert mock_session.query.return_value.filter.call_count == 1
+    assert mock_session.execute.call_count == 1
     assert len(result) == 2
+    assert all(isinstance(transaction, FinancialTransactionModel) for transaction in result)
 
 
 def test_filter_with_date():
@@ -90,20 +90,16 @@ def test_filter_with_date():
         generate_financial_transaction(),
     ]
 
-    query_1 = Mock(name="Mock1")
-    query_2 = Mock(name="Mock2")
-
-    query_1.filter.return_value = query_2
-    mock_session.query.return_value.filter.return_value = query_1
-
-    query_2.filter.return_value.order_by.return_value.all.return_value = return_value_filter
+    mock_session.execute.return_value = return_value_filter
 
     result = repo.filter(["TR001"], None, date.today(), date.today())
 
-    assert mock_session.query.call_count == 1
-    assert mock_session.query.return_value.filter.call_count == 1
-    assert query_1.filter.call_count == 1
-    assert query_2.filter.call_count == 1
+    assert mock_session.execute.call_count == 1
+    sql = str(mock_session.execute.call_args.args[0])
+    assert "finances_transactions.account_code IN" in sql
+    assert "finances_transactions.date >=" in sql
+    assert "finances_transactions.date <=" in sql
+    assert "category_code IN" not in sql
     assert len(result) == 2
 
 
@@ -111,13 +107,28 @@ def test_filter_empty_result():
     mock_session = create_autospec(Session)
     repo = FinancialTransactionRepo(mock_session)
 
-    mock_session.query().filter().order_by().all.return_value = []
+    mock_session.execute.return_value = []
 
     result = repo.filter(["TR001"])
-    mock_session.query().filter().order_by().all.assert_called_once()
+    mock_session.execute.assert_called_once()
     assert len(result) == 0
 
 
+def test_filter_reuses_cached_statement(memory_db_session):
+    repo = FinancialTransactionRepo(memory_db_session)
+    for code, account_code in [("T1", "ACC1"), ("T2", "ACC2"), ("T3", "ACC2")]:
+        memory_db_session.add(FinancialTransaction(
+            code=code, account_code=account_code, description="", type=TransactionType.WITHDRAWAL,
+            date=date(2024, 1, 1), value=1.0
+        ))
+    memory_db_session.commit()
+
+    assert [t.code for t in repo.filter(["ACC1"])] == ["T1"]
+    # Mesma lambda, novos valores: o statement em cache não pode reaproveitar os parâmetros antigos.
+    assert [t.code for t in repo.filter(["ACC2"])] == ["T2", "T3"]
+    assert [t.code for t in repo.filter(["ACC1", "ACC2"], date_start=date(2024, 1, 2))] == []
+
+
 def test_update_financial_transaction():
     mock_session = create_autospec(Session)
     repo = FinancialTransactionRepo(mock_session)
@@ -126,7 +137,7 @@ def test_update_financial_transaction():
     updated_data.description = "Updated transaction"
 
     mock_transaction = generate_financial_transaction(transaction_code)
-    mock_session.query().filter().one.return_value = mock_transaction
+    mock_session.execute.return_value.scalar_one.return_value = mock_transaction
     mock_session.commit.return_value = None
     mock_session.refresh.return_value = None
 
@@ -142,7 +153,7 @@ def test_delete_financial_transaction():
     repo = FinancialTransactionRepo(mock_session)
     transaction_code = "TRANS123"
     mock_transaction = generate_financial_transaction(transaction_code)
-    mock_session.query().filter().one.return_value = mock_transaction
+    mock_session.execute.return_value.scalar_one.return_value = mock_transaction
     mock_session.delete.return_value = None
     mock_session.commit.return_value = None
 
@@ -150,3 +161,17 @@ def test_delete_financial_transaction():
 
     mock_session.delete.assert_called_once_with(mock_transaction)
     mock_session.commit.assert_called_once()
+
+
+def test_filter_maps_rows_like_validated_model(memory_db_session):
+    repo = FinancialTransactionRepo(memory_db_session)
+    memory_db_session.add(FinancialTransaction(
+        code="T1", account_code="ACC1", description="Mercado", category_code=None,
+        type=TransactionType.DEPOSIT.value, date=date(2024, 1, 1), value=10.5
+    ))
+    memory_db_session.commit()
+
+    assert repo.filter(["ACC1"]) == [FinancialTransactionModel(
+        code="T1", account_code="ACC1", description="Mercado", category_code=None,
+        type="DEPOSIT", date=date(2024, 1, 1), value=10.5
+    )]
@@ -61,7 +61,8 @@ class AccountConsolidationService:
                 month=date(month.year, month.month, 1),
                 balance=balance
             )
-            return self.account_consolidation_repo.create(new_consolidation)
+            # Outra requisição pode criar o mesmo mês entre a busca e a escrita.
+            return self.account_consolidation_repo.upsert(new_consolidation)
 
     def get_root_category(self, category_code):
         category = self.category_repo.find_by_code(category_code)
@@ -6,6 +6,7 @@ from finance.services.account_consolidation_service import AccountConsolidationS
 from finance.services.account_service import AccountService
 from finance.services.category_service import CategoryService
 from finance.services.financial_transaction_service import FinancialTransactionService
+from ownership import OwnershipContext
 
 
 class ServiceFactory:
@@ -21,7 +22,17 @@ class ServiceFactory:
         return CategoryService(category_repo, financial_transaction_repo)
 
     @staticmethod
-    def create_financial_transaction_service(session=None) -> FinancialTransactionService:
+    def create_ownership_context(session, user_code: str) -> OwnershipContext:
+        return OwnershipContext(
+            user_code,
+            account_loader=AccountRepo(session).find_codes_by_user,
+            category_loader=CategoryRepo(session).find_parent_codes_by_user,
+        )
+
+    @staticmethod
+    def create_financial_transaction_service(
+            session=None, ownership: OwnershipContext = None
+    ) -> FinancialTransactionService:
         account_repo = AccountRepo(session)
         account_service = AccountService(account_repo)
         transaction_repo = FinancialTransactionRepo(session)
@@ -31,7 +42,7 @@ class ServiceFactory:
             cons_repo, transaction_repo, account_repo, None
         )
 
-        return FinancialTransactionService(transaction_repo, account_service, consolidation_service)
+        return FinancialTransactionService(transaction_repo, account_service, consolidation_service, ownership)
 
     @staticmethod
     def create_account_consolidations_service(session=None) -> AccountConsolidationService:
@@ -7,6 +7,7 @@ from finance.domain.models import FinancialTransactionModel, TransactionType
 from finance.repository.financial_transaction_repository import FinancialTransactionRepo
 from finance.services.account_consolidation_service import AccountConsolidationService
 from finance.services.account_service import AccountService
+from ownership import OwnershipContext
 
 
 class FinancialTransactionService:
@@ -14,11 +15,19 @@ class FinancialTransactionService:
             self,
             financial_transaction_repo: FinancialTransactionRepo,
             account_service: AccountService,
-            consolidation_service: AccountConsolidationService
+            consolidation_service: AccountConsolidationService,
+            ownership: OwnershipContext = None
     ):
         self.financial_transaction_repo = financial_transaction_repo
         self.account_service = account_service
         self.consolidation_service = consolidation_service
+        self.ownership = ownership
+
+    def check_account(self, user_code: str, account_code: str):
+        if self.ownership is not None and self.ownership.is_owner(user_code):
+            self.ownership.check_account(account_code)
+        else:
+            self.account_service.get_by_code(user_code, account_code)
 
     def create(self, user_code: str, new_transaction: FinancialTransactionModel) -> FinancialTransactionModel:
         created_transaction = self.financial_transaction_repo.create(new_transaction)
@@ -39,7 +48,7 @@ class FinancialTransactionService:
     ) -> List[FinancialTransactionModel]:
 
         for acc in account_codes:
-            self.account_service.get_by_code(user_code, acc)
+            self.check_account(user_code, acc)
 
         return self.financial_transaction_repo.filter(
             account_codes, category_codes, date_start, date_end
@@ -1,15 +1,55 @@
 import calendar
 import datetime
 import random
+import secrets
 import string
+import threading
+import time
 
+# Base32 de Crockford: a ordem dos caracteres é a ordem ASCII, então a ordem das strings é a ordem numérica.
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_LENGTH = 26
+_ULID_RANDOM_BITS = 80
+_ulid_lock = threading.Lock()
+_ulid_last = [0, 0]  # [milissegundos, parte aleatória]
 
-def generate_code(length=10):
-    # Definindo os caracteres permitidos: letras maiúsculas, minúsculas e dígitos
+
+def _encode_ulid(value: int) -> str:
+    chars = []
+    for _ in range(ULID_LENGTH):
+        value, remainder = divmod(value, 32)
+        chars.append(ULID_ALPHABET[remainder])
+    return "".join(reversed(chars))
+
+
+def generate_ulid() -> str:
+    """
+    ULID: 48 bits de timestamp em ms + 80 bits aleatórios, 26 caracteres.
+    Códigos gerados no mesmo ms pelo processo incrementam a parte aleatória, então
+    são sempre crescentes e não colidem; entre processos a colisão exige os mesmos
+    80 bits aleatórios no mesmo ms.
+    """
+    with _ulid_lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms <= _ulid_last[0]:
+            now_ms = _ulid_last[0]
+            randomness = _ulid_last[1] + 1
+            if randomness >> _ULID_RANDOM_BITS:
+                # Parte aleatória esgotada no mesmo ms: avança para o próximo.
+                now_ms += 1
+                randomness = secrets.randbits(_ULID_RANDOM_BITS)
+        else:
+            randomness = secrets.randbits(_ULID_RANDOM_BITS)
+        _ulid_last[0], _ulid_last[1] = now_ms, randomness
+    return _encode_ulid((now_ms << _ULID_RANDOM_BITS) | randomness)
+
+
+def generate_code(length=None):
+    """Código de negócio das entidades: um ULID; com ``length``, uma string aleatória (formato antigo)."""
+    if length is None:
+        return generate_ulid()
     characters = string.ascii_letters + string.digits
-    # Gerando o código
-    unique_code = ''.join(random.choices(characters, k=length))
-    return unique_code
+    return ''.join(random.choices(characters, k=length))
 
 
 def get_last_day_of_the_month(date_input: datetime.date = None):
@@ -2,17 +2,25 @@ import datetime
 import json
 from unittest.mock import patch
 
-from helpers import generate_code, get_last_day_of_the_month, ofx_to_json
+from helpers import ULID_ALPHABET, generate_code, generate_ulid, get_last_day_of_the_month, ofx_to_json
 
 
 def test_generate_code():
     result = generate_code()
-    assert len(result) == 10
+    assert len(result) == 26
 
     result = generate_code(length=20)
     assert len(result) == 20
 
 
+def test_generate_ulid_is_sorted_and_unique():
+    codes = [generate_ulid() for _ in range(10000)]
+
+    assert codes == sorted(codes)
+    assert len(set(codes)) == len(codes)
+    assert all(char in ULID_ALPHABET for char in codes[0])
+
+
 def test_get_last_day_of_the_month_today():
     fixed_date = datetime.date(2023, 2, 15)
 
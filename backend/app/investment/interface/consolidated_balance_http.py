@@ -4,6 +4,7 @@ from typing import Optional
 from fastapi import APIRouter, status, Query, HTTPException, Depends
 
 from auth.user import User, get_current_user
+from database import run_in_session
 from investment.repository.db.db_connection import get_db_session
 from investment.services.consolidated_service import ConsolidatedPortfolioService
 from investment.services.service_factory import ServiceFactory
@@ -12,7 +13,8 @@ router = APIRouter()
 
 
 @router.get("/{portfolio_code}/consolidations")
-async def get_consolidated_balance(
+@run_in_session
+def get_consolidated_balance(
         portfolio_code: str,
         start_date: Optional[date] = Query(None, description="Start date in YYYY-MM-DD format"),
         end_date: Optional[date] = Query(None, description="End date in YYYY-MM-DD format"),
@@ -33,7 +35,8 @@ async def get_consolidated_balance(
 
 
 @router.post("/{portfolio_code}/consolidations/consolidate")
-async def consolidate_balance(
+@run_in_session
+def consolidate_balance(
         portfolio_code: str,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
@@ -53,3 +53,11 @@ def test_consolidate_balance(client, db_session):
     assert json_result["balance"] == 12900
 
 
+def test_consolidate_balance_twice_same_day(client, db_session):
+    add_portfolio(db_session)
+    add_investments(db_session)
+
+    assert client.post("/portfolios/PORT101/consolidations/consolidate").status_code == 200
+    assert client.post("/portfolios/PORT101/consolidations/consolidate").status_code == 200
+
+    assert len(client.get("/portfolios/PORT101/consolidations").json()) == 1
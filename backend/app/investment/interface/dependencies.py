@@ -0,0 +1,14 @@
+from fastapi import Depends
+
+from auth.user import User, get_current_user
+from database import sync_session
+from investment.repository.db.db_connection import get_db_session
+from investment.services.service_factory import ServiceFactory
+from ownership import OwnershipContext
+
+
+def get_ownership(
+        db_session=Depends(get_db_session),
+        current_user: User = Depends(get_current_user)
+) -> OwnershipContext:
+    return ServiceFactory.create_ownership_context(sync_session(db_session), current_user.code)
@@ -5,12 +5,15 @@ from fastapi import HTTPException, status, APIRouter, Depends
 from pydantic import BaseModel
 
 from auth.user import User, get_current_user
+from database import run_in_session
 from investment.domain.investment_errors import InvestmentNotFound, OperationNotPermittedError, \
     ColumnDoesNotExistError
 from investment.domain.models import InvestmentModel, PortfolioOverviewModel, AssetType
 from investment.domain.portfolio_erros import PortfolioNotFound
+from investment.interface.dependencies import get_ownership
 from investment.repository.db.db_connection import get_db_session
 from investment.services.service_factory import ServiceFactory
+from ownership import OwnershipContext
 
 router = APIRouter()
 
@@ -31,14 +34,16 @@ class AssetTypeValue(BaseModel):
 
 
 @router.post("/{portfolio_code}/investments", response_model=InvestmentModel)
-async def create_investment(
+@run_in_session
+def create_investment(
         portfolio_code,
         new_investment_form_data: NewInvestmentInput,
         db_session=Depends(get_db_session),
-        current_user=Depends(get_current_user)
+        current_user=Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        investment_service = ServiceFactory.create_investment_service(db_session)
+        investment_service = ServiceFactory.create_investment_service(db_session, ownership)
         if not portfolio_code == new_investment_form_data.portfolio_code:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                                 detail="Portfolio code does not match.")
@@ -54,14 +59,16 @@ async def create_investment(
 
 
 @router.get("/{portfolio_code}/investments/{investment_code}", response_model=InvestmentModel)
-async def get_investment(
+@run_in_session
+def get_investment(
         portfolio_code: str,
         investment_code: str,
         db_session=Depends(get_db_session),
-        current_user=Depends(get_current_user)
+        current_user=Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        investment_service = ServiceFactory.create_investment_service(db_session)
+        investment_service = ServiceFactory.create_investment_service(db_session, ownership)
         return investment_service.find_by_code(current_user.code, portfolio_code, investment_code)
     except InvestmentNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
@@ -72,11 +79,13 @@ async def get_investment(
 
 
 @router.get("/{portfolio_code}/investments", response_model=List[InvestmentModel])
-async def get_all_investments(
+@run_in_session
+def get_all_investments(
         portfolio_code: str,
         order_by: str = None,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     """
     Recupera todos os investimentos associados a um determinado código de portfólio.
@@ -101,7 +110,7 @@ async def get_all_investments(
     proporcionando uma resposta apropriada ao cliente.
     """
     try:
-        investment_service = ServiceFactory.create_investment_service(db_session)
+        investment_service = ServiceFactory.create_investment_service(db_session, ownership)
         result = investment_service.find_all(current_user.code, portfolio_code, order_by)
         return result
     except InvestmentNotFound as e:
@@ -116,14 +125,16 @@ async def get_all_investments(
 
 
 @router.delete("/{portfolio_code}/investments/{investment_code}")
-async def delete_investment(
+@run_in_session
+def delete_investment(
         portfolio_code: str,
         investment_code: str,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        investment_service = ServiceFactory.create_investment_service(db_session)
+        investment_service = ServiceFactory.create_investment_service(db_session, ownership)
         investment_service.delete(current_user.code, portfolio_code, investment_code)
         return {"message": "Investment deleted successfully"}
     except InvestmentNotFound as e:
@@ -135,15 +146,17 @@ async def delete_investment(
 
 
 @router.put("/{portfolio_code}/investments/{investment_code}", response_model=InvestmentModel)
-async def update_investment(
+@run_in_session
+def update_investment(
         portfolio_code: str,
         investment_code: str,
         investment_data: InvestmentModel,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        investment_service = ServiceFactory.create_investment_service(db_session)
+        investment_service = ServiceFactory.create_investment_service(db_session, ownership)
         return investment_service.update(current_user.code, portfolio_code, investment_code, investment_data)
     except OperationNotPermittedError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
@@ -154,13 +167,15 @@ async def update_investment(
 
 
 @router.get("/{portfolio_code}/investments-diversification", response_model=List[AssetTypeValue])
-async def get_diversification_portfolio(
+@run_in_session
+def get_diversification_portfolio(
         portfolio_code: str,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        investment_service = ServiceFactory.create_investment_service(db_session)
+        investment_service = ServiceFactory.create_investment_service(db_session, ownership)
         result = investment_service.get_diversification_portfolio(current_user.code, portfolio_code)
         return [AssetTypeValue(asset_type=asset, value=value) for asset, value in result.items()]
     except PortfolioNotFound | InvestmentNotFound as e:
@@ -170,12 +185,14 @@ async def get_diversification_portfolio(
 
 
 @router.get("/portfolio-consolidation/{portfolio_code}", response_model=PortfolioOverviewModel)
-async def get_portfolio_consolidation(
+@run_in_session
+def get_portfolio_consolidation(
         portfolio_code: str,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
-    investment_service = ServiceFactory.create_investment_service(db_session)
+    investment_service = ServiceFactory.create_investment_service(db_session, ownership)
     portfolio_overview = investment_service.get_portfolio_overview(
         current_user.code, portfolio_code
     )
@@ -185,13 +202,15 @@ async def get_portfolio_consolidation(
 
 
 @router.put("/{portfolio_code}/investments-prices")
-async def update_investments_prices(
+@run_in_session
+def update_investments_prices(
         portfolio_code: str,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        investment_service = ServiceFactory.create_investment_service(db_session)
+        investment_service = ServiceFactory.create_investment_service(db_session, ownership)
         investment_service.update_stock_price(current_user.code, portfolio_code)
         return {"message": "Investment price updated successfully"}
     except PortfolioNotFound | InvestmentNotFound as e:
@@ -5,6 +5,7 @@ from fastapi import HTTPException, status, APIRouter
 from pydantic import BaseModel
 
 from auth.user import User, get_current_user
+from database import run_in_session
 from investment.domain.models import PortfolioModel
 from investment.domain.portfolio_erros import PortfolioNotFound, PortfolioAlreadyExists
 from investment.repository.db.db_connection import get_db_session
@@ -19,7 +20,8 @@ class NewPortfolioInput(BaseModel):
 
 
 @router.get("", response_model=List[PortfolioModel])
-async def get_all_portfolios(
+@run_in_session
+def get_all_portfolios(
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
 ):
@@ -31,7 +33,8 @@ async def get_all_portfolios(
 
 
 @router.get("/{portfolio_code}", response_model=PortfolioModel)
-async def get_portfolio(
+@run_in_session
+def get_portfolio(
         portfolio_code: str,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
@@ -47,7 +50,8 @@ async def get_portfolio(
 
 
 @router.post("", response_model=PortfolioModel)
-async def create_portfolio(
+@run_in_session
+def create_portfolio(
         input: NewPortfolioInput,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
@@ -66,7 +70,8 @@ async def create_portfolio(
 
 
 @router.put("/{portfolio_code}", response_model=PortfolioModel)
-async def update_portfolio(
+@run_in_session
+def update_portfolio(
         portfolio_code: str,
         portfolio_input: PortfolioModel,
         db_session=Depends(get_db_session),
@@ -82,7 +87,8 @@ async def update_portfolio(
 
 
 @router.delete("/{portfolio_code}")
-async def delete_portfolio(
+@run_in_session
+def delete_portfolio(
         portfolio_code: str,
         db_session=Depends(get_db_session),
         current_user: User = Depends(get_current_user)
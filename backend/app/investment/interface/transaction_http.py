@@ -2,19 +2,25 @@ from datetime import date
 from typing import List
 
 from fastapi import Depends
-from fastapi import HTTPException, status, APIRouter
-from pydantic import BaseModel
+from fastapi import HTTPException, Response, status, APIRouter
+from pydantic import BaseModel, TypeAdapter
 
 from auth.user import get_current_user, User
+from database import run_in_session
 from investment.domain.investment_errors import InvestmentNotFound
 from investment.domain.models import TransactionType, TransactionModel
 from investment.domain.portfolio_erros import PortfolioNotFound
 from investment.domain.transaction_errors import TransactionNotFound, TransactionOperationNotPermitted
+from investment.interface.dependencies import get_ownership
 from investment.repository.db.db_connection import get_db_session
 from investment.services.service_factory import ServiceFactory
+from ownership import OwnershipContext
 
 router = APIRouter()
 
+# Ver finance/interface/financial_transaction_http.py: a listagem devolve o JSON pronto.
+transactions_json = TypeAdapter(List[TransactionModel])
+
 
 class NewTransactionInput(BaseModel):
     investment_code: str
@@ -26,45 +32,53 @@ class NewTransactionInput(BaseModel):
 
 @router.get("/{portfolio_code}/investments/{investment_code}/transactions",
             response_model=List[TransactionModel])
-async def get_all_transactions(
+@run_in_session
+def get_all_transactions(
         portfolio_code,
         investment_code,
         db_session=Depends(get_db_session),
-        current_user=Depends(get_current_user)
+        current_user=Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        transactions_service = ServiceFactory.create_transaction_service(db_session)
-        return transactions_service.find_all(portfolio_code, investment_code)
+        ownership.check_portfolio(portfolio_code)
+        transactions_service = ServiceFactory.create_transaction_service(db_session, ownership)
+        transactions = transactions_service.find_all(portfolio_code, investment_code)
+        return Response(transactions_json.dump_json(transactions), media_type="application/json")
     except (InvestmentNotFound, PortfolioNotFound) as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
 @router.get("/{portfolio_code}/investments/{investment_code}/transactions/{transaction_code}",
             response_model=TransactionModel)
-async def get_transaction(
+@run_in_session
+def get_transaction(
         portfolio_code,
         investment_code,
         transaction_code,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        transactions_service = ServiceFactory.create_transaction_service(db_session)
+        transactions_service = ServiceFactory.create_transaction_service(db_session, ownership)
         return transactions_service.find_by_code(current_user.code, portfolio_code, investment_code, transaction_code)
     except (InvestmentNotFound, PortfolioNotFound, TransactionNotFound) as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
 @router.post("/{portfolio_code}/investments/{investment_code}/transactions", response_model=TransactionModel)
-async def create_transaction(
+@run_in_session
+def create_transaction(
         portfolio_code,
         investment_code,
         input_new_transaction: NewTransactionInput,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        transactions_service = ServiceFactory.create_transaction_service(db_session)
+        transactions_service = ServiceFactory.create_transaction_service(db_session, ownership)
         transaction_model = TransactionModel(code=None, **input_new_transaction.model_dump())
         return transactions_service.create(current_user.code, portfolio_code, investment_code, transaction_model)
     except TransactionOperationNotPermitted as e:
@@ -75,15 +89,17 @@ async def create_transaction(
 
 
 @router.delete("/{portfolio_code}/investments/{investment_code}/transactions/{transaction_code}")
-async def delete_transaction(
+@run_in_session
+def delete_transaction(
         portfolio_code,
         investment_code,
         transaction_code,
         db_session=Depends(get_db_session),
-        current_user: User = Depends(get_current_user)
+        current_user: User = Depends(get_current_user),
+        ownership: OwnershipContext = Depends(get_ownership)
 ):
     try:
-        transactions_service = ServiceFactory.create_transaction_service(db_session)
+        transactions_service = ServiceFactory.create_transaction_service(db_session, ownership)
         transaction_model = transactions_service.find_by_code(current_user.code, portfolio_code, investment_code, transaction_code)
         transactions_service.delete(current_user.code, portfolio_code, investment_code, transaction_model)
         return {"message": "Transaction deleted successfully"}
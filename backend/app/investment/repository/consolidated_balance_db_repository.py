@@ -1,11 +1,11 @@
-from datetime import date
 from typing import List, Optional
 
 from sqlalchemy import Date
-from sqlalchemy.exc import SQLAlchemyError, NoResultFound
+from sqlalchemy.exc import SQLAlchemyError
 
+from database import upsert
 from investment.domain.consolidated_balance_errors import ConsolidatedPortfolioDatabaseError, \
-    ConsolidatedPortfolioUnexpectedError, ConsolidatedPortfolioNotFound
+    ConsolidatedPortfolioUnexpectedError
 from investment.domain.models import ConsolidatedPortfolioModel
 from investment.repository.db.db_entities import ConsolidatedPortfolio
 
@@ -53,42 +53,19 @@ class ConsolidatedBalanceRepo:
         except Exception:
             raise ConsolidatedPortfolioUnexpectedError()
 
-    def __get_consolidated_portfolio(
-            self, session, portfolio_code: str, date: date
-    ) -> ConsolidatedPortfolio:
-        try:
-            consolidated_portfolio = session.query(ConsolidatedPortfolio) \
-                .filter(ConsolidatedPortfolio.date == date) \
-                .filter(ConsolidatedPortfolio.portfolio_code == portfolio_code) \
-                .one()
-            return consolidated_portfolio
-        except NoResultFound:
-            raise ConsolidatedPortfolioNotFound()
-        except SQLAlchemyError:
-            raise ConsolidatedPortfolioDatabaseError()
-        except Exception:
-            raise ConsolidatedPortfolioUnexpectedError()
-
     def create_or_update(
             self,
             cpm: ConsolidatedPortfolioModel
     ) -> ConsolidatedPortfolioModel:
         session = self.session
         try:
-            result = self.__get_consolidated_portfolio(session, cpm.portfolio_code, date.today())
-            consolidated_portfolio = result
-            consolidated_portfolio.balance = cpm.balance
-            consolidated_portfolio.amount_invested = cpm.amount_invested
-            session.refresh(consolidated_portfolio)
-            return to_model(consolidated_portfolio)
-        except ConsolidatedPortfolioNotFound:
-            consolidated_portfolio = to_database(cpm)
-            session.add(consolidated_portfolio)
-            to_model(consolidated_portfolio)
-            return to_model(consolidated_portfolio)
+            upsert(session, ConsolidatedPortfolio, cpm.model_dump(), key_columns=["portfolio_code", "date"],
+                   update_columns=["balance", "amount_invested"])
+            session.commit()
+            return cpm
         except SQLAlchemyError:
+            session.rollback()
             raise ConsolidatedPortfolioDatabaseError()
-        except Exception as e:
-            raise ConsolidatedPortfolioUnexpectedError
-        finally:
-            session.commit()
+        except Exception:
+            session.rollback()
+            raise ConsolidatedPortfolioUnexpectedError()
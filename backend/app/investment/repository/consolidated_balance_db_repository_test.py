@@ -2,13 +2,14 @@ from datetime import date, timedelta
 from unittest.mock import Mock
 
 import pytest
-from sqlalchemy.exc import SQLAlchemyError, NoResultFound
+from sqlalchemy.exc import SQLAlchemyError
 
 from investment.domain.consolidated_balance_errors import ConsolidatedPortfolioDatabaseError, \
     ConsolidatedPortfolioUnexpectedError
 from investment.domain.models import ConsolidatedPortfolioModel
 from investment.repository.consolidated_balance_db_repository import ConsolidatedBalanceRepo, \
-    ConsolidatedPortfolio, to_database
+    ConsolidatedPortfolio
+from investment.repository.prepareto_db_test import db_session
 
 
 # from .your_module import ConsolidatedBalancePortfolio, ConsolidatedBalanceRepo, to_database
@@ -66,49 +67,36 @@ def test_filter_by_date_range_unexpected_error(repo, mock_session):
         result = repo.filter_by_date_range(portfolio_code='001', start_date=date.today(), end_date=date.today())
 
 
-# Create method tests
-# Test for the 'create' method success scenario
-def test_create_success(repo, mock_session):
-    # Arrange
+# create_or_update tests
+def test_create_success(db_session):
     test_model = ConsolidatedPortfolioModel(
         portfolio_code='001',
         date=date.today(),
         balance=1000.0,
         amount_invested=1000.0
     )
-    repo.__get_consolidated_portfolio = Mock()
 
-    mock_session.query.return_value.filter.return_value.filter.return_value.one.side_effect = NoResultFound()
+    result = ConsolidatedBalanceRepo(db_session).create_or_update(test_model)
 
-    # Act
-    result = repo.create_or_update(test_model)
-    # Assert
-    assert isinstance(result, ConsolidatedPortfolioModel)
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_called_once()
+    assert result == test_model
+    saved = db_session.query(ConsolidatedPortfolio).one()
+    assert (saved.portfolio_code, saved.date, saved.balance) == ('001', date.today(), 1000.0)
 
 
-# Update method tests
-def test_update_success(repo, mock_session):
-    # Arrange
-    test_model = ConsolidatedPortfolioModel(
-        portfolio_code='001',
-        date=date.today(),
-        balance=1000.0,
-        amount_invested=1000.0
-    )
-    repo.__get_consolidated_portfolio = Mock()
+def test_create_or_update_same_key_twice_updates(db_session):
+    repo = ConsolidatedBalanceRepo(db_session)
+    repo.create_or_update(ConsolidatedPortfolioModel(
+        portfolio_code='001', date=date.today(), balance=1000.0, amount_invested=1000.0
+    ))
 
-    mock_session.query.return_value.filter.return_value.filter.return_value.one.return_value = to_database(
-        test_model)
+    # Segunda consolidação do dia (ex.: POST repetido): atualiza a mesma linha em vez de violar o índice único.
+    result = repo.create_or_update(ConsolidatedPortfolioModel(
+        portfolio_code='001', date=date.today(), balance=1200.0, amount_invested=1100.0
+    ))
 
-    # Act
-    result = repo.create_or_update(test_model)
-    # Assert
-    assert isinstance(result, ConsolidatedPortfolioModel)
-    assert mock_session.add.call_count == 0
-    mock_session.commit.assert_called_once()
-    mock_session.refresh.assert_called_once()
+    assert result.balance == 1200.0
+    saved = db_session.query(ConsolidatedPortfolio).populate_existing().one()
+    assert (saved.balance, saved.amount_invested) == (1200.0, 1100.0)
 
 
 # Test for the 'create' method when a SQLAlchemyError occurs
@@ -120,13 +108,12 @@ def test_create_or_update_database_error(repo, mock_session):
         balance=1000.0,
         amount_invested=1000.0
     )
+    mock_session.get_bind.return_value.dialect.name = "sqlite"
+    mock_session.execute.side_effect = SQLAlchemyError("Erro Teste")
 
-    mock_session.query.return_value.filter.return_value.filter.return_value.one.return_value = to_database(
-        test_model)
-    mock_session.refresh.side_effect = SQLAlchemyError("Erro Teste")
-    #Todo verificar
     with pytest.raises(ConsolidatedPortfolioDatabaseError):
         repo.create_or_update(test_model)
+    mock_session.rollback.assert_called_once()
 
 
 # Test for the 'create' method when an unexpected Exception occurs
@@ -138,6 +125,7 @@ def test_create_or_update_unexpected_error(repo, mock_session):
         balance=1000.0,
         amount_invested=1000.0
     )
-    mock_session.add.side_effect = Exception("Unexpected Error")
+    mock_session.get_bind.return_value.dialect.name = "sqlite"
+    mock_session.execute.side_effect = Exception("Unexpected Error")
     with pytest.raises(ConsolidatedPortfolioUnexpectedError):
         repo.create_or_update(test_model)
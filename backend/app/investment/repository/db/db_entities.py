@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Float, Date, Integer, String, Text
+from sqlalchemy import Column, Float, Date, Index, Integer, String, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy_mixins import AllFeaturesMixin
 
+from money import money_type, price_type
+
 Base = declarative_base()
 
 
@@ -17,18 +19,22 @@ class Investment(Base, AllFeaturesMixin):
     asset_type = Column(String)
     ticker = Column(String)
     quantity = Column(Float)
-    purchase_price = Column(Float)
-    current_average_price = Column(Float)
+    purchase_price = Column(price_type())
+    current_average_price = Column(price_type())
     purchase_date = Column(Date)
 
 
 class ConsolidatedPortfolio(Base, AllFeaturesMixin):
     __tablename__ = 'investments_consolidated_balance_portfolios'
+    __table_args__ = (
+        Index('ux_investments_consolidated_balance_portfolios_portfolio_code_date', 'portfolio_code', 'date',
+              unique=True),
+    )
     id = Column(Integer, primary_key=True)
     portfolio_code = Column(String)
     date = Column(Date)
-    balance = Column(Float)
-    amount_invested = Column(Float)
+    balance = Column(money_type())
+    amount_invested = Column(money_type())
 
 
 class Portfolio(Base, AllFeaturesMixin):
@@ -37,15 +43,19 @@ class Portfolio(Base, AllFeaturesMixin):
     code = Column(String, unique=True, index=True)
     name = Column(String, index=True)
     description = Column(Text, nullable=True)
-    user_code = Column(Text)
+    user_code = Column(Text, index=True)
 
 
 class Transaction(Base, AllFeaturesMixin):
     __tablename__ = 'investments_transactions'
+    __table_args__ = (
+        # find_all(): por investment_code, ordenado por (date, id).
+        Index('ix_investments_transactions_investment_code_date_id', 'investment_code', 'date', 'id'),
+    )
     id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    code = Column(String(10), index=True)
-    investment_code = Column(String(10), index=True)
+    code = Column(String(26), index=True)
+    investment_code = Column(String(26), index=True)
     type = Column(String)
     date = Column(Date, index=True)
     quantity = Column(Integer)
-    price = Column(Float)
+    price = Column(price_type())
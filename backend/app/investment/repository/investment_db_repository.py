@@ -1,4 +1,4 @@
-from sqlalchemy import text
+from sqlalchemy import func, select, type_coerce
 from sqlalchemy.exc import NoResultFound
 
 from helpers import generate_code
@@ -120,11 +120,15 @@ class InvestmentRepo:
     def get_diversification_portfolio(self, portfolio_code):
         session = self.session
         try:
-            query = text(
-                'SELECT asset_type, SUM(quantity * current_average_price) AS total_weight '
-                'FROM investments WHERE portfolio_code = :portfolio_code GROUP BY asset_type'
+            # type_coerce aplica a conversão da coluna de dinheiro (centavos) ao SUM.
+            total_weight = type_coerce(
+                func.sum(Investment.quantity * Investment.current_average_price),
+                Investment.current_average_price.type
             )
-            result = session.execute(query, {"portfolio_code": portfolio_code}).fetchall()
+            query = select(Investment.asset_type, total_weight) \
+                .where(Investment.portfolio_code == portfolio_code) \
+                .group_by(Investment.asset_type)
+            result = session.execute(query).fetchall()
             if not result:
                 raise NoAssetsFound()
             diversification_portfolio = {row[0]: row[1] for row in result}
@@ -5,6 +5,7 @@ from helpers import generate_code
 from investment.domain.models import PortfolioModel
 from investment.domain.portfolio_erros import PortfolioNotFound, PortfolioUnexpectedError
 from investment.repository.db.db_entities import Portfolio
+from repository_cache import cached_by_user, repository_cache
 
 
 def to_database(portfolio_model: PortfolioModel) -> Portfolio:
@@ -41,6 +42,7 @@ class PortfolioRepo:
             )
             session.add(portfolio)
             session.commit()
+            repository_cache.bump(user_code)
             session.refresh(portfolio)
             return to_model(portfolio)
         except Exception as e:
@@ -56,6 +58,7 @@ class PortfolioRepo:
             portfolio.name = updated_portfolio.name
             portfolio.description = updated_portfolio.description
             session.commit()
+            repository_cache.bump(user_code)
             session.refresh(portfolio)
             return to_model(portfolio)
         except NoResultFound:
@@ -65,6 +68,7 @@ class PortfolioRepo:
             session.rollback()
             raise PortfolioUnexpectedError()
 
+    @cached_by_user("portfolios:find_all")
     def find_all(self, user_code: str):
         session = self.session
         try:
@@ -74,6 +78,15 @@ class PortfolioRepo:
         except SQLAlchemyError:
             raise PortfolioUnexpectedError()
 
+    @cached_by_user("portfolios:find_codes_by_user")
+    def find_codes_by_user(self, user_code: str) -> set:
+        try:
+            rows = self.session.query(Portfolio.code).filter(Portfolio.user_code == user_code).all()
+            return {code for code, in rows}
+        except SQLAlchemyError:
+            raise PortfolioUnexpectedError()
+
+    @cached_by_user("portfolios:find_by_code")
     def find_by_code(self, user_code: str, portfolio_code) -> PortfolioModel:
         session = self.session
         try:
@@ -96,6 +109,7 @@ class PortfolioRepo:
             ).one()
             session.delete(portfolio)
             session.commit()
+            repository_cache.bump(user_code)
         except NoResultFound:
             raise PortfolioNotFound()
         except SQLAlchemyError as e:
@@ -12,6 +12,7 @@ from auth.user import User, get_current_user
 from investment.repository.db.db_connection import get_db_session
 from investment.repository.db.db_entities import Base, Portfolio, ConsolidatedPortfolio, Transaction
 from investment.repository.investment_db_repository import Investment
+from repository_cache import repository_cache
 
 
 @pytest.fixture(scope="function")
@@ -25,6 +26,7 @@ def db_session():
     Base.metadata.create_all(bind=engine)
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
     db = TestingSessionLocal()
+    repository_cache.clear()
     try:
         yield db
     finally:
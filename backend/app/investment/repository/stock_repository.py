@@ -1,8 +1,11 @@
 import asyncio
+import time
 
-import requests
 from pydantic import BaseModel, ValidationError
 
+from database import run_blocking
+from metrics import external_api_latency
+
 
 class ApiResult(BaseModel):
     regular_market_price: float
@@ -18,6 +21,9 @@ class BrApiDevRepository:
         self.api_key = api_key
 
     def get_price(self, symbol: str) -> float:
+        # requests é importado sob demanda: custa ~100ms na subida e só é usado aqui.
+        import requests
+
         # Ensure the symbol format is valid
         symbol_w_suffix = str(symbol)
 
@@ -29,17 +35,23 @@ class BrApiDevRepository:
         # Define the API URL with the symbol and API key
         url = f"https://brapi.dev/api/quote/{symbol_w_suffix}?token={api_key}"
 
+        start = time.perf_counter()
+        outcome = "error"
         try:
             # Asynchronously send a GET request to the API and obtain the response body as a string
-            response = requests.get(url)
+            # run_blocking: com DB_ASYNC=true este código roda na thread do event loop.
+            response = run_blocking(requests.get, url)
             response.raise_for_status()
             regular_market_price = response.json()["results"][0]['regularMarketPrice']
+            outcome = "ok"
 
             # Parse the price from the StockData and return it
             return regular_market_price
         except (requests.RequestException, ValidationError) as e:
             print(f"Error during request: {e}")
             raise
+        finally:
+            external_api_latency.observe(time.perf_counter() - start, "brapi", outcome)
 
 
 # Example usage:
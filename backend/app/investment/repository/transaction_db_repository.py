@@ -1,9 +1,10 @@
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.exc import MultipleResultsFound
 from sqlalchemy.orm.exc import NoResultFound
 
 from helpers import generate_code
-from investment.domain.models import TransactionModel
+from investment.domain.models import TransactionModel, TransactionType
 from investment.domain.transaction_errors import TransactionNotFound, TransactionUnexpectedError
 from investment.repository.db.db_entities import Transaction
 from investment.repository.investment_db_repository import InvestmentRepo
@@ -22,16 +23,31 @@ def to_database(transaction_model: TransactionModel) -> Transaction:
 
 
 def to_model(transaction: Transaction) -> TransactionModel:
-    return TransactionModel(
+    # Valores do banco já têm os tipos do modelo; aceita a entidade ou uma linha com as COLUMNS.
+    return TransactionModel.model_construct(
         code=transaction.code,
         investment_code=transaction.investment_code,
-        type=transaction.type,
+        type=TransactionType(transaction.type),
         date=transaction.date,
         quantity=transaction.quantity,
         price=transaction.price
     )
 
 
+COLUMNS = (
+    Transaction.code,
+    Transaction.investment_code,
+    Transaction.type,
+    Transaction.date,
+    Transaction.quantity,
+    Transaction.price,
+)
+
+
+def select_by_code(transaction_code: str):
+    return lambda_stmt(lambda: select(Transaction).where(Transaction.code == transaction_code))
+
+
 class TransactionRepo:
     def __init__(self, session):
         self.session = session
@@ -59,7 +75,7 @@ class TransactionRepo:
     def update(self, transaction_code, updated_transaction_model: TransactionModel):
         session = self.session
         try:
-            transaction = session.query(Transaction).filter(Transaction.code == transaction_code).one()
+            transaction = session.execute(select_by_code(transaction_code)).scalar_one()
 
             transaction.investment_code = updated_transaction_model.investment_code
             transaction.type = updated_transaction_model.type.value
@@ -81,10 +97,12 @@ class TransactionRepo:
         session = self.session
         try:
             inv = InvestmentRepo(session).find_by_portf_investment_code(portfolio_code, investment_code)
-            transactions = session.query(Transaction).filter(
-                Transaction.investment_code == inv.code,
-            ).order_by(Transaction.date.desc(), Transaction.id.desc()).all()
-            return [to_model(transaction) for transaction in transactions]
+            investment_code = inv.code
+            rows = session.execute(lambda_stmt(
+                lambda: select(*COLUMNS).where(Transaction.investment_code == investment_code)
+                .order_by(Transaction.date.desc(), Transaction.id.desc())
+            ))
+            return [to_model(row) for row in rows]
         except NoResultFound:
             return []
         except SQLAlchemyError:
@@ -93,7 +111,7 @@ class TransactionRepo:
     def find_by_code(self, transaction_code) -> TransactionModel:
         session = self.session
         try:
-            transaction = session.query(Transaction).filter(Transaction.code == transaction_code).one()
+            transaction = session.execute(select_by_code(transaction_code)).scalar_one()
             return to_model(transaction)
         except NoResultFound as e:
             raise TransactionNotFound()
@@ -103,7 +121,7 @@ class TransactionRepo:
     def delete(self, transaction_code):
         session = self.session
         try:
-            transaction = session.query(Transaction).filter(Transaction.code == transaction_code).one()
+            transaction = session.execute(select_by_code(transaction_code)).scalar_one()
             session.delete(transaction)
             session.commit()
         except (NoResultFound, MultipleResultsFound) as e:
@@ -39,7 +39,7 @@ def test_create_transaction(session):
     created_portfolio = repo.create(new_transaction)
 
     assert created_portfolio is not None
-    assert len(created_portfolio.code) == 10
+    assert len(created_portfolio.code) == 26
 
     try:
         session.query(Transaction).filter(Transaction.code == created_portfolio.code).one()
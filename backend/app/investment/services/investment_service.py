@@ -1,5 +1,4 @@
 from datetime import date
-from decimal import Decimal
 from typing import List
 
 from constants import SUCCESS_RESULT
@@ -10,18 +9,27 @@ from investment.domain.transaction_errors import TransactionInvalidType, Transac
 from investment.repository.investment_db_repository import InvestmentRepo
 from investment.repository.portfolio_db_repository import PortfolioRepo
 from investment.repository.transaction_db_repository import TransactionRepo
+from money import from_cents, to_cents
+from ownership import OwnershipContext
 
 
 class InvestmentService:
     def __init__(self, portfolio_repo: PortfolioRepo, investment_repo: InvestmentRepo,
-                 stock_repo, transaction_repo: TransactionRepo = None):
+                 stock_repo, transaction_repo: TransactionRepo = None, ownership: OwnershipContext = None):
         self.portfolio_repo: PortfolioRepo = portfolio_repo
         self.investment_repo: InvestmentRepo = investment_repo
         self.stock_repo = stock_repo
         self.transaction_repo: TransactionRepo = transaction_repo
+        self.ownership = ownership
+
+    def check_portfolio(self, user_code: str, portfolio_code: str):
+        if self.ownership is not None and self.ownership.is_owner(user_code):
+            self.ownership.check_portfolio(portfolio_code)
+        else:
+            self.portfolio_repo.find_by_code(user_code, portfolio_code)
 
     def create(self, user_code: str, new_investment: InvestmentModel) -> InvestmentModel:
-        self.portfolio_repo.find_by_code(user_code, new_investment.portfolio_code)
+        self.check_portfolio(user_code, new_investment.portfolio_code)
         created_investment = self.investment_repo.create(new_investment)
 
         # Criar transaction
@@ -40,8 +48,8 @@ class InvestmentService:
         return created_investment
 
     def find_by_code(self, user_code: str, portfolio_code: str, code: str) -> InvestmentModel:
-        portfolio = self.portfolio_repo.find_by_code(user_code, portfolio_code)
-        return self.investment_repo.find_by_portf_investment_code(portfolio.code, code)
+        self.check_portfolio(user_code, portfolio_code)
+        return self.investment_repo.find_by_portf_investment_code(portfolio_code, code)
 
     def find_all(
             self, user_code: str, portfolio_code: str, order_by: str = None
@@ -60,11 +68,11 @@ class InvestmentService:
         - If the portfolio does not exist, it returns an error indicating that the portfolio was not found.
         - If a database error occurs, it returns a generic database error.
         """
-        self.portfolio_repo.find_by_code(user_code, portfolio_code)
+        self.check_portfolio(user_code, portfolio_code)
         return self.investment_repo.find_all_by_portfolio_code(portfolio_code, order_by)
 
     def delete(self, user_code: str, portfolio_code: str, investment_code: str):
-        self.portfolio_repo.find_by_code(user_code, portfolio_code)
+        self.check_portfolio(user_code, portfolio_code)
         return self.investment_repo.delete(portfolio_code, investment_code)
 
     def update(
@@ -74,7 +82,7 @@ class InvestmentService:
             investment_code: str,
             updated_investment: InvestmentModel
     ) -> InvestmentModel:
-        self.portfolio_repo.find_by_code(user_code, portfolio_code)
+        self.check_portfolio(user_code, portfolio_code)
         if investment_code != updated_investment.code:
             raise OperationNotPermittedError()
         return self.investment_repo.update(portfolio_code, investment_code, updated_investment)
@@ -84,19 +92,22 @@ class InvestmentService:
             portfolio = self.portfolio_repo.find_by_code(user_code, portfolio_code)
             investments = self.investment_repo.find_all_by_portfolio_code(portfolio_code)
 
-            amount_invested = Decimal(0.0)
-            current_balance = Decimal(0.0)
-            portfolio_yield = Decimal(0.0)
-            portfolio_gross_nominal_yield = Decimal(0.0)
-
-            for investment in investments:
-                amount_invested += Decimal(investment.purchase_price * investment.quantity)
-                if investment.current_average_price:
-                    current_balance += Decimal(investment.current_average_price * investment.quantity)
-
-            if len(investments) > 0 and amount_invested > 0:
-                portfolio_yield = (current_balance - amount_invested) / amount_invested * 100
-                portfolio_gross_nominal_yield = current_balance - amount_invested
+            # Somas exatas em centavos (inteiros), sem Decimal.
+            amount_invested_cents = sum(
+                to_cents(investment.purchase_price * investment.quantity) for investment in investments
+            )
+            current_balance_cents = sum(
+                to_cents(investment.current_average_price * investment.quantity)
+                for investment in investments if investment.current_average_price
+            )
+            portfolio_yield = 0.0
+            portfolio_gross_nominal_yield = 0.0
+            if len(investments) > 0 and amount_invested_cents > 0:
+                gain_cents = current_balance_cents - amount_invested_cents
+                portfolio_yield = gain_cents / amount_invested_cents * 100
+                portfolio_gross_nominal_yield = from_cents(gain_cents)
+            amount_invested = from_cents(amount_invested_cents)
+            current_balance = from_cents(current_balance_cents)
 
             consolidation = PortfolioOverviewModel(
                 code=portfolio.code,
@@ -114,7 +125,7 @@ class InvestmentService:
             raise UnexpectedError()
 
     def get_diversification_portfolio(self, user_code: str, portfolio_code: str):
-        self.portfolio_repo.find_by_code(user_code, portfolio_code)
+        self.check_portfolio(user_code, portfolio_code)
         return self.investment_repo.get_diversification_portfolio(portfolio_code)
 
     def update_stock_price(self, user_code: str, portfolio_code: str):
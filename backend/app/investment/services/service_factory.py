@@ -4,6 +4,7 @@ from investment.services.consolidated_service import ConsolidatedPortfolioServic
 from investment.services.investment_service import InvestmentService
 from investment.services.portfolio_service import PortfolioService
 from investment.services.transaction_service import TransactionService
+from ownership import OwnershipContext
 
 
 class ServiceFactory:
@@ -14,12 +15,17 @@ class ServiceFactory:
         return PortfolioService(portfolio_repo, investment_service)
 
     @staticmethod
-    def create_investment_service(session=None) -> InvestmentService:
+    def create_ownership_context(session, user_code: str) -> OwnershipContext:
+        portfolio_repo = RepositoryFactory.create_portfolio_repo(session)
+        return OwnershipContext(user_code, portfolio_loader=portfolio_repo.find_codes_by_user)
+
+    @staticmethod
+    def create_investment_service(session=None, ownership: OwnershipContext = None) -> InvestmentService:
         portfolio_repo = RepositoryFactory.create_portfolio_repo(session)
         investment_repo = RepositoryFactory.create_investment_repo(session)
         stock_repo = RepositoryFactory.create_stock_repo()
         transaction_repo = TransactionRepo(session)
-        return InvestmentService(portfolio_repo, investment_repo, stock_repo, transaction_repo)
+        return InvestmentService(portfolio_repo, investment_repo, stock_repo, transaction_repo, ownership)
 
     @staticmethod
     def create_consolidated_balance_service(session=None) -> ConsolidatedPortfolioService:
@@ -28,7 +34,7 @@ class ServiceFactory:
         return ConsolidatedPortfolioService(consolidated_balance_repo, investment_service)
 
     @staticmethod
-    def create_transaction_service(session=None) -> TransactionService:
-        investment_service = ServiceFactory.create_investment_service(session)
+    def create_transaction_service(session=None, ownership: OwnershipContext = None) -> TransactionService:
+        investment_service = ServiceFactory.create_investment_service(session, ownership)
         transaction_repo = TransactionRepo(session)
         return TransactionService(transaction_repo, investment_service)
@@ -0,0 +1,144 @@
+"""
+Detector de bloqueio do event loop (opt-in, LOOP_WATCHDOG_THRESHOLD_MS).
+
+Uma corrotina de batimento roda no loop a cada ``interval``; uma thread monitora o
+último batimento. Quando o loop fica parado mais que ``threshold_ms`` a thread
+captura a pilha da thread do loop naquele momento e identifica a rota pelo código
+do endpoint presente na pilha. Quando o loop volta, o batimento mede quanto tempo
+ficou bloqueado e contabiliza por rota. ``stats()`` expõe os totais; cada bloqueio
+é registrado no log com a pilha capturada.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+UNKNOWN_ROUTE = "<unknown>"
+
+logger = logging.getLogger("loop_watchdog")
+
+
+class LoopWatchdog:
+    def __init__(self, threshold_ms: float = 100.0, clock=time.monotonic):
+        self.threshold_ms = threshold_ms
+        self._clock = clock
+        self._code_routes: Dict = {}
+        self._lock = threading.Lock()
+        self._routes: Dict[str, dict] = {}
+        self._pending: Optional[tuple] = None
+        self._last_beat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._monitor: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def interval(self) -> float:
+        return self.threshold_ms / 1000 / 4
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat_task is not None
+
+    def register_endpoint(self, endpoint, label: str):
+        self._code_routes[endpoint.__code__] = label
+        wrapped = getattr(endpoint, "__wrapped__", None)
+        if wrapped is not None:
+            self.register_endpoint(wrapped, label)
+
+    def register_routes(self, app):
+        for route in app.routes:
+            endpoint = getattr(route, "endpoint", None)
+            if endpoint is None or not hasattr(endpoint, "__code__"):
+                continue
+            methods = ",".join(sorted(getattr(route, "methods", None) or ["*"]))
+            self.register_endpoint(endpoint, f"{methods} {route.path}")
+
+    async def start(self):
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = self._clock()
+        self._stopped.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._monitor = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._monitor.start()
+
+    async def stop(self):
+        if not self.running:
+            return
+        self._stopped.set()
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat_task = None
+        self._monitor.join()
+
+    async def _heartbeat(self):
+        while True:
+            expected = self._last_beat + self.interval
+            await asyncio.sleep(self.interval)
+            now = self._clock()
+            lag_ms = (now - expected) * 1000
+            with self._lock:
+                self._last_beat = now
+                pending, self._pending = self._pending, None
+            if lag_ms >= self.threshold_ms:
+                route, stack = pending if pending else (UNKNOWN_ROUTE, "")
+                self._record(route, lag_ms, stack)
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                blocked_ms = (self._clock() - self._last_beat - self.interval) * 1000
+                if blocked_ms < self.threshold_ms or self._pending is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                self._pending = (self._route_for(frame), "".join(traceback.format_stack(frame)))
+
+    def _route_for(self, frame) -> str:
+        innermost_app_frame = None
+        while frame is not None:
+            if frame.f_code in self._code_routes:
+                return self._code_routes[frame.f_code]
+            if innermost_app_frame is None and frame.f_code.co_filename.startswith(APP_DIR) \
+                    and "site-packages" not in frame.f_code.co_filename:
+                innermost_app_frame = frame
+            frame = frame.f_back
+        if innermost_app_frame is not None:
+            module = os.path.relpath(innermost_app_frame.f_code.co_filename, APP_DIR)
+            return f"{module}:{innermost_app_frame.f_code.co_name}"
+        return UNKNOWN_ROUTE
+
+    def _record(self, route: str, blocked_ms: float, stack: str):
+        with self._lock:
+            route_stats = self._routes.setdefault(route, {"count": 0, "blocked_ms": 0.0, "max_ms": 0.0})
+            route_stats["count"] += 1
+            route_stats["blocked_ms"] += blocked_ms
+            route_stats["max_ms"] = max(route_stats["max_ms"], blocked_ms)
+        logger.warning(f"Event loop blocked for {blocked_ms:.0f}ms in {route}\n{stack}")
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._pending = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "running": self.running,
+                "routes": {route: dict(route_stats) for route, route_stats in self._routes.items()},
+            }
+
+
+loop_watchdog = LoopWatchdog(float(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "100")))
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from loop_watchdog import UNKNOWN_ROUTE, LoopWatchdog
+
+
+def blocking_handler():
+    time.sleep(0.2)
+
+
+def blocking_helper():
+    time.sleep(0.2)
+
+
+async def run_with_watchdog(watchdog, blocking_fn):
+    await watchdog.start()
+    await asyncio.sleep(0.05)
+    blocking_fn()
+    await asyncio.sleep(0.05)
+    await watchdog.stop()
+
+
+def test_blocked_time_is_attributed_to_registered_route():
+    watchdog = LoopWatchdog(threshold_ms=50)
+    watchdog.register_endpoint(blocking_handler, "GET /slow")
+
+    asyncio.run(run_with_watchdog(watchdog, blocking_handler))
+
+    stats = watchdog.stats()
+    assert stats["running"] is False
+    route_stats = stats["routes"]["GET /slow"]
+    assert route_stats["count"] == 1
+    assert route_stats["blocked_ms"] >= 100
+    assert route_stats["max_ms"] == route_stats["blocked_ms"]
+
+
+def test_unregistered_code_falls_back_to_innermost_app_frame():
+    watchdog = LoopWatchdog(threshold_ms=50)
+
+    asyncio.run(run_with_watchdog(watchdog, blocking_helper))
+
+    assert list(watchdog.stats()["routes"]) == ["loop_watchdog_test.py:blocking_helper"]
+
+
+def test_wrapped_endpoints_are_registered_through_wrapped():
+    import functools
+
+    @functools.wraps(blocking_handler)
+    async def endpoint():
+        pass
+
+    watchdog = LoopWatchdog(threshold_ms=50)
+    watchdog.register_endpoint(endpoint, "POST /slow")
+
+    asyncio.run(run_with_watchdog(watchdog, blocking_handler))
+
+    assert watchdog.stats()["routes"]["POST /slow"]["count"] == 1
+
+
+def test_no_report_when_loop_is_not_blocked():
+    watchdog = LoopWatchdog(threshold_ms=50)
+
+    asyncio.run(run_with_watchdog(watchdog, lambda: None))
+
+    assert watchdog.stats()["routes"] == {}
+    assert UNKNOWN_ROUTE not in watchdog.stats()["routes"]
+
+
+def test_register_routes_uses_method_and_path():
+    from main_test import app
+
+    watchdog = LoopWatchdog(threshold_ms=50)
+    watchdog.register_routes(app)
+
+    labels = set(watchdog._code_routes.values())
+    assert "POST /users/signin" in labels
+    assert "GET,HEAD /docs" in labels
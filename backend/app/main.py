@@ -1,9 +1,56 @@
-from fastapi import FastAPI
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 
+from auth.service.services import PasswordService, UserServiceFactory
+from auth.service.token_keys import ASYMMETRIC_ALGORITHMS, get_token_key_ring
+import database
+from finance.repository.db.partitions import ensure_future_partitions
+from loop_watchdog import loop_watchdog
+import metrics
+from profiler import ProfilerMiddleware, profiler
+from query_counter import QueryCounterMiddleware
 from router import prepare_router
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if database.create_schema_on_startup():
+        # Fora do import: com DB_CREATE_SCHEMA=false (schema via alembic) a subida não executa DDL.
+        await run_in_threadpool(database.create_schema)
+    if database.engine is not None and database.engine.dialect.name == "postgresql":
+        # No-op se finances_transactions não for particionada. Uma falha aqui não derruba a
+        # subida: a partição DEFAULT recebe os lançamentos e o cron (create-partitions) tenta de novo.
+        try:
+            await run_in_threadpool(ensure_future_partitions, database.engine)
+        except Exception:
+            logger.exception("Could not create the future finances_transactions partitions")
+    PasswordService.configure_from_env()
+    # Segredos e chaves conferidos na subida: erro de configuração derruba o processo aqui,
+    # e as requisições já encontram os verificadores prontos.
+    UserServiceFactory.check_secrets()
+    if os.getenv("AUTH_TOKEN_ALGORITHM") in ASYMMETRIC_ALGORITHMS:
+        get_token_key_ring()
+    profiler.start_continuous()
+    watchdog_enabled = bool(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS"))
+    if watchdog_enabled:
+        loop_watchdog.register_routes(app)
+        await loop_watchdog.start()
+    yield
+    if watchdog_enabled:
+        await loop_watchdog.stop()
+    profiler.stop_continuous()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,6 +59,9 @@ app.add_middleware(
     allow_methods=["*"],  # Permite todos os métodos
     allow_headers=["*"],  # Permite todos os cabeçalhos
 )
+app.add_middleware(QueryCounterMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(ProfilerMiddleware)
 
 
 @app.get("/health")
@@ -19,4 +69,29 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+def check_profiler_token(x_profile_token: Optional[str] = Header(default=None)):
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiler.authorized(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profiler token")
+
+
+@app.get("/profiles/routes", response_class=PlainTextResponse, dependencies=[Depends(check_profiler_token)])
+async def route_profiles():
+    return PlainTextResponse(profiler.folded_routes())
+
+
+@app.get("/profiles/{profile_id}", response_class=PlainTextResponse, dependencies=[Depends(check_profiler_token)])
+async def request_profile(profile_id: str):
+    folded = profiler.profiles.get(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(folded)
+
+
 prepare_router(app)
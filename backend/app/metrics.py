@@ -0,0 +1,204 @@
+"""
+Métricas no formato de texto do Prometheus (GET /metrics).
+
+Sem dependência extra: histogramas e contadores simples, thread-safe, e coletores
+que leem os ``stats()`` dos singletons já existentes (cache de principals, pool do
+bcrypt, throttle de login, watchdog do event loop) e o pool do SQLAlchemy no
+momento da coleta.
+
+O ``MetricsMiddleware`` mede a latência por rota (o template da rota, não o path
+com parâmetros, para não explodir a cardinalidade) e o número de requisições em
+andamento.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _header(name: str, help_text: str, metric_type: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            series = self._series.setdefault(label_values, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def collect(self) -> List[str]:
+        lines = _header(self.name, self.help_text, "histogram")
+        with self._lock:
+            series_items = sorted((key, (list(buckets), total, count))
+                                  for key, (buckets, total, count) in self._series.items())
+        for label_values, (bucket_counts, total, count) in series_items:
+            labels = dict(zip(self.label_names, label_values))
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                lines.append(f"{self.name}_bucket{_labels({**labels, 'le': bound})} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_labels({**labels, 'le': '+Inf'})} {count}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(labels)} {count}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def collect(self) -> List[str]:
+        return _header(self.name, self.help_text, "gauge") + [f"{self.name} {self.value}"]
+
+
+def samples(name: str, help_text: str, metric_type: str, values: List[Tuple[Dict[str, str], float]]) -> List[str]:
+    return _header(name, help_text, metric_type) + [f"{name}{_labels(labels)} {value}" for labels, value in values]
+
+
+request_latency = Histogram(
+    "moneymint_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status")
+)
+requests_in_flight = Gauge("moneymint_http_requests_in_flight", "HTTP requests being processed.")
+external_api_latency = Histogram(
+    "moneymint_external_api_duration_seconds", "Latency of calls to external APIs.", ("api", "outcome")
+)
+
+
+def collect_pools() -> List[str]:
+    import database
+
+    engines = [("sync", database.engine)]
+    if database.async_engine is not None:
+        engines.append(("async", database.async_engine.sync_engine))
+    checked_out, overflow, size = [], [], []
+    for engine_name, engine in engines:
+        pool = getattr(engine, "pool", None)
+        if pool is None or not hasattr(pool, "checkedout"):
+            continue
+        labels = {"engine": engine_name}
+        checked_out.append((labels, pool.checkedout()))
+        overflow.append((labels, max(pool.overflow(), 0)))
+        size.append((labels, pool.size()))
+    return (samples("moneymint_db_pool_checked_out", "Connections checked out of the pool.", "gauge", checked_out)
+            + samples("moneymint_db_pool_overflow", "Overflow connections in use.", "gauge", overflow)
+            + samples("moneymint_db_pool_size", "Configured pool size.", "gauge", size))
+
+
+def collect_caches() -> List[str]:
+    from auth.principal_cache import principal_cache
+    from repository_cache import repository_cache
+
+    caches = {"principal": principal_cache.stats(), "repository": repository_cache.stats()}
+    return (samples("moneymint_cache_hits_total", "Cache hits.", "counter",
+                    [({"cache": name}, stats["hits"]) for name, stats in caches.items()])
+            + samples("moneymint_cache_misses_total", "Cache misses.", "counter",
+                      [({"cache": name}, stats["misses"]) for name, stats in caches.items()])
+            + samples("moneymint_cache_hit_ratio", "Cache hit ratio since start.", "gauge",
+                      [({"cache": name}, stats["hit_ratio"]) for name, stats in caches.items()]))
+
+
+def collect_auth() -> List[str]:
+    from auth.service.login_throttle import login_throttle
+    from auth.service.password_pool import password_pool
+
+    pool_stats = password_pool.stats()
+    throttle_stats = login_throttle.stats()
+    return (samples("moneymint_password_pool_queue_depth", "Password hashes waiting or running.", "gauge",
+                    [({}, pool_stats["queue_depth"])])
+            + samples("moneymint_password_pool_rejected_total", "Password hashes rejected (pool busy).", "counter",
+                      [({}, pool_stats["rejected"])])
+            + samples("moneymint_login_throttle_total", "Login attempts by throttle decision.", "counter",
+                      [({"decision": "allowed"}, throttle_stats["allowed"]),
+                       ({"decision": "rejected"}, throttle_stats["rejected"])]))
+
+
+def collect_loop_watchdog() -> List[str]:
+    from loop_watchdog import loop_watchdog
+
+    routes = loop_watchdog.stats()["routes"]
+    return (samples("moneymint_event_loop_blocked_total", "Event loop blocks by route.", "counter",
+                    [({"route": route}, stats["count"]) for route, stats in sorted(routes.items())])
+            + samples("moneymint_event_loop_blocked_seconds_total", "Time the event loop was blocked by route.",
+                      "counter",
+                      [({"route": route}, stats["blocked_ms"] / 1000) for route, stats in sorted(routes.items())]))
+
+
+collectors: List[Callable[[], List[str]]] = [
+    request_latency.collect,
+    requests_in_flight.collect,
+    external_api_latency.collect,
+    collect_pools,
+    collect_caches,
+    collect_auth,
+    collect_loop_watchdog,
+]
+
+
+def render() -> str:
+    lines = []
+    for collect in collectors:
+        lines.extend(collect())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_flight.dec()
+            route = scope.get("route")
+            request_latency.observe(time.perf_counter() - start, scope["method"],
+                                    route.path if route is not None else UNMATCHED_ROUTE, status["code"])
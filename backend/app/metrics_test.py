@@ -0,0 +1,86 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import metrics
+from auth.principal_cache import principal_cache
+
+
+def create_app():
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/items/{item_code}")
+    async def get_item(item_code: str):
+        return {"code": item_code, "in_flight": metrics.requests_in_flight.value}
+
+    return app
+
+
+def test_histogram_exposition():
+    histogram = metrics.Histogram("test_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+
+    lines = histogram.collect()
+
+    assert "# TYPE test_seconds histogram" in lines
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 2' in lines
+    assert 'test_seconds_count{route="/a"} 2' in lines
+
+
+def test_label_values_are_escaped():
+    assert metrics._labels({"route": 'a"b\\c'}) == '{route="a\\"b\\\\c"}'
+
+
+def test_middleware_records_latency_by_route_template():
+    metrics.request_latency.clear()
+    client = TestClient(create_app())
+
+    response = client.get("/items/ABC")
+    client.get("/missing")
+
+    assert response.json()["in_flight"] == 1
+    assert metrics.requests_in_flight.value == 0
+    lines = metrics.request_latency.collect()
+    assert 'moneymint_http_request_duration_seconds_count{method="GET",route="/items/{item_code}",status="200"} 1' \
+        in lines
+    assert f'moneymint_http_request_duration_seconds_count{{method="GET",route="{metrics.UNMATCHED_ROUTE}",' \
+           f'status="404"}} 1' in lines
+
+
+def test_metrics_endpoint():
+    from main import app
+
+    principal_cache.clear()
+    principal_cache.set("user", object())
+    principal_cache.get("user")
+    principal_cache.get("other")
+    client = TestClient(app)
+
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'moneymint_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert "moneymint_http_requests_in_flight 1" in body
+    assert 'moneymint_cache_hit_ratio{cache="principal"} 0.5' in body
+    assert "# TYPE moneymint_db_pool_checked_out gauge" in body
+    assert "# TYPE moneymint_external_api_duration_seconds histogram" in body
+    principal_cache.clear()
+
+
+def test_external_api_latency_is_recorded(mocker):
+    from investment.repository.stock_repository import BrApiDevRepository
+
+    metrics.external_api_latency.clear()
+    response = mocker.Mock()
+    response.json.return_value = {"results": [{"regularMarketPrice": 10.5}]}
+    mocker.patch("requests.get", return_value=response)
+
+    assert BrApiDevRepository("key").get_price("PETR4") == 10.5
+    assert 'moneymint_external_api_duration_seconds_count{api="brapi",outcome="ok"} 1' \
+        in metrics.external_api_latency.collect()
@@ -0,0 +1,62 @@
+"""
+Valores monetários.
+
+Com MONEY_STORAGE=cents as colunas de dinheiro são BIGINT em centavos (inteiros
+exatos): SUM/agregações no banco são exatas e a conversão para float acontece só na
+fronteira do banco, em ``MoneyCents``. O padrão (MONEY_STORAGE=float) mantém as
+colunas Float. O modo precisa corresponder ao schema: a migration 4a8b6d2f9e13
+converte as colunas quando rodada com MONEY_STORAGE=cents (ou ``-x money=cents``).
+
+Preços unitários e preços médios (``price_type``) usam PRICE_DIGITS casas: o preço
+médio é recalculado a cada compra, e arredondá-lo para centavos acumularia o erro
+no valor investido. Só os totais ficam em centavos.
+
+``to_cents``/``from_cents`` também servem para somar valores em memória como
+inteiros, sem Decimal.
+"""
+import os
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional
+
+from sqlalchemy import BigInteger, Float
+from sqlalchemy.types import TypeDecorator
+
+MONEY_STORAGE = os.getenv("MONEY_STORAGE", "float").lower()
+PRICE_DIGITS = 6
+
+
+def to_cents(value, digits: int = 2) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value * 10 ** digits
+    # str() usa a representação curta do float (0.1 -> "0.1"), então 0.29 vira 29 e não 28.
+    return int((Decimal(str(value)).scaleb(digits)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: Optional[int], digits: int = 2) -> Optional[float]:
+    return None if cents is None else cents / 10 ** digits
+
+
+class MoneyCents(TypeDecorator):
+    """Float on the Python side, exact int64 minor units in the database."""
+    impl = BigInteger
+    cache_ok = True
+
+    def __init__(self, digits: int = 2):
+        super().__init__()
+        self.digits = digits
+
+    def process_bind_param(self, value, dialect):
+        return to_cents(value, self.digits)
+
+    def process_result_value(self, value, dialect):
+        return from_cents(value, self.digits)
+
+
+def money_type(digits: int = 2):
+    return MoneyCents(digits) if MONEY_STORAGE == "cents" else Float()
+
+
+def price_type():
+    return money_type(PRICE_DIGITS)
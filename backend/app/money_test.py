@@ -0,0 +1,67 @@
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, func, insert, select, update
+
+from investment.services.transaction_service import TransactionService
+from money import PRICE_DIGITS, MoneyCents, from_cents, to_cents
+
+
+def test_to_cents_rounds_to_nearest_cent():
+    assert to_cents(0.29) == 29
+    assert to_cents(1.005) == 101
+    assert to_cents(-12.34) == -1234
+    assert to_cents(7) == 700
+    assert to_cents(None) is None
+
+
+def test_from_cents():
+    assert from_cents(1234) == 12.34
+    assert from_cents(None) is None
+
+
+def test_price_digits():
+    assert to_cents(10.029459, PRICE_DIGITS) == 10029459
+    assert to_cents(-0.1, PRICE_DIGITS) == -100000
+    assert from_cents(10029459, PRICE_DIGITS) == 10.029459
+
+
+def test_money_cents_column_stores_integers_and_sums_exactly():
+    metadata = MetaData()
+    table = Table("entries", metadata, Column("id", Integer, primary_key=True), Column("value", MoneyCents()))
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(table), [{"value": 0.1} for _ in range(10)] + [{"value": -0.3}])
+        raw_values = conn.exec_driver_sql("SELECT value FROM entries").scalars().all()
+        total = conn.execute(select(func.sum(table.c.value))).scalar()
+
+    assert raw_values[:2] == [10, 10]
+    assert total == 0.7
+
+
+def test_average_price_over_several_buys_keeps_amount_invested_exact():
+    # Cada compra relê o preço médio do banco, recalcula e grava, como em TransactionService._update_stocks.
+    metadata = MetaData()
+    table = Table("investments", metadata, Column("id", Integer, primary_key=True),
+                  Column("price_cents", MoneyCents()), Column("price", MoneyCents(PRICE_DIGITS)))
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    buys = [(100, 10.0), (200, 10.01), (300, 10.02), (700, 10.03), (1100, 9.99), (1300, 10.07)]
+
+    with engine.begin() as conn:
+        conn.execute(insert(table), [{"id": 1, "price_cents": 0, "price": 0}])
+        quantity = 0
+        for new_quantity, new_price in buys:
+            row = conn.execute(select(table.c.price_cents, table.c.price)).one()
+            conn.execute(update(table).values(
+                price_cents=TransactionService._calc_avg_purchase_price(None, quantity, row.price_cents,
+                                                                        new_quantity, new_price),
+                price=TransactionService._calc_avg_purchase_price(None, quantity, row.price,
+                                                                  new_quantity, new_price),
+            ))
+            quantity += new_quantity
+        row = conn.execute(select(table.c.price_cents, table.c.price)).one()
+
+    total_cost_cents = sum(to_cents(new_quantity * new_price) for new_quantity, new_price in buys)
+    assert to_cents(row.price * quantity) == total_cost_cents
+    # Arredondado para centavos a cada compra, o valor investido já sai R$ 2,00 acima.
+    assert to_cents(row.price_cents * quantity) - total_cost_cents == 200
@@ -0,0 +1,82 @@
+"""
+Contexto de posse por requisição.
+
+Guarda os códigos de contas, categorias e portfólios do usuário autenticado.
+Cada conjunto é carregado com uma única consulta, só quando é usado pela primeira
+vez, e reaproveitado pelo resto da requisição (o FastAPI resolve a dependência
+uma vez por requisição). Assim as verificações de posse dos handlers e serviços
+viram testes de pertinência em memória, sem novas idas ao banco.
+"""
+from typing import Callable, Dict, List, Optional, Set
+
+from finance.domain.account_erros import AccountConsolidationNotFound
+from finance.domain.category_erros import CategoryNotFound
+from investment.domain.portfolio_erros import PortfolioNotFound
+
+
+def _not_configured(user_code: str):
+    raise RuntimeError("Ownership loader not configured for this context")
+
+
+class OwnershipContext:
+    def __init__(
+            self,
+            user_code: str,
+            account_loader: Callable[[str], Set[str]] = _not_configured,
+            category_loader: Callable[[str], Dict[str, Optional[str]]] = _not_configured,
+            portfolio_loader: Callable[[str], Set[str]] = _not_configured
+    ):
+        self.user_code = user_code
+        self._account_loader = account_loader
+        self._category_loader = category_loader
+        self._portfolio_loader = portfolio_loader
+        self._account_codes: Optional[Set[str]] = None
+        self._category_parents: Optional[Dict[str, Optional[str]]] = None
+        self._portfolio_codes: Optional[Set[str]] = None
+
+    @property
+    def account_codes(self) -> Set[str]:
+        if self._account_codes is None:
+            self._account_codes = set(self._account_loader(self.user_code))
+        return self._account_codes
+
+    @property
+    def category_parents(self) -> Dict[str, Optional[str]]:
+        """code -> parent_category_code of every category of the user."""
+        if self._category_parents is None:
+            self._category_parents = dict(self._category_loader(self.user_code))
+        return self._category_parents
+
+    @property
+    def portfolio_codes(self) -> Set[str]:
+        if self._portfolio_codes is None:
+            self._portfolio_codes = set(self._portfolio_loader(self.user_code))
+        return self._portfolio_codes
+
+    def is_owner(self, user_code: str) -> bool:
+        return self.user_code == user_code
+
+    def check_account(self, account_code: str):
+        if account_code not in self.account_codes:
+            raise AccountConsolidationNotFound()
+
+    def check_category(self, category_code: str):
+        if category_code not in self.category_parents:
+            raise CategoryNotFound()
+
+    def check_portfolio(self, portfolio_code: str):
+        if portfolio_code not in self.portfolio_codes:
+            raise PortfolioNotFound()
+
+    def category_descendants(self, category_code: str) -> List[str]:
+        self.check_category(category_code)
+        children_by_parent: Dict[str, List[str]] = {}
+        for code, parent_code in self.category_parents.items():
+            children_by_parent.setdefault(parent_code, []).append(code)
+        descendants = []
+        pending = list(children_by_parent.get(category_code, []))
+        while pending:
+            code = pending.pop()
+            descendants.append(code)
+            pending.extend(children_by_parent.get(code, []))
+        return descendants
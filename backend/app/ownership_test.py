@@ -0,0 +1,56 @@
+from unittest.mock import Mock
+
+import pytest
+
+from finance.domain.account_erros import AccountConsolidationNotFound
+from finance.domain.category_erros import CategoryNotFound
+from investment.domain.portfolio_erros import PortfolioNotFound
+from ownership import OwnershipContext
+
+
+@pytest.fixture
+def loaders():
+    return {
+        "account_loader": Mock(return_value={"ACC1", "ACC2"}),
+        "category_loader": Mock(return_value={"CAT1": None, "CAT2": "CAT1", "CAT3": "CAT2", "CAT4": None}),
+        "portfolio_loader": Mock(return_value={"PORT1"}),
+    }
+
+
+def test_codes_are_loaded_once_and_lazily(loaders):
+    ownership = OwnershipContext("USER001", **loaders)
+
+    ownership.check_account("ACC1")
+    ownership.check_account("ACC2")
+    with pytest.raises(AccountConsolidationNotFound):
+        ownership.check_account("ACC3")
+
+    loaders["account_loader"].assert_called_once_with("USER001")
+    loaders["category_loader"].assert_not_called()
+    loaders["portfolio_loader"].assert_not_called()
+
+
+def test_check_category_and_portfolio(loaders):
+    ownership = OwnershipContext("USER001", **loaders)
+
+    ownership.check_category("CAT2")
+    ownership.check_portfolio("PORT1")
+    with pytest.raises(CategoryNotFound):
+        ownership.check_category("CAT9")
+    with pytest.raises(PortfolioNotFound):
+        ownership.check_portfolio("PORT9")
+
+
+def test_category_descendants(loaders):
+    ownership = OwnershipContext("USER001", **loaders)
+
+    assert sorted(ownership.category_descendants("CAT1")) == ["CAT2", "CAT3"]
+    assert ownership.category_descendants("CAT4") == []
+    with pytest.raises(CategoryNotFound):
+        ownership.category_descendants("CAT9")
+    loaders["category_loader"].assert_called_once()
+
+
+def test_missing_loader():
+    with pytest.raises(RuntimeError):
+        OwnershipContext("USER001").check_account("ACC1")
@@ -0,0 +1,201 @@
+"""
+Profiler por amostragem, sob demanda, de uma requisição.
+
+Uma requisição com o cabeçalho ``X-Profile-Token`` igual a PROFILER_TOKEN é
+amostrada a cada PROFILER_INTERVAL_MS por uma thread dedicada. Só entram as pilhas
+do código que roda dentro de ``database.run_sync`` (handler, serviços e
+repositórios), mesmo no modo assíncrono em que esse código roda em greenlets na
+thread do event loop. O resultado fica guardado em memória no formato "folded"
+(uma pilha por linha, ``frame;frame;frame contagem``), que é a entrada do
+flamegraph.pl e do speedscope; a resposta traz ``X-Profile-Id`` para buscá-lo em
+GET /profiles/{profile_id}.
+
+Com PROFILER_CONTINUOUS_INTERVAL_MS o profiler amostra continuamente, em baixa
+frequência, todas as requisições e agrega as pilhas por rota (GET /profiles/routes).
+"""
+import hmac
+import os
+import sys
+import threading
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from cache import LRUTTLCache
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILE_HEADER = "x-profile-token"
+
+
+class RequestProfile:
+    def __init__(self, scope, profiler: "Profiler"):
+        self.scope = scope
+        self.profiler = profiler
+        self.stacks: Optional[Counter] = None
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {route.path if route is not None else self.scope['path']}"
+
+
+_request: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def track(fn):
+    """Marks ``fn`` (run through ``run_sync``) as request code to be sampled; a no-op outside profiled requests."""
+    request_profile = _request.get()
+    if request_profile is None:
+        return fn
+    return request_profile.profiler.track(fn, request_profile)
+
+
+def _frame_label(frame) -> str:
+    filename = frame.f_code.co_filename
+    if filename.startswith(APP_DIR) and "site-packages" not in filename:
+        filename = os.path.relpath(filename, APP_DIR)
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{frame.f_code.co_name}"
+
+
+def fold(stacks: Counter, root: Optional[str] = None) -> str:
+    prefix = f"{root};" if root else ""
+    return "".join(f"{prefix}{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class Profiler:
+    def __init__(
+            self,
+            token: Optional[str] = None,
+            interval_ms: float = 5.0,
+            continuous_interval_ms: Optional[float] = None,
+            store_size: int = 32,
+            store_ttl: float = 600.0
+    ):
+        self.token = token
+        self.interval = interval_ms / 1000
+        self.continuous_interval = continuous_interval_ms / 1000 if continuous_interval_ms else None
+        self.profiles = LRUTTLCache(maxsize=store_size, ttl=store_ttl)
+        self.route_stacks: Dict[str, Counter] = {}
+        self._active: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+        self._continuous_stop: Optional[threading.Event] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorized(self, token: Optional[str]) -> bool:
+        return self.enabled and token is not None and hmac.compare_digest(token, self.token)
+
+    def track(self, fn, request_profile: RequestProfile):
+        def tracked(*args, **kwargs):
+            key = id(sys._getframe())
+            with self._lock:
+                self._active[key] = (threading.get_ident(), sys._getframe(), request_profile)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    del self._active[key]
+
+        return tracked
+
+    def _sample(self, only: Optional[RequestProfile] = None) -> List[tuple]:
+        with self._lock:
+            active = [entry for entry in self._active.values() if only is None or entry[2] is only]
+        if not active:
+            return []
+        frames = sys._current_frames()
+        samples = []
+        for thread_id, marker, request_profile in active:
+            frame = frames.get(thread_id)
+            labels = []
+            # Sobe até o marcador; se não estiver na pilha o greenlet está suspenso (esperando I/O).
+            while frame is not None and frame is not marker:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if frame is marker and labels:
+                samples.append((request_profile, ";".join(reversed(labels))))
+        return samples
+
+    def _sample_request(self, request_profile: RequestProfile, stop: threading.Event):
+        while not stop.wait(self.interval):
+            for _, stack in self._sample(only=request_profile):
+                request_profile.stacks[stack] += 1
+
+    def _sample_continuously(self, stop: threading.Event):
+        while not stop.wait(self.continuous_interval):
+            for request_profile, stack in self._sample():
+                with self._lock:
+                    self.route_stacks.setdefault(request_profile.route, Counter())[stack] += 1
+
+    def start_continuous(self):
+        if self.continuous_interval is None or self._continuous_stop is not None:
+            return
+        self._continuous_stop = threading.Event()
+        threading.Thread(target=self._sample_continuously, args=(self._continuous_stop,),
+                         name="profiler-continuous", daemon=True).start()
+
+    def stop_continuous(self):
+        if self._continuous_stop is not None:
+            self._continuous_stop.set()
+            self._continuous_stop = None
+
+    def folded_routes(self) -> str:
+        with self._lock:
+            route_stacks = {route: Counter(stacks) for route, stacks in self.route_stacks.items()}
+        return "".join(fold(stacks, root=route) for route, stacks in sorted(route_stacks.items()))
+
+
+class ProfilerMiddleware:
+    def __init__(self, app, instance: Optional[Profiler] = None):
+        self.app = app
+        self.profiler = instance or profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = dict(scope["headers"]).get(PROFILE_HEADER.encode())
+        profiled = token is not None and self.profiler.authorized(token.decode("latin-1"))
+        if not profiled and self.profiler.continuous_interval is None:
+            return await self.app(scope, receive, send)
+
+        request_profile = RequestProfile(scope, self.profiler)
+        context_token = _request.set(request_profile)
+        if not profiled:
+            try:
+                return await self.app(scope, receive, send)
+            finally:
+                _request.reset(context_token)
+
+        profile_id = uuid.uuid4().hex
+        request_profile.stacks = Counter()
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []),
+                                                  (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        stop = threading.Event()
+        sampler = threading.Thread(target=self.profiler._sample_request, args=(request_profile, stop),
+                                   name="profiler-request", daemon=True)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stop.set()
+            sampler.join()
+            _request.reset(context_token)
+            self.profiler.profiles.set(profile_id, fold(request_profile.stacks, root=request_profile.route))
+
+
+profiler = Profiler(
+    token=os.getenv("PROFILER_TOKEN"),
+    interval_ms=float(os.getenv("PROFILER_INTERVAL_MS", "5")),
+    continuous_interval_ms=float(os.getenv("PROFILER_CONTINUOUS_INTERVAL_MS", "0")) or None,
+)
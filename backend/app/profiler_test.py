@@ -0,0 +1,105 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from database import run_sync
+from profiler import Profiler, ProfilerMiddleware
+
+
+def slow_repository_call():
+    time.sleep(0.1)
+
+
+def slow_service_call():
+    slow_repository_call()
+
+
+def create_app(profiler, db_session=None):
+    app = FastAPI()
+    app.add_middleware(ProfilerMiddleware, instance=profiler)
+
+    @app.get("/slow")
+    async def slow():
+        await run_sync(db_session, slow_service_call)
+        return {"status": "ok"}
+
+    return app
+
+
+def test_profiles_request_with_valid_token():
+    profiler = Profiler(token="secret", interval_ms=1)
+    client = TestClient(create_app(profiler))
+
+    response = client.get("/slow", headers={"X-Profile-Token": "secret"})
+
+    assert response.status_code == 200
+    folded = profiler.profiles.get(response.headers["x-profile-id"])
+    stacks = dict(line.rsplit(" ", 1) for line in folded.splitlines())
+    assert any(stack.startswith("GET /slow;profiler_test.py:slow_service_call;profiler_test.py:slow_repository_call")
+               for stack in stacks)
+    # Quantidade exata depende do agendamento das threads; o que importa é ter várias amostras.
+    assert sum(int(count) for count in stacks.values()) >= 3
+
+
+def test_ignores_invalid_token():
+    profiler = Profiler(token="secret", interval_ms=1)
+    client = TestClient(create_app(profiler))
+
+    response = client.get("/slow", headers={"X-Profile-Token": "wrong"})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert len(profiler.profiles) == 0
+
+
+def test_profiles_code_running_in_async_session():
+    profiler = Profiler(token="secret", interval_ms=1)
+    engine = create_async_engine("sqlite+aiosqlite://")
+    db_session = AsyncSession(engine)
+    client = TestClient(create_app(profiler, db_session))
+
+    response = client.get("/slow", headers={"X-Profile-Token": "secret"})
+
+    folded = profiler.profiles.get(response.headers["x-profile-id"])
+    assert "profiler_test.py:slow_service_call;profiler_test.py:slow_repository_call" in folded
+
+
+def test_continuous_mode_aggregates_by_route():
+    profiler = Profiler(continuous_interval_ms=1)
+    client = TestClient(create_app(profiler))
+
+    profiler.start_continuous()
+    try:
+        client.get("/slow")
+        client.get("/slow")
+    finally:
+        profiler.stop_continuous()
+
+    assert list(profiler.route_stacks) == ["GET /slow"]
+    assert profiler.folded_routes().startswith("GET /slow;profiler_test.py:slow_service_call")
+
+
+def test_profile_endpoints_require_token(monkeypatch):
+    from main import app
+
+    profiler = Profiler(token="secret")
+    profiler.profiles.set("abc", "GET /x;a 1\n")
+    monkeypatch.setattr("main.profiler", profiler)
+    client = TestClient(app)
+
+    assert client.get("/profiles/abc").status_code == 403
+    response = client.get("/profiles/abc", headers={"X-Profile-Token": "secret"})
+    assert response.status_code == 200
+    assert response.text == "GET /x;a 1\n"
+    assert client.get("/profiles/missing", headers={"X-Profile-Token": "secret"}).status_code == 404
+
+
+def test_profile_endpoints_disabled_without_token(monkeypatch):
+    from main import app
+
+    monkeypatch.setattr("main.profiler", Profiler())
+
+    assert TestClient(app).get("/profiles/routes").status_code == 404
@@ -0,0 +1,141 @@
+"""
+Contador de consultas SQL por requisição.
+
+Hooks de ``before/after_cursor_execute`` em todos os engines somam o número de
+statements e o tempo gasto no banco na requisição corrente (um ContextVar com
+um objeto mutável, visível também no threadpool e no ``AsyncSession.run_sync``).
+O middleware devolve os totais no cabeçalho ``Server-Timing`` e registra uma linha
+de log estruturada por requisição.
+
+SQL_QUERY_BUDGET define o máximo de consultas por requisição; acima dele a
+requisição é registrada como warning, e com SQL_QUERY_BUDGET_STRICT=true é
+respondida com 500 no lugar da resposta do handler.
+"""
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("query_counter")
+
+
+class RequestQueries:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+_installed = False
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current.get()
+    if queries is not None and conn.info.get("query_start"):
+        queries.count += 1
+        queries.duration += time.perf_counter() - conn.info["query_start"].pop()
+
+
+def install():
+    """Registers the hooks once for every Engine (sync engines and the ones behind async engines)."""
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+
+def server_timing(queries: RequestQueries, total: float) -> str:
+    return f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} queries", total;dur={total * 1000:.1f}'
+
+
+class QueryBudgetExceeded(Exception):
+    def __init__(self, count: int, budget: int):
+        self.count = count
+        self.budget = budget
+
+    def __str__(self):
+        return f"Request issued {self.count} SQL queries, budget is {self.budget}"
+
+
+class QueryCounterMiddleware:
+    def __init__(self, app, budget: Optional[int] = None, strict: Optional[bool] = None):
+        self.app = app
+        if budget is None and os.getenv("SQL_QUERY_BUDGET"):
+            budget = int(os.getenv("SQL_QUERY_BUDGET"))
+        if strict is None:
+            strict = os.getenv("SQL_QUERY_BUDGET_STRICT", "false").lower() in ("1", "true")
+        self.budget = budget
+        self.strict = strict
+        install()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+        start = time.perf_counter()
+        status = {"code": None, "rejected": False}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                over_budget = self.budget is not None and queries.count > self.budget
+                if over_budget and self.strict:
+                    status["rejected"] = True
+                    body = json.dumps({"detail": str(QueryBudgetExceeded(queries.count, self.budget))}).encode()
+                    message = {
+                        "type": "http.response.start",
+                        "status": 500,
+                        "headers": [(b"content-type", b"application/json"),
+                                    (b"content-length", str(len(body)).encode())],
+                    }
+                    await send(self._with_timing(message, queries, start))
+                    await send({"type": "http.response.body", "body": body})
+                    status["code"] = 500
+                    return
+                status["code"] = message["status"]
+                message = self._with_timing(message, queries, start)
+            elif status["rejected"]:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, status["code"], queries, time.perf_counter() - start)
+
+    @staticmethod
+    def _with_timing(message: dict, queries: RequestQueries, start: float) -> dict:
+        headers = list(message.get("headers", []))
+        headers.append((b"server-timing", server_timing(queries, time.perf_counter() - start).encode()))
+        return {**message, "headers": headers}
+
+    def _log(self, scope, status_code: Optional[int], queries: RequestQueries, total: float):
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "queries": queries.count,
+            "db_ms": round(queries.duration * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+        }
+        if self.budget is not None and queries.count > self.budget:
+            logger.warning(json.dumps({**record, "query_budget": self.budget}))
+        else:
+            logger.info(json.dumps(record))
@@ -0,0 +1,66 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from query_counter import QueryCounterMiddleware, current_queries
+
+
+def create_app(engine, **middleware_options):
+    app = FastAPI()
+    app.add_middleware(QueryCounterMiddleware, **middleware_options)
+
+    @app.get("/queries/{count}")
+    def run_queries(count: int):
+        with engine.connect() as conn:
+            for _ in range(count):
+                conn.execute(text("SELECT 1"))
+        return {"count": current_queries().count}
+
+    return app
+
+
+def test_counts_queries_and_sets_server_timing():
+    engine = create_engine("sqlite://")
+    client = TestClient(create_app(engine))
+
+    response = client.get("/queries/3")
+
+    assert response.status_code == 200
+    assert response.json() == {"count": 3}
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+    assert "total;dur=" in response.headers["server-timing"]
+
+
+def test_queries_outside_requests_are_not_counted():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert current_queries() is None
+
+
+def test_logs_structured_line(caplog):
+    engine = create_engine("sqlite://")
+    client = TestClient(create_app(engine, budget=1))
+
+    with caplog.at_level(logging.INFO, logger="query_counter"):
+        client.get("/queries/2")
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.WARNING
+    assert '"path": "/queries/2"' in record.message
+    assert '"queries": 2' in record.message
+    assert '"query_budget": 1' in record.message
+
+
+def test_strict_budget_fails_request():
+    engine = create_engine("sqlite://")
+    client = TestClient(create_app(engine, budget=2, strict=True))
+
+    assert client.get("/queries/2").status_code == 200
+    response = client.get("/queries/3")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Request issued 3 SQL queries, budget is 2"}
+    assert 'desc="3 queries"' in response.headers["server-timing"]
@@ -0,0 +1,135 @@
+"""
+Cache de leitura dos repositórios, versionado por usuário.
+
+As leituras por usuário (contas, categorias, portfólios) são guardadas com a chave
+``namespace:user_code:v<versão>:<argumentos>``. Toda escrita feita pelos
+repositórios chama ``bump(user_code)``, que incrementa a versão do usuário: as
+entradas antigas deixam de ser encontradas e expiram sozinhas pelo TTL, sem
+varrer o cache.
+
+Os valores são serializados (pickle), então quem lê recebe sempre uma cópia e
+pode alterá-la à vontade. Por padrão o cache fica em memória (por worker; a
+invalidação é local, então o TTL limita o tempo em que outro worker pode servir
+dados antigos); com REPOSITORY_CACHE_REDIS_URL ele é compartilhado entre workers
+via Redis (requer o pacote opcional ``redis``). REPOSITORY_CACHE_SIZE=0 desabilita.
+"""
+import functools
+import os
+import pickle
+import threading
+from typing import Callable, Optional
+
+from cache import LRUTTLCache
+
+
+class InMemoryCacheBackend:
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    def set(self, key: str, value: bytes):
+        self.entries.set(key, value)
+
+    def version(self, user_code: str) -> int:
+        return self._versions.get(user_code, 0)
+
+    def bump(self, user_code: str) -> int:
+        with self._lock:
+            self._versions[user_code] = self._versions.get(user_code, 0) + 1
+            return self._versions[user_code]
+
+    def clear(self):
+        self.entries.clear()
+        with self._lock:
+            self._versions.clear()
+
+
+class RedisCacheBackend:
+    def __init__(self, url: str, ttl: float, prefix: str = "repository-cache:", client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes):
+        self.client.set(self.prefix + key, value, ex=max(1, int(self.ttl)))
+
+    def version(self, user_code: str) -> int:
+        return int(self.client.get(f"{self.prefix}version:{user_code}") or 0)
+
+    def bump(self, user_code: str) -> int:
+        return self.client.incr(f"{self.prefix}version:{user_code}")
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class RepositoryCache:
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, namespace: str, user_code: str, loader: Callable, *args):
+        if not self.enabled:
+            return loader()
+        key = f"{namespace}:{user_code}:v{self.backend.version(user_code)}:{':'.join(map(str, args))}"
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return pickle.loads(cached)
+        self.misses += 1
+        value = loader()
+        self.backend.set(key, pickle.dumps(value))
+        return value
+
+    def bump(self, user_code: str):
+        if self.enabled and user_code is not None:
+            self.backend.bump(user_code)
+
+    def clear(self):
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hits / lookups if lookups else 0.0}
+
+
+def create_repository_cache() -> RepositoryCache:
+    size = int(os.getenv("REPOSITORY_CACHE_SIZE", "10000"))
+    ttl = float(os.getenv("REPOSITORY_CACHE_TTL", "60"))
+    redis_url = os.getenv("REPOSITORY_CACHE_REDIS_URL")
+    backend = RedisCacheBackend(redis_url, ttl) if redis_url else InMemoryCacheBackend(size, ttl)
+    return RepositoryCache(backend, enabled=size > 0)
+
+
+repository_cache = create_repository_cache()
+
+
+def cached_by_user(namespace: str):
+    """For repository reads whose first argument is the user_code; the other arguments are part of the key."""
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, user_code, *args, **kwargs):
+            return repository_cache.get_or_load(
+                namespace, user_code, lambda: method(self, user_code, *args, **kwargs),
+                *args, *sorted(kwargs.items())
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,116 @@
+import fnmatch
+
+import pytest
+
+import repository_cache as repository_cache_module
+from finance.domain.models import AccountModel
+from finance.repository.account_repository import AccountRepo
+from finance.repository.db.prepare_to_db_test import *
+from repository_cache import InMemoryCacheBackend, RedisCacheBackend, RepositoryCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    def scan_iter(self, match):
+        return [key for key in list(self.values) if fnmatch.fnmatch(key, match)]
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+class Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        return RepositoryCache(InMemoryCacheBackend(maxsize=100, ttl=60))
+    return RepositoryCache(RedisCacheBackend("redis://unused", ttl=60, client=FakeRedis()))
+
+
+def test_second_read_is_a_hit(cache):
+    loader = Loader(["ACC001"])
+
+    assert cache.get_or_load("accounts", "USER001", loader) == ["ACC001"]
+    assert cache.get_or_load("accounts", "USER001", loader) == ["ACC001"]
+
+    assert loader.calls == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_arguments_and_users_have_separate_entries(cache):
+    loader = Loader("value")
+
+    cache.get_or_load("accounts", "USER001", loader, "ACC001")
+    cache.get_or_load("accounts", "USER001", loader, "ACC002")
+    cache.get_or_load("accounts", "USER002", loader, "ACC001")
+
+    assert loader.calls == 3
+
+
+def test_bump_invalidates_only_that_user(cache):
+    loader = Loader("value")
+    cache.get_or_load("accounts", "USER001", loader)
+    cache.get_or_load("accounts", "USER002", loader)
+
+    cache.bump("USER001")
+    cache.get_or_load("accounts", "USER001", loader)
+    cache.get_or_load("accounts", "USER002", loader)
+
+    assert loader.calls == 3
+
+
+def test_hit_returns_a_copy(cache):
+    cache.get_or_load("accounts", "USER001", Loader(["ACC001"]))
+
+    cached = cache.get_or_load("accounts", "USER001", Loader(None))
+    cached.append("ACC002")
+
+    assert cache.get_or_load("accounts", "USER001", Loader(None)) == ["ACC001"]
+
+
+def test_disabled_cache_always_loads():
+    cache = RepositoryCache(InMemoryCacheBackend(maxsize=100, ttl=60), enabled=False)
+    loader = Loader("value")
+
+    cache.get_or_load("accounts", "USER001", loader)
+    cache.get_or_load("accounts", "USER001", loader)
+
+    assert loader.calls == 2
+
+
+def test_account_repo_reads_are_invalidated_by_writes(db_session, monkeypatch):
+    cache = RepositoryCache(InMemoryCacheBackend(maxsize=100, ttl=60))
+    monkeypatch.setattr(repository_cache_module, "repository_cache", cache)
+    monkeypatch.setattr("finance.repository.account_repository.repository_cache", cache)
+    account_repo = AccountRepo(db_session)
+
+    assert account_repo.find_all("USER001") == []
+    account = account_repo.create(AccountModel(name="Conta", user_code="USER001"))
+    assert [a.code for a in account_repo.find_all("USER001")] == [account.code]
+    assert [a.code for a in account_repo.find_all("USER001")] == [account.code]
+
+    account.name = "Conta corrente"
+    account_repo.update("USER001", account.code, account)
+
+    assert account_repo.find_by_code("USER001", account.code).name == "Conta corrente"
+    assert cache.stats()["hits"] == 1
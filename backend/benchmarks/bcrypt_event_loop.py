@@ -0,0 +1,110 @@
+"""
+Mede a latência de um endpoint não relacionado (/health) enquanto uma rajada de
+logins roda no mesmo worker, com o bcrypt executando inline no event loop e no
+pool dedicado (auth.service.password_pool).
+
+Uso (a partir de backend/):
+    python benchmarks/bcrypt_event_loop.py --logins 20 --workers 2
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from auth.domain.models import UserModel  # noqa: E402
+from auth.repository.db_connection import get_db_session  # noqa: E402
+from auth.repository.user_db_repository import Base  # noqa: E402
+from auth.service.password_pool import password_pool  # noqa: E402
+from auth.service.services import UserServiceFactory  # noqa: E402
+from main import app  # noqa: E402
+
+
+def prepare_database():
+    db_file = tempfile.NamedTemporaryFile(suffix=".sqlite", delete=False)
+    db_file.close()
+    engine = create_engine(f"sqlite:///{db_file.name}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    with session_factory() as session:
+        UserServiceFactory.create_user_service(session).create(
+            UserModel(code=None, name="Bench", user_name="bench", password="bench", created_at=None)
+        )
+    app.dependency_overrides[get_db_session] = override_get_db
+    return db_file.name
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(logins: int, probe_interval: float):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies = []
+        done = asyncio.Event()
+
+        async def probe():
+            # A latência é medida a partir do instante em que a sonda deveria ter
+            # saído, para que o tempo com o loop bloqueado também seja contado.
+            scheduled = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                await client.get("/health")
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+                scheduled += probe_interval
+
+        async def login():
+            await client.post("/users/signin", json={"user_name": "bench", "password": "bench"})
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência de /health durante uma rajada de logins.")
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--probe-interval-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    db_path = prepare_database()
+    try:
+        for label, workers in (("inline", 0), (f"pool({args.workers})", args.workers)):
+            password_pool.configure(workers, max_queue=args.logins)
+            latencies, elapsed = asyncio.run(run_scenario(args.logins, args.probe_interval_ms / 1000))
+            print(
+                f"{label:>10}: {args.logins} logins em {elapsed:.2f}s | /health "
+                f"amostras={len(latencies)} p50={statistics.median(latencies):.1f}ms "
+                f"p99={percentile(latencies, 99):.1f}ms max={max(latencies):.1f}ms"
+            )
+    finally:
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Gera um volume de dados e roda EXPLAIN nas consultas mais frequentes para
+confirmar que cada uma usa o índice composto esperado (migration 2f6a9c3e7d15).
+
+As consultas são montadas como nos repositórios (FinancialTransactionRepo.filter,
+AccountConsolidationRepo.find_by_account_month, ConsolidatedBalanceRepo e
+TransactionRepo.find_all). Sem DATABASE_URL usa um SQLite temporário; com
+DATABASE_URL (Postgres com o schema do alembic) usa esse banco, que deve estar vazio.
+
+Uso (a partir de backend/):
+    python benchmarks/explain_indexes.py --accounts 200 --transactions-per-account 500
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from sqlalchemy import create_engine, insert, select, text  # noqa: E402
+
+from database import create_schema  # noqa: E402
+from finance.repository.db.db_entities import AccountConsolidation, FinancialTransaction  # noqa: E402
+from investment.repository.db.db_entities import ConsolidatedPortfolio, Portfolio, Transaction  # noqa: E402
+
+START_DATE = date(2020, 1, 1)
+
+
+def generate(conn, accounts: int, transactions_per_account: int):
+    rng = random.Random(42)
+    conn.execute(insert(FinancialTransaction.__table__), [
+        {"code": f"T{account}-{n}", "account_code": f"A{account}", "description": "", "category_code": None,
+         "type": "EXPENSE", "date": START_DATE + timedelta(days=rng.randrange(1460)), "value": 1.0}
+        for account in range(accounts) for n in range(transactions_per_account)
+    ])
+    conn.execute(insert(AccountConsolidation.__table__), [
+        {"account_code": f"A{account}", "month": date(2020 + month // 12, month % 12 + 1, 1), "balance": 0.0}
+        for account in range(accounts) for month in range(48)
+    ])
+    conn.execute(insert(Portfolio.__table__), [
+        {"code": f"P{portfolio}", "name": "", "user_code": f"U{portfolio % 50}"} for portfolio in range(accounts)
+    ])
+    conn.execute(insert(ConsolidatedPortfolio.__table__), [
+        {"portfolio_code": f"P{portfolio}", "date": START_DATE + timedelta(days=day), "balance": 0.0,
+         "amount_invested": 0.0}
+        for portfolio in range(accounts) for day in range(0, 1460, 7)
+    ])
+    conn.execute(insert(Transaction.__table__), [
+        {"code": f"I{investment}-{n}", "investment_code": f"I{investment}", "type": "BUY",
+         "date": START_DATE + timedelta(days=rng.randrange(1460)), "quantity": 1, "price": 1.0}
+        for investment in range(accounts) for n in range(transactions_per_account // 5)
+    ])
+
+
+def hot_queries():
+    accounts = [f"A{account}" for account in range(0, 10)]
+    return {
+        "FinancialTransactionRepo.filter": (
+            "ix_finances_transactions_account_code_date_id",
+            select(FinancialTransaction).where(
+                FinancialTransaction.account_code.in_(accounts),
+                FinancialTransaction.date >= date(2022, 1, 1),
+                FinancialTransaction.date <= date(2022, 3, 31),
+            ).order_by(FinancialTransaction.date, FinancialTransaction.id),
+        ),
+        "AccountConsolidationRepo.find_by_account_month": (
+            "ux_finances_account_consolidations_account_code_month",
+            select(AccountConsolidation).where(
+                AccountConsolidation.account_code.in_(accounts), AccountConsolidation.month == date(2022, 1, 1)
+            ),
+        ),
+        "ConsolidatedBalanceRepo.filter_by_date_range": (
+            "ux_investments_consolidated_balance_portfolios_portfolio_code_date",
+            select(ConsolidatedPortfolio).where(
+                ConsolidatedPortfolio.portfolio_code == "P1", ConsolidatedPortfolio.date >= date(2022, 1, 1)
+            ).order_by(ConsolidatedPortfolio.date.asc()),
+        ),
+        "TransactionRepo.find_all": (
+            "ix_investments_transactions_investment_code_date_id",
+            select(Transaction).where(Transaction.investment_code == "I1")
+            .order_by(Transaction.date.desc(), Transaction.id.desc()),
+        ),
+        "PortfolioRepo.find_codes_by_user": (
+            "ix_investments_portfolios_user_code",
+            select(Portfolio.code).where(Portfolio.user_code == "U1"),
+        ),
+    }
+
+
+def explain(conn, statement) -> str:
+    sql = str(statement.compile(conn, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    return "\n".join(" ".join(str(column) for column in row) for row in conn.execute(text(prefix + sql)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--transactions-per-account", type=int, default=500)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/explain.sqlite"
+    engine = create_engine(database_url)
+    if engine.dialect.name == "sqlite":
+        create_schema(bind=engine)
+    with engine.begin() as conn:
+        generate(conn, args.accounts, args.transactions_per_account)
+        conn.execute(text("ANALYZE"))
+
+    failures = 0
+    with engine.connect() as conn:
+        for name, (index_name, statement) in hot_queries().items():
+            plan = explain(conn, statement)
+            start = time.perf_counter()
+            rows = len(conn.execute(statement).all())
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            uses_index = index_name in plan
+            failures += not uses_index
+            print(f"{'OK  ' if uses_index else 'FAIL'} {name:<48} {rows:6d} linhas {elapsed_ms:8.2f}ms  {index_name}")
+            if not uses_index:
+                print("     " + plan.replace("\n", "\n     "))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
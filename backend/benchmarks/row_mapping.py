@@ -0,0 +1,110 @@
+"""
+Custo de devolver uma listagem grande de lançamentos (GET /finances/transactions)
+antes e depois do mapeamento direto linha -> modelo.
+
+"antes": carrega as entidades, converte com ``to_dict()`` + validação do
+FinancialTransactionModel e faz o que o FastAPI faz com o response_model
+(model_dump, validação contra List[TransactionResponse], serialização e json.dumps).
+"depois": ``FinancialTransactionRepo.filter`` (só as colunas, ``model_construct``)
+e o ``dump_json`` que o endpoint devolve direto.
+
+Usa um SQLite em memória; o cache de leitura por usuário não participa.
+
+Uso (a partir de backend/):
+    python benchmarks/row_mapping.py --rows 10000 --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from finance.domain.models import FinancialTransactionModel  # noqa: E402
+from finance.interface.financial_transaction_http import TransactionResponse, transactions_json  # noqa: E402
+from finance.repository.db.db_entities import Base, FinancialTransaction  # noqa: E402
+from finance.repository.financial_transaction_repository import FinancialTransactionRepo  # noqa: E402
+
+ACCOUNT_CODES = ["ACC1", "ACC2"]
+response_adapter = TypeAdapter(List[TransactionResponse])
+
+
+def generate(session, rows: int):
+    session.execute(insert(FinancialTransaction.__table__), [
+        {"code": f"T{n:06d}", "account_code": ACCOUNT_CODES[n % 2], "description": f"Lançamento {n}",
+         "category_code": None if n % 3 else "CAT001", "type": "WITHDRAWAL",
+         "date": date(2020, 1, 1) + timedelta(days=n % 1460), "value": -12.34}
+        for n in range(rows)
+    ])
+    session.commit()
+
+
+def before(session) -> tuple:
+    timings = {}
+    start = time.perf_counter()
+    transactions = session.execute(
+        select(FinancialTransaction).where(FinancialTransaction.account_code.in_(ACCOUNT_CODES))
+        .order_by(FinancialTransaction.date, FinancialTransaction.id)
+    ).scalars().all()
+    models = [FinancialTransactionModel(**transaction.to_dict(exclude=["id"])) for transaction in transactions]
+    timings["repositório"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validated = response_adapter.validate_python([model.model_dump() for model in models])
+    body = json.dumps(response_adapter.dump_python(validated, mode="json"), ensure_ascii=False,
+                      separators=(",", ":")).encode()
+    timings["resposta"] = time.perf_counter() - start
+    session.expunge_all()
+    return timings, body
+
+
+def after(session) -> tuple:
+    timings = {}
+    start = time.perf_counter()
+    models = FinancialTransactionRepo(session).filter(ACCOUNT_CODES)
+    timings["repositório"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    body = transactions_json.dump_json(models)
+    timings["resposta"] = time.perf_counter() - start
+    return timings, body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    generate(session, args.rows)
+
+    _, before_body = before(session)
+    _, after_body = after(session)
+    assert json.loads(before_body) == json.loads(after_body), "as duas versões devem gerar o mesmo JSON"
+
+    results = {}
+    for name, fn in (("antes", before), ("depois", after)):
+        runs = [fn(session)[0] for _ in range(args.runs)]
+        results[name] = {stage: statistics.median(run[stage] for run in runs) * 1000 for stage in runs[0]}
+        results[name]["total"] = sum(results[name].values())
+
+    print(f"{args.rows} linhas, mediana de {args.runs} execuções (ms)")
+    print(f"{'etapa':12} {'antes':>9} {'depois':>9} {'ganho':>7}")
+    for stage in results["antes"]:
+        before_ms, after_ms = results["antes"][stage], results["depois"][stage]
+        print(f"{stage:12} {before_ms:9.1f} {after_ms:9.1f} {1 - after_ms / before_ms:7.0%}")
+
+
+if __name__ == "__main__":
+    main()
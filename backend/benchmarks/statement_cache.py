@@ -0,0 +1,131 @@
+"""
+Custo por chamada das consultas dos repositórios antes e depois dos statements em
+cache (lambda_stmt), sobre os mesmos dados das fixtures de teste
+(finance/repository/db/prepare_to_db_test.py) em um SQLite em memória.
+
+"antes" monta a cadeia ``session.query(...)`` como os repositórios faziam; "depois"
+chama os métodos atuais dos repositórios. O cache de leitura por usuário
+(repository_cache) fica desligado para medir só a consulta.
+
+Uso (a partir de backend/):
+    python benchmarks/statement_cache.py --calls 5000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from sqlalchemy import create_engine, func  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from finance.repository.account_repository import AccountRepo  # noqa: E402
+from finance.repository.category_repository import CategoryRepo  # noqa: E402
+from finance.repository.db.db_entities import Base, Category, FinancialTransaction  # noqa: E402
+from finance.repository.db.prepare_to_db_test import add_accounts, add_categories, add_transactions  # noqa: E402
+from finance.repository.financial_transaction_repository import FinancialTransactionRepo  # noqa: E402
+from repository_cache import repository_cache  # noqa: E402
+
+
+def before(session):
+    def transaction_filter():
+        return session.query(FinancialTransaction) \
+            .filter(FinancialTransaction.account_code.in_(["ACC123", "ACC125"])) \
+            .filter(FinancialTransaction.date >= date(2023, 5, 1)) \
+            .filter(FinancialTransaction.date <= date(2023, 5, 31)) \
+            .order_by(FinancialTransaction.date, FinancialTransaction.id).all()
+
+    def transaction_by_code():
+        return session.query(FinancialTransaction).filter(FinancialTransaction.code == "TRA003").one()
+
+    def category_by_code():
+        return session.query(Category).filter(Category.code == "CAT003").one()
+
+    def categories_by_parent():
+        return session.query(Category).filter(
+            Category.user_code == "USER001", Category.parent_category_code == "CAT001"
+        ).all()
+
+    def account_balance():
+        return session.query(func.sum(FinancialTransaction.value).label('total_value')) \
+            .filter(FinancialTransaction.account_code == "ACC123").one().total_value
+
+    return {
+        "FinancialTransactionRepo.filter": transaction_filter,
+        "FinancialTransactionRepo.find_by_code": transaction_by_code,
+        "CategoryRepo.find_by_code": category_by_code,
+        "CategoryRepo.find_categories_by_user_and_parent": categories_by_parent,
+        "AccountRepo.calculate_balance": account_balance,
+    }
+
+
+def after(session):
+    transaction_repo = FinancialTransactionRepo(session)
+    category_repo = CategoryRepo(session)
+    account_repo = AccountRepo(session)
+    # Os métodos também convertem para o modelo pydantic; a conversão fica fora da comparação.
+    return {
+        "FinancialTransactionRepo.filter": lambda: transaction_repo.filter(
+            ["ACC123", "ACC125"], date_start=date(2023, 5, 1), date_end=date(2023, 5, 31)
+        ),
+        "FinancialTransactionRepo.find_by_code": lambda: transaction_repo.find_by_code("TRA003"),
+        "CategoryRepo.find_by_code": lambda: category_repo.find_by_code("CAT003"),
+        "CategoryRepo.find_categories_by_user_and_parent": lambda: category_repo.find_categories_by_user_and_parent(
+            "USER001", "CAT001"
+        ),
+        "AccountRepo.calculate_balance": lambda: account_repo.calculate_balance("ACC123"),
+    }
+
+
+def to_models_only(session):
+    """Custo da conversão para os modelos pydantic, descontado do "depois"."""
+    from finance.repository.category_repository import to_model as category_to_model
+    from finance.repository.financial_transaction_repository import to_model as transaction_to_model
+
+    transactions = before(session)["FinancialTransactionRepo.filter"]()
+    transaction = before(session)["FinancialTransactionRepo.find_by_code"]()
+    category = before(session)["CategoryRepo.find_by_code"]()
+    children = before(session)["CategoryRepo.find_categories_by_user_and_parent"]()
+    return {
+        "FinancialTransactionRepo.filter": lambda: [transaction_to_model(t) for t in transactions],
+        "FinancialTransactionRepo.find_by_code": lambda: transaction_to_model(transaction),
+        "CategoryRepo.find_by_code": lambda: category_to_model(category),
+        "CategoryRepo.find_categories_by_user_and_parent": lambda: [category_to_model(c) for c in children],
+        "AccountRepo.calculate_balance": lambda: None,
+    }
+
+
+def per_call_us(fn, calls: int) -> float:
+    for _ in range(min(calls, 100)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    repository_cache.enabled = False
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)()
+    add_accounts(session)
+    add_transactions(session)
+    add_categories(session)
+
+    before_fns, after_fns, model_fns = before(session), after(session), to_models_only(session)
+    print(f"{'consulta':50} {'antes (µs)':>11} {'depois (µs)':>12} {'ganho':>7}")
+    for name in before_fns:
+        before_us = per_call_us(before_fns[name], args.calls)
+        after_us = per_call_us(after_fns[name], args.calls) - per_call_us(model_fns[name], args.calls)
+        print(f"{name:50} {before_us:11.1f} {after_us:12.1f} {1 - after_us / before_us:7.0%}")
+
+
+if __name__ == "__main__":
+    main()
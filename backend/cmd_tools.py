@@ -1,22 +1,121 @@
 import argparse
-
-from finance.repository.db.db_connection import get_db_session
-from finance.services.factory import ServiceFactory
+from contextlib import contextmanager
 
 
 def process_csv_transactions(csv_path: str, account_code: str, user_code: str):
-    with get_db_session() as session:
+    from finance.repository.db.db_connection import get_db_session
+    from finance.services.factory import ServiceFactory
+
+    with contextmanager(get_db_session)() as session:
         financial_transaction_service = ServiceFactory.create_financial_transaction_service(session)
         financial_transaction_service.create_transactions_from_csv(csv_path, account_code, user_code)
 
+
+def provision_users(users_path: str, workers: int, batch_size: int, rounds: int = None):
+    from auth.repository.db_connection import get_db_session
+    from auth.repository.user_db_repository import UserRepository
+    from auth.service import user_provisioning
+    from auth.service.services import PasswordService
+
+    # O custo precisa ser o mesmo do servidor; senão todo usuário criado aqui é re-hasheado no primeiro login.
+    if rounds:
+        PasswordService.work_factor = rounds
+    else:
+        PasswordService.configure_from_env()
+    print(f"Custo do bcrypt: {PasswordService.work_factor or 'padrão do bcrypt (12)'}")
+
+    users = user_provisioning.read_users_file(users_path)
+    with contextmanager(get_db_session)() as session:
+        report = user_provisioning.provision_users(UserRepository(session), users, workers, batch_size)
+    print(f"{report.created} usuários criados em {report.elapsed_seconds:.2f}s "
+          f"({report.users_per_second:.1f} usuários/s, bcrypt {report.hashing_seconds:.2f}s)")
+    if report.skipped:
+        print(f"{len(report.skipped)} ignorados (user_name já existente): {', '.join(report.skipped)}")
+
+
+def create_schema():
+    from database import create_schema as create_database_schema, engine
+
+    if engine is None:
+        raise SystemExit("DATABASE_URL não configurada")
+    create_database_schema()
+    print("Schema criado (tabelas existentes foram mantidas).")
+
+
+def create_partitions(months_ahead: int):
+    from datetime import date
+
+    from database import engine
+    from finance.repository.db import partitions
+
+    with engine.begin() as conn:
+        if not partitions.is_partitioned(conn):
+            raise SystemExit(f"{partitions.TABLE} não é particionada")
+        today = date.today()
+        names = partitions.ensure_partitions(conn, today, partitions.add_months(today, months_ahead))
+    print(f"Partições garantidas: {', '.join(names)}")
+
+
+def detach_partition(month: str):
+    from datetime import date
+
+    from database import engine
+    from finance.repository.db import partitions
+
+    year, month_number = month.split("-")
+    with engine.begin() as conn:
+        partitions.detach_partition(conn, date(int(year), int(month_number), 1))
+    print(f"Partição {partitions.partition_name(date(int(year), int(month_number), 1))} desanexada.")
+
+
 def main():
-    parser = argparse.ArgumentParser(description="Processa um arquivo CSV para criar transações financeiras.")
-    parser.add_argument('csv_path', type=str, help='O caminho para o arquivo CSV')
-    parser.add_argument('account_code', type=str, help='O código da conta')
-    parser.add_argument('user_code', type=str, help='O código do usuário')
+    parser = argparse.ArgumentParser(description="Ferramentas de linha de comando do MoneyMint.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    transactions_parser = subparsers.add_parser(
+        "import-transactions", help="Processa um arquivo CSV para criar transações financeiras."
+    )
+    transactions_parser.add_argument('csv_path', type=str, help='O caminho para o arquivo CSV')
+    transactions_parser.add_argument('account_code', type=str, help='O código da conta')
+    transactions_parser.add_argument('user_code', type=str, help='O código do usuário')
+
+    users_parser = subparsers.add_parser(
+        "provision-users", help="Cria usuários em lote a partir de um CSV (name,user_name,password)."
+    )
+    users_parser.add_argument('users_path', type=str, help='O caminho para o arquivo CSV de usuários')
+    users_parser.add_argument('--workers', type=int, default=None,
+                              help='Processos para o bcrypt (padrão: um por núcleo; 0 roda no processo atual)')
+    users_parser.add_argument('--batch-size', type=int, default=500, help='Usuários por INSERT')
+    users_parser.add_argument('--rounds', type=int, default=None,
+                              help='Custo do bcrypt (padrão: AUTH_BCRYPT_ROUNDS ou calibrado por '
+                                   'AUTH_BCRYPT_TARGET_MS, como no servidor)')
+
+    subparsers.add_parser(
+        "create-schema", help="Cria as tabelas que faltam sem migrations (desenvolvimento; use o alembic nos demais)."
+    )
+
+    partitions_parser = subparsers.add_parser(
+        "create-partitions", help="Cria as partições mensais futuras de finances_transactions (para o cron)."
+    )
+    partitions_parser.add_argument('--months-ahead', type=int, default=3, help='Meses à frente do atual')
+
+    detach_parser = subparsers.add_parser(
+        "detach-partition", help="Desanexa a partição de um mês de finances_transactions (sem apagar os dados)."
+    )
+    detach_parser.add_argument('month', type=str, help='O mês, no formato AAAA-MM')
 
     args = parser.parse_args()
-    process_csv_transactions(args.csv_path, args.account_code, args.user_code)
+    if args.command == "import-transactions":
+        process_csv_transactions(args.csv_path, args.account_code, args.user_code)
+    elif args.command == "provision-users":
+        provision_users(args.users_path, args.workers, args.batch_size, args.rounds)
+    elif args.command == "create-partitions":
+        create_partitions(args.months_ahead)
+    elif args.command == "detach-partition":
+        detach_partition(args.month)
+    else:
+        create_schema()
+
 
 if __name__ == "__main__":
     main()